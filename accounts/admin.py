@@ -52,6 +52,7 @@ if settings.USE_LOGIN_DEVICE:
             'browser',
             'ip_address',
             'last_login',
+            'last_seen',
             'is_registered',
         )
         search_fields = (
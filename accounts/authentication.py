@@ -0,0 +1,22 @@
+from django.conf import settings
+
+from core.authentication import CachedTokenAuthentication
+
+
+class LoginDeviceAuthentication(CachedTokenAuthentication):
+    """
+    Login Device Authentication
+
+    Buffers the last seen time of the login device
+    on every authenticated request when USE_LOGIN_DEVICE is on.
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+
+        if result and settings.USE_LOGIN_DEVICE:
+            # REST_FRAMEWORK loads this module before the app registry
+            from . import models, tools
+            tools.seen_device(request, result[0], models.LoginDevice)
+
+        return result
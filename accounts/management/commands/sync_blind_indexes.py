@@ -0,0 +1,28 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from core.fields import blind_index_fields, sync_blind_indexes
+from utils.constants import Const
+
+
+class Command(BaseCommand):
+    help = 'Backfill blind indexes of encrypted fields'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=Const.CHUNK_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        for model in apps.get_models():
+            if not blind_index_fields(model):
+                continue
+
+            count = sync_blind_indexes(
+                model, chunk_size=options['chunk_size']
+            )
+            self.stdout.write(
+                '%d %s fixed.' % (count, model._meta.verbose_name_plural)
+            )
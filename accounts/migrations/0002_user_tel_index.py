@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:29
+
+import core.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='tel_index',
+            field=core.fields.BlindIndexField(blank=True, db_index=True, editable=False, max_length=64, null=True, source='tel'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:36
+
+from django.contrib.postgres.aggregates import BoolOr
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+from accounts.tools import device_fingerprint
+from core.queries import chunked_ids
+
+
+def fill_fingerprints(apps, schema_editor):
+    LoginDevice = apps.get_model('accounts', 'LoginDevice')
+
+    for ids in chunked_ids(LoginDevice.objects.all()):
+        devices = list(LoginDevice.objects.filter(pk__in=ids))
+        for login_device in devices:
+            login_device.fingerprint = device_fingerprint(
+                login_device.device,
+                login_device.os,
+                login_device.browser,
+                login_device.ip_address,
+            )
+        LoginDevice.objects.bulk_update(devices, ['fingerprint'])
+
+    duplicates = LoginDevice.objects.values(
+        'user', 'fingerprint'
+    ).annotate(
+        count=Count('id'),
+    ).filter(count__gt=1)
+
+    for duplicate in duplicates:
+        devices = LoginDevice.objects.filter(
+            user=duplicate.get('user'),
+            fingerprint=duplicate.get('fingerprint'),
+        ).order_by('id')
+        merged = devices.aggregate(
+            last_login=Max('last_login'),
+            is_registered=BoolOr('is_registered'),
+        )
+        first = devices.first()
+        devices.exclude(pk=first.pk).delete()
+        LoginDevice.objects.filter(pk=first.pk).update(**merged)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_tel_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='logindevice',
+            name='fingerprint',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.RunPython(fill_fingerprints, migrations.RunPython.noop),
+    ]
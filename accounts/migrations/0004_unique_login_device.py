@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_login_device_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='logindevice',
+            constraint=models.UniqueConstraint(fields=('user', 'fingerprint'), name='unique_login_device'),
+        ),
+    ]
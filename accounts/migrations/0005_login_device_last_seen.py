@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:14
+
+from django.db import migrations, models
+from django.db.models import F
+import django.utils.timezone
+
+
+def fill_last_seen(apps, schema_editor):
+    LoginDevice = apps.get_model('accounts', 'LoginDevice')
+    LoginDevice.objects.update(last_seen=F('last_login'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_unique_login_device'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='logindevice',
+            name='last_seen',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(fill_last_seen, migrations.RunPython.noop),
+    ]
@@ -6,7 +6,12 @@ from django.db import models
 from django.db.models import Q
 from django.utils import timezone
 
-from core.fields import EncryptedCharField
+from core.fields import (
+    BlindIndexField,
+    EncryptedCharField,
+    blind_index_query,
+)
+from core.search import reindex_author
 from utils.constants import Const
 from utils.datautils import true_or_false
 from utils.debug import Debug  # noqa
@@ -38,13 +43,20 @@ class UserManager(DjangoUserManager):
     def query_anti_staff(self, q):
         return Q(is_staff=False) & self.query_active(q)
 
+    def tel_query(self, tel):
+        return blind_index_query(self.model, 'tel', tel)
+
+    def tel(self, tel):
+        return self.filter(self.tel_query(tel))
+
     def user_query(self, q):
         if q:
             return (
                 Q(username__icontains=q) |
                 Q(first_name__icontains=q) |
                 Q(last_name__icontains=q) |
-                Q(call_name__icontains=q)
+                Q(call_name__icontains=q) |
+                self.tel_query(q)
             )
         return Q()
 
@@ -88,6 +100,7 @@ class User(AbstractUser):
         blank=True,
         null=True,
     )
+    tel_index = BlindIndexField('tel')
     address = EncryptedCharField(
         max_length=Const.ADDRESS_MAX_LENGTH,
         blank=True,
@@ -102,6 +115,36 @@ class User(AbstractUser):
     class Meta:
         ordering = ['-id']
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'call_name' in instance.__dict__:
+            instance.loaded_call_name = instance.call_name
+        return instance
+
+    def is_renamed(self, update_fields):
+        if update_fields is not None and 'call_name' not in update_fields:
+            return False
+        if not hasattr(self, 'loaded_call_name'):
+            return False
+        return self.loaded_call_name != self.call_name
+
+    def save(self, *args, **kwargs):
+        """
+        Search vectors of the user's writings are rebuilt
+        when call_name changes.
+        """
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'tel' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'tel_index'}
+
+        renamed = self.is_renamed(update_fields)
+        super().save(*args, **kwargs)
+
+        if renamed:
+            reindex_author(self)
+        self.loaded_call_name = self.call_name
+
     def token(self):
         return tools.get_auth_token(self)
 
@@ -110,7 +153,41 @@ class User(AbstractUser):
 
 
 class LoginDeviceManager(models.Manager):
-    pass
+    def device(self, user, device, os, browser, ip_address):
+        return self.filter(
+            user=user,
+            fingerprint=tools.device_fingerprint(
+                device, os, browser, ip_address
+            )
+        ).first()
+
+    def get_or_insert(self, user, device, os, browser, ip_address):
+        """
+        Return the login device, inserted if new
+
+        Concurrent logins meet at the unique (user, fingerprint) index,
+        so the device is never duplicated.
+        """
+        login_device = self.device(user, device, os, browser, ip_address)
+        if login_device:
+            return login_device
+
+        self.bulk_create(
+            [
+                self.model(
+                    user=user,
+                    device=device,
+                    os=os,
+                    browser=browser,
+                    ip_address=ip_address,
+                    fingerprint=tools.device_fingerprint(
+                        device, os, browser, ip_address
+                    ),
+                )
+            ],
+            ignore_conflicts=True
+        )
+        return self.device(user, device, os, browser, ip_address)
 
 
 class LoginDevice(models.Model):
@@ -142,12 +219,31 @@ class LoginDevice(models.Model):
     )
     created_at = models.DateTimeField(default=timezone.now)
     last_login = models.DateTimeField(default=timezone.now)
+    last_seen = models.DateTimeField(default=timezone.now)
     is_registered = models.BooleanField(default=False)
+    fingerprint = models.CharField(
+        max_length=Const.LENGTH_64,
+        blank=True,
+        default='',
+        editable=False,
+    )
 
     objects = LoginDeviceManager()
 
     class Meta:
         ordering = ['-id']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'fingerprint'],
+                name='unique_login_device',
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.fingerprint = tools.device_fingerprint(
+            self.device, self.os, self.browser, self.ip_address
+        )
+        super().save(*args, **kwargs)
 
 
 class AuthCodeManager(models.Manager):
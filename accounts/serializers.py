@@ -9,6 +9,7 @@ from django.utils.http import urlsafe_base64_decode
 
 from rest_framework import serializers
 
+from core.authentication import forget_tokens, get_token_keys
 from core.error import Error
 from core.serializers import (
     ModelSerializer,
@@ -93,15 +94,18 @@ class LoginDeviceSerializer(ModelSerializer):
             'browser',
             'ip_address',
             'last_login',
+            'last_seen',
             'is_registered',
         ]
 
 
 class _PasswordChangeSerializer(Serializer):
     def save(self, **kwargs):
+        keys = get_token_keys(self.user)
         self.user.set_password(self.validated_data.get('new_password'))
         self.user.save(update_fields=['password'])
         self.user.token().delete()
+        forget_tokens(keys)
 
         if settings.USE_LOGIN_DEVICE:
             devices = models.LoginDevice.objects.filter(user=self.user)
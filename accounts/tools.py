@@ -1,11 +1,21 @@
+import hashlib
 import random
 
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils import timezone
 from django.utils.crypto import get_random_string
 
 from rest_framework.authtoken.models import Token
 
+from core.authentication import (
+    forget_tokens,
+    forget_user,
+    get_token_keys,
+)
+from core.buffers import TimestampBuffer
+from core.cache import cache
+from core.retention import RetentionPolicy
 from utils.constants import Const
 from utils.text import Text
 from utils.debug import Debug  # noqa
@@ -23,6 +33,16 @@ class _Test:
 
 Test = _Test()
 
+user_last_login = TimestampBuffer(
+    'accounts.User', 'last_login', settings.LAST_SEEN_INTERVAL
+)
+device_last_login = TimestampBuffer(
+    'accounts.LoginDevice', 'last_login', settings.LAST_SEEN_INTERVAL
+)
+device_last_seen = TimestampBuffer(
+    'accounts.LoginDevice', 'last_seen', settings.LAST_SEEN_INTERVAL
+)
+
 
 def get_call_name(first_name, last_name, language=None):
     if not language:
@@ -36,6 +56,11 @@ def get_call_name(first_name, last_name, language=None):
     return call_name
 
 
+def device_fingerprint(device, os, browser, ip_address):
+    raw = repr([device, os, browser, ip_address])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
 def is_same_device(request, login_device):
     ip_address = get_ip_address(request)
     device, os, browser = get_user_agent(request)
@@ -67,14 +92,55 @@ def set_last_login(device=None, user=None):
 
     if device:
         device.last_login = now
-        device.save(update_fields=['last_login'])
+        device.last_seen = now
+        device_last_login.touch(device.pk, now)
+        device_last_seen.touch(device.pk, now)
 
         if not user:
             user = device.user
 
     if user:
         user.last_login = now
-        user.save(update_fields=['last_login'])
+        user_last_login.touch(user.pk, now)
+
+
+def request_fingerprint(request):
+    return device_fingerprint(
+        *get_user_agent(request), get_ip_address(request)
+    )
+
+
+def device_id_key(user, fingerprint):
+    return 'device:%d:%s' % (user.pk, fingerprint)
+
+
+def get_device_id(request, user, device_model):
+    """
+    Return the id of the login device of request or 0
+    """
+    fingerprint = request_fingerprint(request)
+
+    def device_id():
+        return device_model.objects.filter(
+            user=user,
+            fingerprint=fingerprint
+        ).values_list('pk', flat=True).first() or 0
+
+    return cache.get_or_set(
+        device_id_key(user, fingerprint),
+        device_id,
+        settings.REST_AUTH_CACHE_TIMEOUT
+    )
+
+
+def forget_device_id(request, user):
+    cache.delete(device_id_key(user, request_fingerprint(request)))
+
+
+def seen_device(request, user, device_model):
+    device_id = get_device_id(request, user, device_model)
+    if device_id:
+        device_last_seen.touch(device_id, timezone.now())
 
 
 def get_auth_token(user):
@@ -101,13 +167,17 @@ def approve_user(user, auth_code):
     else:
         Debug.error('Wrong auth type for %s' % auth_code)
     user.save()
+    forget_user(user)
 
 
 def delete_auth_token(user):
+    keys = get_token_keys(user)
     try:
         user.auth_token.delete()
     except (AttributeError, ObjectDoesNotExist):
         return False
+    finally:
+        forget_tokens(keys)
     return True
 
 
@@ -146,6 +216,7 @@ def destroy_privacy(user):
 
 def deactivate_account(user, authcode_model):
     Debug.trace('Deactivating %s' % user)
+    keys = get_token_keys(user)
 
     if authcode_model:
         destory_authcode(user, authcode_model)
@@ -159,3 +230,18 @@ def deactivate_account(user, authcode_model):
 
     user.save()
     user.token().delete()
+    forget_tokens(keys)
+
+
+def retention_policies():
+    return [
+        RetentionPolicy(
+            'accounts.AuthCode',
+            settings.RETENTION_AUTH_CODE_DAYS
+        ),
+        RetentionPolicy(
+            'accounts.LoginDevice',
+            settings.RETENTION_LOGIN_DEVICE_DAYS,
+            fields=['last_seen']
+        ),
+    ]
@@ -1,7 +1,9 @@
 from django.conf import settings
 from django.utils import timezone
 
+from core.authentication import forget_user
 from core.error import Error
+from core.fields import decrypt_instances
 from core.viewsets import (
     APIView,
     CreateAPIView,
@@ -52,13 +54,10 @@ class UserLoginView(GenericAPIView):
             ip_address = get_ip_address(request)
             device, os, browser = get_user_agent(request)
 
-            login_device, _ = models.LoginDevice.objects.get_or_create(
-                user=user,
-                device=device,
-                os=os,
-                browser=browser,
-                ip_address=ip_address
+            login_device = models.LoginDevice.objects.get_or_insert(
+                user, device, os, browser, ip_address
             )
+            tools.forget_device_id(request, user)
             key = login_device.user.key()
         else:
             login_device = None
@@ -91,14 +90,11 @@ class UserLogoutView(APIView):
             ip_address = get_ip_address(request)
             device, os, browser = get_user_agent(request)
 
-            login_device = models.LoginDevice.objects.filter(
-                user=request.user,
-                device=device,
-                os=os,
-                browser=browser,
-                ip_address=ip_address
-            ).first()
+            login_device = models.LoginDevice.objects.device(
+                request.user, device, os, browser, ip_address
+            )
             tools.delete_device(login_device)
+            tools.forget_device_id(request, request.user)
         else:
             tools.delete_auth_token(request.user)
 
@@ -177,6 +173,10 @@ class UserSettingViewSet(ModelViewSet):
     def get_object(self):
         return self.request.user
 
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        forget_user(serializer.instance)
+
 
 class ConnectView(UserLoginView):
     permission_classes = [IsAuthenticated]
@@ -204,6 +204,10 @@ class _UserAdminViewSet(ModelViewSet):
             self.q, self.get_filters()
         ).order_by(self.get_order())
 
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        forget_user(serializer.instance)
+
     def perform_delete(self, instance):
         if settings.USE_LOGIN_DEVICE:
             models.LoginDevice.objects.filter(user=instance).delete()
@@ -226,6 +230,7 @@ class StaffAdminViewSet(_UserAdminViewSet):
 
 class UserAdminExportViewSet(UserAdminViewSet, ExcelViewSet):
     filename_prefix = 'user'
+    streaming = True
     title = [
         'id',
         '%s' % Text.EXCEL_TITLE_USERNAME,
@@ -239,31 +244,22 @@ class UserAdminExportViewSet(UserAdminViewSet, ExcelViewSet):
         '%s' % Text.EXCEL_TITLE_JOINED_DATE,
     ]
 
-    def make_data(self, key=None, index=0):
-        data = [
-            self.title
+    def prepare_chunk(self, chunk):
+        return decrypt_instances(chunk, ['tel', 'address'])
+
+    def make_row(self, item):
+        return [
+            item.get('id'),
+            item.get('username'),
+            self.get_not_null(item.get('first_name')),
+            self.get_not_null(item.get('last_name')),
+            self.get_not_null(item.get('call_name')),
+            self.get_not_null(item.get('tel')),
+            self.get_not_null(item.get('address')),
+            self.get_not_null(item.get('is_active')),
+            self.get_not_null(item.get('is_approved')),
+            item.get('date_joined').split('T')[0],
         ]
-        format_data = [
-            self.header_format
-        ]
-
-        for user in key:
-            user_data = [
-                user.get('id'),
-                user.get('username'),
-                self.get_not_null(user.get('first_name')),
-                self.get_not_null(user.get('last_name')),
-                self.get_not_null(user.get('call_name')),
-                self.get_not_null(user.get('tel')),
-                self.get_not_null(user.get('address')),
-                self.get_not_null(user.get('is_active')),
-                self.get_not_null(user.get('is_approved')),
-                user.get('date_joined').split('T')[0],
-            ]
-            data.append(user_data)
-            format_data.append(self.content_format)
-
-        return data, format_data
 
 
 class AuthCodeViewSet(ModelViewSet):
@@ -24,6 +24,12 @@ urlpatterns = [
             'get': 'list',
         }), name='user_export'
     ),
+    path(
+        'users/export/jobs/',
+        accounts_views.UserAdminExportViewSet.as_view({
+            'post': 'enqueue',
+        }), name='user_export_job'
+    ),
     path(
         'users/staff/', accounts_views.StaffAdminViewSet.as_view({
             'get': 'list',
@@ -51,11 +57,23 @@ urlpatterns = [
             'get': 'list',
         }), name='threads'
     ),
+    path(
+        'threads/moderate/',
+        communities_views.ThreadModerationViewSet.as_view({
+            'post': 'moderate',
+        }), name='moderate_threads'
+    ),
     path(
         'replies/', communities_views.ReplyAdminViewSet.as_view({
             'get': 'list',
         }), name='replies'
     ),
+    path(
+        'replies/moderate/',
+        communities_views.ReplyModerationViewSet.as_view({
+            'post': 'moderate',
+        }), name='moderate_replies'
+    ),
     path(
         'blogs/', contents_views.BlogAdminListViewSet.as_view({
             'get': 'filter_list',
@@ -85,9 +103,31 @@ urlpatterns = [
             'post': 'restore'
         }), name='restore_comment'
     ),
+    path(
+        'comments/moderate/',
+        contents_views.CommentModerationViewSet.as_view({
+            'post': 'moderate',
+        }), name='moderate_comments'
+    ),
     path(
         'files/', things_views.AttachmentManageViewSet.as_view({
             'get': 'list',
         }), name='files'
     ),
+    path(
+        'exports/', things_views.ExportJobViewSet.as_view({
+            'get': 'list',
+        }), name='export_jobs'
+    ),
+    path(
+        'exports/<int:pk>/', things_views.ExportJobViewSet.as_view({
+            'get': 'retrieve',
+        }), name='export_job'
+    ),
+    path(
+        'exports/<int:pk>/download/',
+        things_views.ExportJobViewSet.as_view({
+            'get': 'download',
+        }), name='download_export'
+    ),
 ]
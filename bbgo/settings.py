@@ -75,6 +75,7 @@ try:
     AWS_ACCESS_KEY_ID = ''
     AWS_SECRET_ACCESS_KEY = ''
     AES_PASSPHRASE = ''
+    BLIND_INDEX_KEY = ''
     SECRET_KEY = ''
     # DO NOT COMMIT YOUR SECRETS ABOVE INTO PUBLIC REPOSITORY.
 
@@ -86,6 +87,9 @@ except IOError:
 if not AES_PASSPHRASE:
     AES_PASSPHRASE = SECRET_KEY
 
+if not BLIND_INDEX_KEY:
+    BLIND_INDEX_KEY = AES_PASSPHRASE
+
 
 # Default configurations.
 # It is highly suggested to override in CONFIG_PATH to change configurations.
@@ -101,6 +105,29 @@ STAGING_SERVER = False
 TRACE_ENABLED = True
 UPLOAD_MAX_SIZE = 20 * 1024 * 1024
 REST_PAGINATION_SIZE_DEFAULT = 20
+REST_PAGINATION_COUNT_DEFAULT = 'exact'
+REST_PAGINATION_COUNT_CAP = 10000
+REST_PAGINATION_COUNT_TIMEOUT = 300
+REST_RESPONSE_CACHE_TIMEOUT = 300
+REST_AUTH_CACHE_TIMEOUT = 60
+LAST_SEEN_INTERVAL = 30
+USER_AGENT_CACHE_SIZE = 1024
+USER_AGENT_CACHE_TIMEOUT = 86400
+RETENTION_AUTH_CODE_DAYS = 30
+RETENTION_LOGIN_DEVICE_DAYS = 365
+RETENTION_TRASH_DAYS = 90
+RETENTION_BATCH_SIZE = 500
+RETENTION_PAUSE = 0.1  # seconds between batches
+RETENTION_RETRIES = 5
+RETENTION_LOCK_TIMEOUT = 1000  # milliseconds
+CACHE_BACKEND = 'database'  # database, file or memory
+CACHE_LOCATION = 'bbgo_cache'  # table name, or directory for file
+CACHE_TIMEOUT = 300
+CACHE_MAX_ENTRIES = 10000
+CACHE_VERSION = 1
+CACHE_LOCAL_SIZE = 256
+CACHE_LOCAL_TIMEOUT = 5
+CACHE_REGISTRY_TIMEOUT = 60
 DATE_TIME_FORMAT_DEFAULT = '%Y-%m-%dT%H:%M:%S%z'
 DATE_FORMAT_DEFAULT = '%Y-%m-%d'
 DO_NOT_SEND_EMAIL = False
@@ -230,6 +257,30 @@ DATABASES = {
 }
 
 
+# Cache
+# Shared tier of core.cache, run createcachetable for database backend.
+# memory backend is per process, use it with a single worker only.
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHE_BACKENDS = {
+    'database': 'django.core.cache.backends.db.DatabaseCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'memory': 'django.core.cache.backends.locmem.LocMemCache',
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': CACHE_LOCATION,
+        'TIMEOUT': CACHE_TIMEOUT,
+        'VERSION': CACHE_VERSION,
+        'OPTIONS': {
+            'MAX_ENTRIES': CACHE_MAX_ENTRIES,
+        },
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -278,10 +329,36 @@ STATICFILES_DIRS = (
 # https://github.com/jschneier/django-storages
 # AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY should be set in SECRETS_PATH
 
+# Export files hold personal data, keep them out of the public storage
+# and serve them only through the export download view
+
+EXPORT_ROOT = BASE_DIR / 'exports'
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage"
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+    },
+    "exports": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "OPTIONS": {
+            "location": EXPORT_ROOT,
+        }
+    },
+}
+
 if 'storages' in INSTALLED_APPS and not LOCAL_SERVER and not DEV_SERVER:
-    STORAGES = {
-        "default": {
-            "BACKEND": "storages.backends.s3boto3.S3Boto3Storage"
+    STORAGES["default"] = {
+        "BACKEND": "storages.backends.s3boto3.S3Boto3Storage"
+    }
+    STORAGES["exports"] = {
+        "BACKEND": "storages.backends.s3boto3.S3Boto3Storage",
+        "OPTIONS": {
+            "default_acl": "private",
+            "querystring_auth": True,
+            "location": "private",
         }
     }
     AWS_QUERYSTRING_AUTH = False
@@ -363,7 +440,7 @@ ADMINS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'accounts.authentication.LoginDeviceAuthentication',
     ),
     'DEFAULT_PAGINATION_CLASS': 'core.pagination.PrevNextPagination',
     'EXCEPTION_HANDLER': 'core.exceptions.custom_exception_handler',
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from communities import tools
+from utils.constants import Const
+
+
+class Command(BaseCommand):
+    help = 'Recompute drifted thread, reply and forum counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=Const.CHUNK_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+
+        threads = tools.sync_thread_counters(chunk_size=chunk_size)
+        replies = tools.sync_reply_counters(chunk_size=chunk_size)
+        forums = tools.sync_forum_stats(chunk_size=chunk_size)
+
+        self.stdout.write(
+            '%d threads, %d replies, %d forums fixed.' % (
+                threads, replies, forums
+            )
+        )
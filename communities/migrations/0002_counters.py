@@ -0,0 +1,62 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:43
+
+from django.db import migrations, models
+
+from core.queries import count_subquery
+
+
+def fill_counters(apps, schema_editor):
+    Thread = apps.get_model('communities', 'Thread')
+    Reply = apps.get_model('communities', 'Reply')
+
+    Thread.objects.update(
+        up_count=count_subquery(Thread.up_users.through.objects.all(), 'thread'),
+        down_count=count_subquery(
+            Thread.down_users.through.objects.all(), 'thread'
+        ),
+        active_reply_count=count_subquery(
+            Reply.objects.filter(is_deleted=False), 'thread'
+        ),
+    )
+    Reply.objects.update(
+        up_count=count_subquery(Reply.up_users.through.objects.all(), 'reply'),
+        down_count=count_subquery(
+            Reply.down_users.through.objects.all(), 'reply'
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communities', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reply',
+            name='down_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='reply',
+            name='up_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='thread',
+            name='active_reply_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='thread',
+            name='down_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='thread',
+            name='up_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:53
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+from core.search import to_vector
+from utils.constants import Const
+
+
+def fill(queryset, document):
+    instances = []
+
+    for instance in queryset.iterator(chunk_size=Const.CHUNK_SIZE):
+        instance.search_vector = to_vector(document(instance))
+        instances.append(instance)
+
+        if len(instances) >= Const.CHUNK_SIZE:
+            queryset.model.objects.bulk_update(instances, ['search_vector'])
+            instances = []
+
+    queryset.model.objects.bulk_update(instances, ['search_vector'])
+
+
+def call_name(instance):
+    return instance.user.call_name if instance.user else None
+
+
+def fill_search_vector(apps, schema_editor):
+    Thread = apps.get_model('communities', 'Thread')
+    Reply = apps.get_model('communities', 'Reply')
+
+    fill(Thread.objects.select_related('user'), lambda thread: [
+        (thread.title, 'A'),
+        (thread.content, 'B'),
+        (thread.name, 'C'),
+        (call_name(thread), 'C'),
+    ])
+    fill(Reply.objects.select_related('user'), lambda reply: [
+        (reply.content, 'B'),
+        (reply.name, 'C'),
+        (call_name(reply), 'C'),
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communities', '0002_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reply',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='thread',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, null=True),
+        ),
+        migrations.RunPython(fill_search_vector, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='reply',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='communities_search__188c71_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='thread',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='communities_search__8af67b_gin'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:55
+
+from django.db import migrations, models
+from django.db.models import Case, F, When
+
+from core.queries import chunked_ids
+
+
+def fill_root_id(apps, schema_editor):
+    Reply = apps.get_model('communities', 'Reply')
+
+    for ids in chunked_ids(Reply.objects.all()):
+        Reply.objects.filter(pk__in=ids).update(
+            root_id=Case(
+                When(reply_id=0, then=F('id')),
+                default=F('reply_id'),
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communities', '0003_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reply',
+            name='root_id',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_root_id, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='reply',
+            index=models.Index(fields=['thread', '-root_id', 'id'], name='communities_thread__5c2508_idx'),
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:58
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+from core.queries import chunked_ids
+from utils.constants import Const
+
+
+def copy_votes(apps, schema_editor):
+    Thread = apps.get_model('communities', 'Thread')
+    Reply = apps.get_model('communities', 'Reply')
+    Vote = apps.get_model('communities', 'Vote')
+
+    for model, target in ((Thread, 'thread_id'), (Reply, 'reply_id')):
+        # up votes first, they win over a conflicting down vote
+        for users, value in (
+            ('up_users', Const.VOTE_UP),
+            ('down_users', Const.VOTE_DOWN),
+        ):
+            through = getattr(model, users).through
+
+            for ids in chunked_ids(through.objects.all()):
+                Vote.objects.bulk_create(
+                    [
+                        Vote(
+                            user_id=row.user_id,
+                            value=value,
+                            **{target: getattr(row, target)}
+                        )
+                        for row in through.objects.filter(pk__in=ids)
+                    ],
+                    ignore_conflicts=True
+                )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('communities', '0004_root_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Vote',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.SmallIntegerField(default=1)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('reply', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='vote_reply', to='communities.reply')),
+                ('thread', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='vote_thread', to='communities.thread')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vote_user', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='vote',
+            constraint=models.UniqueConstraint(fields=('thread', 'user'), name='unique_thread_vote'),
+        ),
+        migrations.AddConstraint(
+            model_name='vote',
+            constraint=models.UniqueConstraint(fields=('reply', 'user'), name='unique_reply_vote'),
+        ),
+        migrations.AddConstraint(
+            model_name='vote',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('reply__isnull', True), ('thread__isnull', False)), models.Q(('reply__isnull', False), ('thread__isnull', True)), _connector='OR'), name='vote_one_target'),
+        ),
+        migrations.RunPython(copy_votes, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='reply',
+            name='down_users',
+        ),
+        migrations.RemoveField(
+            model_name='reply',
+            name='up_users',
+        ),
+        migrations.RemoveField(
+            model_name='thread',
+            name='down_users',
+        ),
+        migrations.RemoveField(
+            model_name='thread',
+            name='up_users',
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from core.queries import chunked_ids, count_subquery
+
+
+def latest(queryset, field):
+    return Subquery(
+        queryset.filter(
+            **{field: OuterRef('pk')}
+        ).order_by('-created_at').values('created_at')[:1]
+    )
+
+
+def fill_forum_stats(apps, schema_editor):
+    Forum = apps.get_model('communities', 'Forum')
+    ForumStat = apps.get_model('communities', 'ForumStat')
+    Thread = apps.get_model('communities', 'Thread')
+    Reply = apps.get_model('communities', 'Reply')
+
+    for ids in chunked_ids(Forum.objects.all()):
+        stats = Forum.objects.filter(pk__in=ids).annotate(
+            real_thread_count=count_subquery(
+                Thread.objects.filter(is_deleted=False), 'forum'
+            ),
+            real_reply_count=count_subquery(
+                Reply.objects.all(), 'thread__forum'
+            ),
+            real_deleted_thread_count=count_subquery(
+                Thread.objects.filter(is_deleted=True), 'forum'
+            ),
+            real_deleted_reply_count=count_subquery(
+                Reply.objects.filter(is_deleted=True), 'thread__forum'
+            ),
+            real_last_activity_at=Coalesce(
+                Greatest(
+                    latest(Thread.objects.all(), 'forum'),
+                    latest(Reply.objects.all(), 'thread__forum'),
+                ),
+                'created_at',
+            ),
+        )
+
+        ForumStat.objects.bulk_create([
+            ForumStat(
+                forum_id=forum.pk,
+                thread_count=forum.real_thread_count,
+                reply_count=forum.real_reply_count,
+                deleted_thread_count=forum.real_deleted_thread_count,
+                deleted_reply_count=forum.real_deleted_reply_count,
+                last_activity_at=forum.real_last_activity_at,
+            )
+            for forum in stats
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communities', '0005_votes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ForumStat',
+            fields=[
+                ('forum', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stat', serialize=False, to='communities.forum')),
+                ('thread_count', models.IntegerField(default=0)),
+                ('reply_count', models.IntegerField(default=0)),
+                ('deleted_thread_count', models.IntegerField(default=0)),
+                ('deleted_reply_count', models.IntegerField(default=0)),
+                ('last_activity_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.RunPython(fill_forum_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-18 09:11
+
+from importlib import import_module
+
+from django.db import migrations
+
+
+def fill_search_vector(apps, schema_editor):
+    import_module(
+        'communities.migrations.0003_search_vector'
+    ).fill_search_vector(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communities', '0007_hot_score'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_search_vector, migrations.RunPython.noop),
+    ]
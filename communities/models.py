@@ -1,13 +1,13 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
-from django.db.models import (
-    Case,
-    F,
-    IntegerField,
-    Q,
-    When,
-)
+from django.db.models import Q
 from django.utils import timezone
 
+from core.search import (
+    SearchVectorMixin,
+    text_search,
+)
 from utils.constants import Const
 from utils.datautils import true_or_false
 from utils.dateutils import date_or_time
@@ -69,38 +69,72 @@ class Forum(models.Model):
     class Meta:
         ordering = ['-id']
 
+    def get_stat(self):
+        return getattr(self, 'stat', None)
+
     def thread_count(self):
+        stat = self.get_stat()
+        if stat:
+            return stat.thread_count
         return Thread.objects.forum(self).count()
 
     def reply_count(self):
+        stat = self.get_stat()
+        if stat:
+            return stat.reply_count
         return Reply.objects.filter(thread__forum=self).count()
 
+    def deleted_thread_count(self):
+        stat = self.get_stat()
+        if stat:
+            return stat.deleted_thread_count
+        return Thread.objects.deleted(self).count()
+
+    def last_activity_at(self):
+        stat = self.get_stat()
+        if stat:
+            return stat.last_activity_at
+        return self.created_at
+
     def support_files(self):
         return self.option.get('support_files')
 
 
+class ForumStat(models.Model):
+    """
+    Forum Statistics
+
+    Kept up to date by communities.tools on thread and reply writes
+    and reconciled by sync_forum_stats().
+    """
+
+    forum = models.OneToOneField(
+        'Forum',
+        related_name='stat',
+        on_delete=models.CASCADE,
+        primary_key=True,
+    )
+    thread_count = models.IntegerField(default=Const.BASE_COUNT)
+    reply_count = models.IntegerField(default=Const.BASE_COUNT)
+    deleted_thread_count = models.IntegerField(default=Const.BASE_COUNT)
+    deleted_reply_count = models.IntegerField(default=Const.BASE_COUNT)
+    last_activity_at = models.DateTimeField(default=timezone.now)
+
+
 class ThreadManager(models.Manager):
     def forum(self, forum, user=None):
         if isinstance(forum, Forum):
-            return self.filter(forum=forum).filter(is_deleted=False)
-        elif user and user.is_staff:
-            return self.filter(forum__name=forum)
+            threads = self.filter(forum=forum)
         else:
-            return self.filter(forum__name=forum).filter(is_deleted=False)
+            threads = self.filter(forum__name=forum)
 
-    def search_query(self, q):
-        if q:
-            return (
-                Q(title__icontains=q) |
-                Q(content__icontains=q) |
-                (Q(user__isnull=True) & Q(name__icontains=q)) |
-                Q(user__call_name__icontains=q)
-            )
+        if user and user.is_staff:
+            return threads
         else:
-            return Q()
+            return threads.filter(is_deleted=False)
 
     def search(self, forum, q):
-        return self.forum(forum).filter(self.search_query(q)).distinct()
+        return text_search(self.forum(forum), q, self.model._meta.ordering)
 
     def deleted(self, forum):
         if isinstance(forum, Forum):
@@ -109,7 +143,7 @@ class ThreadManager(models.Manager):
             return self.filter(forum__name=forum).filter(is_deleted=True)
 
     def trash(self, forum, q):
-        return self.deleted(forum).filter(self.search_query(q)).distinct()
+        return text_search(self.deleted(forum), q, self.model._meta.ordering)
 
     def admin_query(self, q):
         query = Q()
@@ -124,10 +158,10 @@ class ThreadManager(models.Manager):
         return query
 
     def admin_search(self, q, filters):
-        return self.filter(filters).filter(self.search_query(q)).distinct()
+        return text_search(self.filter(filters), q)
 
 
-class Thread(models.Model):
+class Thread(SearchVectorMixin, models.Model):
     forum = models.ForeignKey(
         'Forum',
         related_name='thread_forum',
@@ -154,33 +188,40 @@ class Thread(models.Model):
         null=True,
     )
     content = models.TextField(null=True, blank=True)
-    up_users = models.ManyToManyField(
-        'accounts.User',
-        related_name='thread_up',
-        default='',
-        blank=True,
-    )
-    down_users = models.ManyToManyField(
-        'accounts.User',
-        related_name='thread_down',
-        default='',
-        blank=True,
-    )
     files = models.ManyToManyField(
         'things.Attachment',
         related_name='thread_files',
         default='',
         blank=True,
     )
+    up_count = models.IntegerField(default=Const.BASE_COUNT)
+    down_count = models.IntegerField(default=Const.BASE_COUNT)
+    active_reply_count = models.IntegerField(default=Const.BASE_COUNT)
+    hot_score = models.FloatField(default=Const.BASE_COUNT)
     is_pinned = models.BooleanField(default=False)
     is_deleted = models.BooleanField(default=False)
     created_at = models.DateTimeField(default=timezone.now)
     modified_at = models.DateTimeField(blank=True, null=True)
+    search_vector = SearchVectorField(blank=True, null=True)
 
     objects = ThreadManager()
+    search_fields = ['title', 'content', 'name', 'user']
+    my_vote = Const.VOTE_NONE
 
     class Meta:
         ordering = ['-is_pinned', '-id']
+        indexes = [
+            GinIndex(fields=['search_vector']),
+            models.Index(fields=['forum', '-hot_score', '-id']),
+        ]
+
+    def search_document(self):
+        return [
+            (self.title, 'A'),
+            (self.content, 'B'),
+            (self.name, 'C'),
+            (self.user.call_name if self.user else None, 'C'),
+        ]
 
     def forum_name(self):
         if self.forum:
@@ -192,13 +233,16 @@ class Thread(models.Model):
         return date_or_time(self.created_at)
 
     def up(self):
-        return self.up_users.count()
+        return self.up_count
 
     def down(self):
-        return self.down_users.count()
+        return self.down_count
+
+    def vote(self):
+        return self.my_vote
 
     def reply_count(self):
-        return Reply.objects.active_count(self)
+        return self.active_reply_count
 
 
 class ReplyManager(models.Manager):
@@ -217,14 +261,7 @@ class ReplyManager(models.Manager):
         if not user.is_staff:
             thread_replies &= Q(is_deleted=False)
 
-        replies = self.filter(thread_replies).annotate(
-            custom_order=Case(
-                When(reply_id=0, then=F('id')),
-                default=F('reply_id'),
-                output_field=IntegerField(),
-            )
-        ).order_by('-custom_order', 'id')
-        return replies
+        return self.filter(thread_replies).order_by('-root_id', 'id')
 
     def my(self, user):
         if user and user.is_staff:
@@ -232,16 +269,6 @@ class ReplyManager(models.Manager):
         else:
             return self.filter(user=user).filter(is_deleted=False)
 
-    def search_query(self, q):
-        if q:
-            return (
-                Q(content__icontains=q) |
-                (Q(user__isnull=True) & Q(name__icontains=q)) |
-                Q(user__call_name__icontains=q)
-            )
-        else:
-            return Q()
-
     def admin_query(self, q):
         query = Q()
         deleted = true_or_false(q.get(Const.QUERY_PARAM_DELETED))
@@ -251,10 +278,10 @@ class ReplyManager(models.Manager):
         return query
 
     def admin_search(self, q, filters):
-        return self.filter(filters).filter(self.search_query(q)).distinct()
+        return text_search(self.filter(filters), q)
 
 
-class Reply(models.Model):
+class Reply(SearchVectorMixin, models.Model):
     thread = models.ForeignKey(
         'Thread',
         related_name='reply_thread',
@@ -263,6 +290,7 @@ class Reply(models.Model):
         null=True,
     )
     reply_id = models.BigIntegerField(default=0)
+    root_id = models.BigIntegerField(default=0)
     user = models.ForeignKey(
         'accounts.User',
         related_name='reply_user',
@@ -277,26 +305,40 @@ class Reply(models.Model):
         null=True,
     )
     content = models.TextField(null=True, blank=True)
-    up_users = models.ManyToManyField(
-        'accounts.User',
-        related_name='reply_up',
-        default='',
-        blank=True,
-    )
-    down_users = models.ManyToManyField(
-        'accounts.User',
-        related_name='reply_down',
-        default='',
-        blank=True,
-    )
+    up_count = models.IntegerField(default=Const.BASE_COUNT)
+    down_count = models.IntegerField(default=Const.BASE_COUNT)
     is_deleted = models.BooleanField(default=False)
     created_at = models.DateTimeField(default=timezone.now)
     modified_at = models.DateTimeField(blank=True, null=True)
+    search_vector = SearchVectorField(blank=True, null=True)
 
     objects = ReplyManager()
+    search_fields = ['content', 'name', 'user']
+    my_vote = Const.VOTE_NONE
 
     class Meta:
         ordering = ['-id']
+        indexes = [
+            GinIndex(fields=['search_vector']),
+            models.Index(fields=['thread', '-root_id', 'id']),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self.root_id and self.reply_id:
+            self.root_id = self.reply_id
+
+        super().save(*args, **kwargs)
+
+        if not self.root_id:
+            self.root_id = self.pk
+            Reply.objects.filter(pk=self.pk).update(root_id=self.root_id)
+
+    def search_document(self):
+        return [
+            (self.content, 'B'),
+            (self.name, 'C'),
+            (self.user.call_name if self.user else None, 'C'),
+        ]
 
     def forum(self):
         if self.thread:
@@ -314,7 +356,60 @@ class Reply(models.Model):
         return date_or_time(self.created_at)
 
     def up(self):
-        return self.up_users.count()
+        return self.up_count
 
     def down(self):
-        return self.down_users.count()
+        return self.down_count
+
+    def vote(self):
+        return self.my_vote
+
+
+class Vote(models.Model):
+    """
+    Vote on a thread or a reply
+
+    One row per user and target, value is VOTE_UP or VOTE_DOWN.
+    """
+
+    user = models.ForeignKey(
+        'accounts.User',
+        related_name='vote_user',
+        on_delete=models.CASCADE,
+    )
+    thread = models.ForeignKey(
+        'Thread',
+        related_name='vote_thread',
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+    )
+    reply = models.ForeignKey(
+        'Reply',
+        related_name='vote_reply',
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+    )
+    value = models.SmallIntegerField(default=Const.VOTE_UP)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-id']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['thread', 'user'],
+                name='unique_thread_vote',
+            ),
+            models.UniqueConstraint(
+                fields=['reply', 'user'],
+                name='unique_reply_vote',
+            ),
+            models.CheckConstraint(
+                check=(
+                    Q(thread__isnull=False, reply__isnull=True) |
+                    Q(thread__isnull=True, reply__isnull=False)
+                ),
+                name='vote_one_target',
+            ),
+        ]
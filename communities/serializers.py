@@ -1,11 +1,13 @@
 import re
 import accounts
 
+from django.utils import timezone
 from rest_framework import serializers
 
 from core.error import Error
 from core.serializers import (
     ModelSerializer,
+    ModerationSerializer,
 )
 from core.shortcuts import get_object_or_404
 
@@ -14,7 +16,7 @@ from utils.debug import Debug  # noqa
 
 from things import serializers as things_serializers
 
-from . import models
+from . import models, tools
 
 
 class ForumSerializer(ModelSerializer):
@@ -81,6 +83,10 @@ class ForumSerializer(ModelSerializer):
         else:
             instance.managers.add(self.context.get('request').user)
 
+        models.ForumStat.objects.create(
+            forum=instance,
+            last_activity_at=instance.created_at
+        )
         return instance
 
 
@@ -128,6 +134,8 @@ class ForumListSerializer(ForumSerializer):
             'created_at',
             'thread_count',
             'reply_count',
+            'deleted_thread_count',
+            'last_activity_at',
         ]
 
 
@@ -243,6 +251,12 @@ class ThreadSerializer(ModelSerializer):
         if instance.user and validated_data.get('files'):
             self.update_files(instance, validated_data.get('files'))
 
+        tools.forget_thread_count(instance.forum_id)
+        tools.update_forum_stat(
+            instance.forum_id,
+            instance.created_at,
+            thread_count=1
+        )
         return instance
 
 
@@ -262,6 +276,7 @@ class ThreadReadSerializer(ThreadSerializer):
             'files',
             'up',
             'down',
+            'vote',
             'reply_count',
             'is_pinned',
             'is_deleted',
@@ -288,6 +303,7 @@ class ThreadVoteSerializer(ThreadReadSerializer):
             'id',
             'up',
             'down',
+            'vote',
         ]
 
 
@@ -353,6 +369,7 @@ class ThreadFileSerializer(ThreadSerializer):
             attachment = file.get('id')
             self.instance.files.add(attachment)
 
+        self.instance.modified_at = timezone.now()
         self.instance.save()
         return self.instance
 
@@ -361,6 +378,7 @@ class ThreadFileSerializer(ThreadSerializer):
             attachment = file.get('id')
             self.instance.files.remove(attachment)
 
+        self.instance.modified_at = timezone.now()
         self.instance.save()
         return self.instance
 
@@ -377,6 +395,7 @@ class ThreadListSerializer(ModelSerializer):
             'title',
             'up',
             'down',
+            'vote',
             'reply_count',
             'is_pinned',
             'is_deleted',
@@ -430,6 +449,15 @@ class ThreadAdminSerializer(ThreadListSerializer):
         ]
 
 
+class ThreadModerationSerializer(ModerationSerializer):
+    action = serializers.ChoiceField(choices=[
+        Const.MODERATION_DELETE,
+        Const.MODERATION_RESTORE,
+        Const.MODERATION_PIN,
+        Const.MODERATION_UNPIN,
+    ])
+
+
 class ReplySerializer(ModelSerializer):
     thread = ThreadReplySerializer(required=False)
     user = accounts.serializers.UsernameSerializer(required=False)
@@ -465,22 +493,12 @@ class ReplySerializer(ModelSerializer):
                 Error.required_field('name')
 
         if attrs.get('reply_id'):
-            reply_id = attrs.get('reply_id')
-            thread = self.context.get('view').thread
-            nesting = 0
-
-            while nesting < Const.MAX_REPLY_NESTING:
-                reply = get_object_or_404(
-                    models.Reply,
-                    pk=reply_id,
-                    thread=thread
-                )
-                if reply.reply_id == 0:
-                    attrs['reply_id'] = reply.id
-                    break
-                else:
-                    reply_id = reply.reply_id
-                    nesting += 1
+            reply = get_object_or_404(
+                models.Reply.objects.only('root_id'),
+                pk=attrs.get('reply_id'),
+                thread=self.context.get('view').thread
+            )
+            attrs['reply_id'] = reply.root_id
         return attrs
 
     def create(self, validated_data):
@@ -491,6 +509,12 @@ class ReplySerializer(ModelSerializer):
             name=validated_data.get('name'),
             content=validated_data.get('content'),
         )
+        tools.update_reply_count(instance.thread_id, 1)
+        tools.update_forum_stat(
+            instance.thread.forum_id,
+            instance.created_at,
+            reply_count=1
+        )
         return instance
 
 
@@ -533,6 +557,7 @@ class ReplyListSerializer(ModelSerializer):
             'content',
             'up',
             'down',
+            'vote',
             'is_deleted',
             'date_or_time',
             'editable',
@@ -562,6 +587,7 @@ class ReplyVoteSerializer(ModelSerializer):
             'id',
             'up',
             'down',
+            'vote',
         ]
 
 
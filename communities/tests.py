@@ -5,7 +5,7 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from core.testcase import TestCase as CoreTestCase
 from utils.constants import Const
 
-from . import models
+from . import models, tools
 
 
 class TestCase(CoreTestCase):
@@ -70,6 +70,8 @@ class TestCase(CoreTestCase):
                 self.forum.managers.add(manager)
         else:
             self.forum.managers.add(self.user)
+
+        tools.forget_forums()
         return self.forum
 
     def create_thread(
@@ -98,14 +100,25 @@ class TestCase(CoreTestCase):
             is_pinned=is_pinned,
             is_deleted=is_deleted
         )
+        tools.forget_thread_count(forum.id)
 
         if up_users:
             for up_user in up_users:
-                self.thread.up_users.add(up_user.id)
+                models.Vote.objects.create(
+                    user=up_user, thread=self.thread, value=Const.VOTE_UP
+                )
 
         if down_users:
             for down_user in down_users:
-                self.thread.down_users.add(down_user.id)
+                models.Vote.objects.create(
+                    user=down_user, thread=self.thread, value=Const.VOTE_DOWN
+                )
+
+        if up_users or down_users:
+            tools.sync_thread_counters(
+                models.Thread.objects.filter(pk=self.thread.pk)
+            )
+            self.thread.refresh_from_db()
 
         return self.thread
 
@@ -136,10 +149,23 @@ class TestCase(CoreTestCase):
 
         if up_users:
             for up_user in up_users:
-                self.reply.up_users.add(up_user.id)
+                models.Vote.objects.create(
+                    user=up_user, reply=self.reply, value=Const.VOTE_UP
+                )
 
         if down_users:
             for down_user in down_users:
-                self.reply.down_users.add(down_user.id)
+                models.Vote.objects.create(
+                    user=down_user, reply=self.reply, value=Const.VOTE_DOWN
+                )
+
+        if up_users or down_users:
+            tools.sync_reply_counters(
+                models.Reply.objects.filter(pk=self.reply.pk)
+            )
+            self.reply.refresh_from_db()
+
+        if not is_deleted:
+            tools.update_reply_count(thread.pk, 1)
 
         return self.reply
@@ -1,49 +1,465 @@
+from collections import Counter
+
+from django.conf import settings
+from django.db import (
+    IntegrityError,
+    transaction,
+)
+from django.db.models import (
+    Exists,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import (
+    Coalesce,
+    Extract,
+    Greatest,
+    Power,
+)
 from django.utils import timezone
 
+from core.cache import (
+    LocalCache,
+    bump_generation,
+    cache,
+)
+from core.queries import (
+    chunked_ids,
+    count_subquery,
+    sync_counts,
+    update_grouped,
+)
+from core.retention import RetentionPolicy
+from core.shortcuts import get_object_or_404
+from things import (
+    models as things_models,
+    tools as things_tools,
+)
+from utils.constants import Const
 from utils.debug import Debug  # noqa
 
+from . import models
+
+
+forum_registry = LocalCache('forum', settings.CACHE_REGISTRY_TIMEOUT)
+
+
+def load_forum(**kwargs):
+    return get_object_or_404(
+        models.Forum.objects.prefetch_related('managers'),
+        **kwargs
+    )
+
+
+def get_forum(name):
+    """
+    Forum Registry
+
+    Forums with their managers are kept in process
+    until a forum is written, CACHE_REGISTRY_TIMEOUT seconds at most.
+    """
+    return forum_registry.get(
+        ('name', name),
+        lambda: load_forum(name=name)
+    )
+
+
+def get_forum_by_id(pk):
+    return forum_registry.get(
+        ('id', pk),
+        lambda: load_forum(pk=pk)
+    )
+
+
+def forget_forums():
+    forum_registry.invalidate()
+
+
+def forum_values(forum):
+    return [
+        forum.name,
+        forum.title,
+        forum.description,
+        forum.option,
+        [manager.id for manager in forum.managers.all()],
+    ]
+
+
+def forum_scope(forum_id):
+    if not forum_id:
+        return None
+    return 'forum:%s' % forum_id
+
+
+def touch_forum(forum_id):
+    if forum_id:
+        bump_generation(forum_scope(forum_id))
+
+
+def replies_scope(thread_id):
+    return 'replies:%s' % thread_id
+
+
+def touch_replies(thread_id):
+    bump_generation(replies_scope(thread_id))
+
+
+def update_forum_stat(forum_id, created_at=None, **amounts):
+    """
+    Forum Stat Update
+
+    amounts maps a ForumStat counter to its change.
+    created_at of new content moves the last activity.
+    """
+    if not forum_id:
+        return
+
+    values = {
+        field: F(field) + amount for field, amount in amounts.items()
+    }
+    if created_at:
+        values['last_activity_at'] = Greatest(
+            F('last_activity_at'), created_at
+        )
+
+    if not models.ForumStat.objects.filter(forum_id=forum_id).update(
+        **values
+    ):
+        sync_forum_stats(models.Forum.objects.filter(pk=forum_id))
+
+
+def latest_subquery(queryset, field):
+    return Subquery(
+        queryset.filter(
+            **{field: OuterRef('pk')}
+        ).order_by('-created_at').values('created_at')[:1]
+    )
+
+
+def sync_forum_stats(queryset=None, chunk_size=Const.CHUNK_SIZE):
+    if queryset is None:
+        queryset = models.Forum.objects.all()
+
+    models.ForumStat.objects.bulk_create(
+        [
+            models.ForumStat(forum_id=pk)
+            for pk in queryset.filter(stat__isnull=True).values_list(
+                'pk', flat=True
+            )
+        ],
+        ignore_conflicts=True
+    )
+
+    return sync_counts(
+        models.ForumStat.objects.filter(forum__in=queryset),
+        {
+            'thread_count': count_subquery(
+                models.Thread.objects.filter(is_deleted=False), 'forum'
+            ),
+            'reply_count': count_subquery(
+                models.Reply.objects.all(), 'thread__forum'
+            ),
+            'deleted_thread_count': count_subquery(
+                models.Thread.objects.filter(is_deleted=True), 'forum'
+            ),
+            'deleted_reply_count': count_subquery(
+                models.Reply.objects.filter(is_deleted=True), 'thread__forum'
+            ),
+            'last_activity_at': Coalesce(
+                Greatest(
+                    latest_subquery(models.Thread.objects.all(), 'forum'),
+                    latest_subquery(
+                        models.Reply.objects.all(), 'thread__forum'
+                    ),
+                ),
+                latest_subquery(models.Forum.objects.all(), 'pk'),
+            ),
+        },
+        chunk_size
+    )
+
+
+def thread_count_key(forum_id):
+    return 'forum_thread_count:%d' % forum_id
+
+
+def forget_thread_count(forum_id):
+    cache.delete(thread_count_key(forum_id))
+
 
 def delete_thread(instance):
     instance.is_pinned = False
     instance.is_deleted = True
     instance.modified_at = timezone.now()
-    instance.save(update_fields=['is_deleted', 'is_pinned', 'modified_at'])
+
+    if models.Thread.objects.filter(
+        pk=instance.pk,
+        is_deleted=False
+    ).update(
+        is_deleted=True,
+        is_pinned=False,
+        modified_at=instance.modified_at
+    ):
+        update_forum_stat(
+            instance.forum_id,
+            thread_count=-1,
+            deleted_thread_count=1
+        )
+    forget_thread_count(instance.forum_id)
+    touch_forum(instance.forum_id)
 
 
 def restore_thread(instance):
     instance.is_deleted = False
     instance.modified_at = timezone.now()
-    instance.save(update_fields=['is_deleted', 'modified_at'])
+
+    if models.Thread.objects.filter(
+        pk=instance.pk,
+        is_deleted=True
+    ).update(is_deleted=False, modified_at=instance.modified_at):
+        update_forum_stat(
+            instance.forum_id,
+            thread_count=1,
+            deleted_thread_count=-1
+        )
+    forget_thread_count(instance.forum_id)
+    touch_forum(instance.forum_id)
 
 
 def pin_thread(instance):
     instance.is_pinned = True
     instance.save(update_fields=['is_pinned'])
+    touch_forum(instance.forum_id)
 
 
 def unpin_thread(instance):
     instance.is_pinned = False
     instance.save(update_fields=['is_pinned'])
+    touch_forum(instance.forum_id)
 
 
-def up_thread(instance, user):
-    if user in instance.up_users.all():
-        instance.up_users.remove(user)
+def moderate_threads(action, queryset):
+    """
+    Bulk Thread Moderation
+
+    Matched threads change in one UPDATE,
+    forum stats follow once per forum.
+    Returns the number of changed threads.
+    """
+    now = timezone.now()
+
+    if action == Const.MODERATION_DELETE:
+        forums = update_grouped(
+            queryset.filter(is_deleted=False),
+            ['forum_id'],
+            is_deleted=True,
+            is_pinned=False,
+            modified_at=now
+        )
+        amount = -1
+    elif action == Const.MODERATION_RESTORE:
+        forums = update_grouped(
+            queryset.filter(is_deleted=True),
+            ['forum_id'],
+            is_deleted=False,
+            modified_at=now
+        )
+        amount = 1
     else:
-        instance.up_users.add(user)
+        pinned = action == Const.MODERATION_PIN
+        forums = update_grouped(
+            queryset.filter(is_deleted=False, is_pinned=not pinned),
+            ['forum_id'],
+            is_pinned=pinned
+        )
+        amount = 0
 
-    if user in instance.down_users.all():
-        instance.down_users.remove(user)
+    for (forum_id,), count in forums.items():
+        if amount:
+            update_forum_stat(
+                forum_id,
+                thread_count=amount * count,
+                deleted_thread_count=-amount * count
+            )
+            forget_thread_count(forum_id)
+        touch_forum(forum_id)
 
+    return sum(forums.values())
 
-def down_thread(instance, user):
-    if user in instance.down_users.all():
-        instance.down_users.remove(user)
+
+def hot_score(now=None):
+    """
+    Hot Score Expression
+
+    Votes and replies as points, divided by a power of age in hours
+    so that the score falls off as the thread gets older.
+    """
+    if not now:
+        now = timezone.now()
+
+    points = (
+        F('up_count') - F('down_count') +
+        Const.HOT_REPLY_WEIGHT * F('active_reply_count')
+    )
+    hours = (
+        Value(now.timestamp()) - Extract('created_at', 'epoch')
+    ) / 3600
+
+    return ExpressionWrapper(
+        points / Power(
+            Greatest(hours, Value(0.0)) + Const.HOT_AGE_OFFSET_HOURS,
+            Const.HOT_GRAVITY
+        ),
+        output_field=FloatField()
+    )
+
+
+def update_hot_score(thread_id):
+    models.Thread.objects.filter(pk=thread_id).update(hot_score=hot_score())
+
+
+def sync_hot_scores(chunk_size=Const.CHUNK_SIZE):
+    """
+    Hot Score Decay
+
+    Recompute the scores of recent threads in one statement per chunk
+    and zero those that left the window.
+    Returns the number of recomputed threads.
+    """
+    now = timezone.now()
+    since = now - timezone.timedelta(days=Const.HOT_WINDOW_DAYS)
+    recent = models.Thread.objects.filter(
+        created_at__gte=since,
+        is_deleted=False
+    )
+    updated = 0
+
+    for ids in chunked_ids(recent, chunk_size):
+        updated += models.Thread.objects.filter(pk__in=ids).update(
+            hot_score=hot_score(now)
+        )
+
+    models.Thread.objects.filter(
+        created_at__lt=since,
+        hot_score__gt=Const.BASE_COUNT
+    ).update(hot_score=Const.BASE_COUNT)
+
+    return updated
+
+
+def hot_bucket():
+    """
+    Hot Score Bucket
+
+    Cached hot lists are keyed by it instead of a forum bump,
+    so they live HOT_BUCKET_SECONDS at most while scores decay.
+    """
+    return int(timezone.now().timestamp() // Const.HOT_BUCKET_SECONDS)
+
+
+def update_vote_count(instance, up=0, down=0):
+    if not up and not down:
+        return
+
+    type(instance).objects.filter(pk=instance.pk).update(
+        up_count=F('up_count') + up,
+        down_count=F('down_count') + down
+    )
+    instance.refresh_from_db(fields=['up_count', 'down_count'])
+
+    if isinstance(instance, models.Thread):
+        update_hot_score(instance.pk)
+        touch_forum(instance.forum_id)
     else:
-        instance.down_users.add(user)
+        touch_replies(instance.thread_id)
+        touch_forum(instance.thread.forum_id)
+
+
+def vote_target(instance):
+    if isinstance(instance, models.Reply):
+        return 'reply'
+    return 'thread'
+
+
+def vote(instance, user, value):
+    """
+    Toggle a Vote
 
-    if user in instance.up_users.all():
-        instance.up_users.remove(user)
+    The same vote again takes it back, the other one flips it.
+    Each case is a single conditional statement on the vote row,
+    so concurrent clicks move the counters only once.
+    """
+    votes = models.Vote.objects.filter(
+        user=user,
+        **{vote_target(instance): instance}
+    )
+    counts = {
+        Const.VOTE_UP: 0,
+        Const.VOTE_DOWN: 0,
+    }
+
+    with transaction.atomic():
+        if votes.filter(value=value).delete()[0]:
+            counts[value] -= 1
+            instance.my_vote = Const.VOTE_NONE
+        elif votes.filter(value=-value).update(value=value):
+            counts[value] += 1
+            counts[-value] -= 1
+            instance.my_vote = value
+        else:
+            try:
+                with transaction.atomic():
+                    models.Vote.objects.create(
+                        user=user,
+                        value=value,
+                        **{vote_target(instance): instance}
+                    )
+                counts[value] += 1
+            except IntegrityError:
+                pass
+            instance.my_vote = value
+
+        update_vote_count(
+            instance,
+            counts[Const.VOTE_UP],
+            counts[Const.VOTE_DOWN]
+        )
+
+
+def annotate_votes(instances, user):
+    """
+    My Votes
+
+    Set my_vote on a page of threads or replies in one query.
+    """
+    if not instances or not user.is_authenticated:
+        return instances
+
+    target = vote_target(instances[0])
+    votes = dict(
+        models.Vote.objects.filter(
+            user=user,
+            **{'%s__in' % target: instances}
+        ).values_list(target, 'value')
+    )
+
+    for instance in instances:
+        instance.my_vote = votes.get(instance.pk, Const.VOTE_NONE)
+
+    return instances
+
+
+def up_thread(instance, user):
+    vote(instance, user, Const.VOTE_UP)
+
+
+def down_thread(instance, user):
+    vote(instance, user, Const.VOTE_DOWN)
 
 
 def up_reply(instance, user):
@@ -54,7 +470,155 @@ def down_reply(instance, user):
     down_thread(instance, user)
 
 
+def update_reply_count(thread_id, amount):
+    models.Thread.objects.filter(pk=thread_id).update(
+        active_reply_count=F('active_reply_count') + amount
+    )
+    update_hot_score(thread_id)
+    touch_replies(thread_id)
+
+
+def update_reply(instance):
+    instance.modified_at = timezone.now()
+    touch_replies(instance.thread_id)
+    touch_forum(instance.thread.forum_id)
+
+
 def delete_reply(instance):
     instance.is_deleted = True
     instance.modified_at = timezone.now()
-    instance.save(update_fields=['is_deleted', 'modified_at'])
+
+    if models.Reply.objects.filter(
+        pk=instance.pk,
+        is_deleted=False
+    ).update(is_deleted=True, modified_at=instance.modified_at):
+        update_reply_count(instance.thread_id, -1)
+        update_forum_stat(instance.thread.forum_id, deleted_reply_count=1)
+    touch_forum(instance.thread.forum_id)
+
+
+def moderate_replies(action, queryset):
+    """
+    Bulk Reply Moderation
+
+    Matched replies change in one UPDATE,
+    thread counters and forum stats follow per thread and forum.
+    Returns the number of changed replies.
+    """
+    deleted = action == Const.MODERATION_DELETE
+    targets = update_grouped(
+        queryset.filter(is_deleted=not deleted),
+        ['thread_id', 'thread__forum_id'],
+        is_deleted=deleted,
+        modified_at=timezone.now()
+    )
+    if not targets:
+        return 0
+
+    threads = models.Thread.objects.filter(
+        pk__in=[thread_id for thread_id, _ in targets]
+    )
+    sync_thread_counters(threads)
+    threads.update(hot_score=hot_score())
+
+    for thread_id, _ in targets:
+        touch_replies(thread_id)
+
+    forums = Counter()
+    for (_, forum_id), count in targets.items():
+        forums[forum_id] += count
+
+    for forum_id, count in forums.items():
+        update_forum_stat(
+            forum_id,
+            deleted_reply_count=count if deleted else -count
+        )
+        touch_forum(forum_id)
+
+    return sum(targets.values())
+
+
+def sync_thread_counters(queryset=None, chunk_size=Const.CHUNK_SIZE):
+    if queryset is None:
+        queryset = models.Thread.objects.all()
+
+    return sync_counts(
+        queryset,
+        {
+            'up_count': count_subquery(
+                models.Vote.objects.filter(value=Const.VOTE_UP), 'thread'
+            ),
+            'down_count': count_subquery(
+                models.Vote.objects.filter(value=Const.VOTE_DOWN), 'thread'
+            ),
+            'active_reply_count': count_subquery(
+                models.Reply.objects.active(), 'thread'
+            ),
+        },
+        chunk_size
+    )
+
+
+def sync_reply_counters(queryset=None, chunk_size=Const.CHUNK_SIZE):
+    if queryset is None:
+        queryset = models.Reply.objects.all()
+
+    return sync_counts(
+        queryset,
+        {
+            'up_count': count_subquery(
+                models.Vote.objects.filter(value=Const.VOTE_UP), 'reply'
+            ),
+            'down_count': count_subquery(
+                models.Vote.objects.filter(value=Const.VOTE_DOWN), 'reply'
+            ),
+        },
+        chunk_size
+    )
+
+
+def destroy_thread_files(thread_ids):
+    """
+    Attachments no other thread or blog refers to
+    go along with the threads of thread_ids.
+    """
+    through = models.Thread.files.through
+
+    return things_tools.destroy_attachments(
+        things_models.Attachment.objects.filter(
+            Exists(through.objects.filter(
+                attachment_id=OuterRef('pk'),
+                thread_id__in=thread_ids
+            )),
+            ~Exists(through.objects.filter(
+                attachment_id=OuterRef('pk')
+            ).exclude(thread_id__in=thread_ids)),
+            blog_image__isnull=True
+        )
+    )
+
+
+def retention_policies():
+    """
+    Trashed threads and replies past RETENTION_TRASH_DAYS,
+    replies with children stay until their children are gone.
+    Attachments of purged threads are destroyed unless shared.
+    """
+    return [
+        RetentionPolicy(
+            models.Thread,
+            settings.RETENTION_TRASH_DAYS,
+            [Q(is_deleted=True)],
+            ['modified_at', 'created_at'],
+            destroy_thread_files
+        ),
+        RetentionPolicy(
+            models.Reply,
+            settings.RETENTION_TRASH_DAYS,
+            [
+                Q(is_deleted=True),
+                ~Exists(models.Reply.objects.filter(reply_id=OuterRef('pk'))),
+            ],
+            ['modified_at', 'created_at']
+        ),
+    ]
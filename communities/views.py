@@ -1,6 +1,7 @@
-from django.db.models import Count
+from django.conf import settings
 from django.utils import timezone
 
+from core.cache import cache
 from core.error import Error
 from core.viewsets import (
     ModelViewSet,
@@ -12,6 +13,7 @@ from core.permissions import (
     IsApproved,
 )
 from core.response import Response
+from core.serializers import ModerationSerializer
 from core.shortcuts import get_object_or_404
 from utils.constants import Const
 from utils.debug import Debug  # noqa
@@ -31,6 +33,23 @@ class ForumViewSet(ModelViewSet):
     def get_queryset(self):
         return self.model.objects.all()
 
+    def get_cache_scope(self):
+        if self.kwargs.get(Const.QUERY_PARAM_PK):
+            return tools.forum_scope(self.kwargs[Const.QUERY_PARAM_PK])
+        return None
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        tools.forget_forums()
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        tools.forget_forums()
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        tools.forget_forums()
+
 
 class ForumUpdateViewSet(ForumViewSet):
     serializer_class = serializers.ForumUpdateSerializer
@@ -40,6 +59,7 @@ class ForumReadOnlyViewSet(ReadOnlyModelViewSet):
     serializer_class = serializers.ForumListSerializer
     model = models.Forum
     permission_classes = [IsAdminUser]
+    select_related_fields = ['stat']
 
     def get_filters(self):
         return self.model.objects.query_active(self.request.query_params)
@@ -53,21 +73,21 @@ class ThreadViewSet(ModelViewSet):
     model = models.Thread
 
     def get_permissions(self):
-        self.forum = get_object_or_404(
-            models.Forum,
-            name=self.kwargs[Const.QUERY_PARAM_FORUM]
-        )
+        self.forum = tools.get_forum(self.kwargs[Const.QUERY_PARAM_FORUM])
         permission_classes = ForumPermission.write(self.forum)
         return [permission() for permission in permission_classes]
 
+    def get_cache_scope(self):
+        return tools.forum_scope(
+            tools.get_forum(self.kwargs[Const.QUERY_PARAM_FORUM]).id
+        )
+
 
 class ThreadUpdateViewSet(ThreadViewSet):
     serializer_class = serializers.ThreadUpdateSerializer
 
     def get_queryset(self):
-        return self.model.objects.forum(
-            self.kwargs[Const.QUERY_PARAM_FORUM]
-        )
+        return self.model.objects.forum(self.forum)
 
     def sync_update(self, instance, partial):
         instance.modified_at = timezone.now()
@@ -86,9 +106,7 @@ class ThreadFileViewSet(ThreadViewSet):
     serializer_class = serializers.ThreadFileSerializer
 
     def get_queryset(self):
-        return self.model.objects.forum(
-            self.kwargs[Const.QUERY_PARAM_FORUM]
-        )
+        return self.model.objects.forum(self.forum)
 
     def attach_files(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -121,7 +139,7 @@ class ThreadToggleViewSet(ThreadViewSet):
 
     def get_queryset(self):
         return self.model.objects.forum(
-            self.kwargs[Const.QUERY_PARAM_FORUM]
+            tools.get_forum(self.kwargs[Const.QUERY_PARAM_FORUM])
         )
 
     def pin(self, request, *args, **kwargs):
@@ -140,7 +158,7 @@ class ThreadToggleViewSet(ThreadViewSet):
 class ThreadRestoreViewSet(ThreadToggleViewSet):
     def get_queryset(self):
         return self.model.objects.deleted(
-            self.kwargs[Const.QUERY_PARAM_FORUM]
+            tools.get_forum(self.kwargs[Const.QUERY_PARAM_FORUM])
         )
 
     def restore(self, request, *args, **kwargs):
@@ -153,10 +171,7 @@ class ThreadVoteViewSet(ThreadToggleViewSet):
     serializer_class = serializers.ThreadVoteSerializer
 
     def get_permissions(self):
-        self.forum = get_object_or_404(
-            models.Forum,
-            name=self.kwargs[Const.QUERY_PARAM_FORUM]
-        )
+        self.forum = tools.get_forum(self.kwargs[Const.QUERY_PARAM_FORUM])
         permission_classes = ForumPermission.vote(self.forum)
         return [permission() for permission in permission_classes]
 
@@ -182,35 +197,86 @@ class ThreadVoteViewSet(ThreadToggleViewSet):
 class ThreadReadOnlyViewSet(ReadOnlyModelViewSet):
     serializer_class = serializers.ThreadReadSerializer
     model = models.Thread
+    attached_fields = ['forum']
 
     def get_content_permission(self, forum):
         return ForumPermission.read(forum)
 
     def get_permissions(self):
-        self.forum = get_object_or_404(
-            models.Forum,
-            name=self.kwargs[Const.QUERY_PARAM_FORUM]
-        )
+        self.forum = tools.get_forum(self.kwargs[Const.QUERY_PARAM_FORUM])
         permission_classes = self.get_content_permission(self.forum)
         return [permission() for permission in permission_classes]
 
     def get_queryset(self):
-        return self.model.objects.forum(
-            self.kwargs[Const.QUERY_PARAM_FORUM],
-            self.request.user
+        return self.model.objects.forum(self.forum, self.request.user)
+
+    def get_cache_scope(self):
+        return tools.forum_scope(self.forum.id)
+
+    def get_object(self):
+        instance = super().get_object()
+        instance.forum = self.forum
+        tools.annotate_votes([instance], self.request.user)
+        return instance
+
+    def get_validators(self):
+        values = self.get_instance_validators(
+            self.get_queryset(),
+            'modified_at',
+            'up_count',
+            'down_count',
+            'active_reply_count',
+            'is_pinned',
+            'is_deleted',
+            'user__username',
+            'user__call_name',
         )
+        if values is None:
+            return None
+
+        return [values, tools.forum_values(self.forum)]
 
 
 class ThreadListViewSet(ThreadReadOnlyViewSet):
     serializer_class = serializers.ThreadListSerializer
+    count_strategy = Const.COUNT_CACHED
 
     def get_content_permission(self, forum):
         return ForumPermission.list(forum)
 
+    def get_cached_count(self, queryset):
+        if self.q:
+            return None
+
+        return cache.get_or_set(
+            tools.thread_count_key(self.forum.id),
+            queryset.count,
+            settings.REST_PAGINATION_COUNT_TIMEOUT
+        )
+
+    def is_hot(self):
+        return (
+            self.request.query_params.get(Const.QUERY_PARAM_SORT) ==
+            Const.QUERY_PARAM_SORT_HOT
+        )
+
+    def get_cache_variant(self):
+        if self.is_hot():
+            return tools.hot_bucket()
+        return None
+
     def get_queryset(self):
-        return self.model.objects.search(
-            self.kwargs[Const.QUERY_PARAM_FORUM],
-            self.q
+        queryset = self.model.objects.search(self.forum, self.q)
+
+        if self.is_hot():
+            queryset = queryset.order_by('-hot_score', '-id')
+
+        return queryset
+
+    def paginate_queryset(self, queryset):
+        return tools.annotate_votes(
+            super().paginate_queryset(queryset),
+            self.request.user
         )
 
     def list(self, request, *args, **kwargs):
@@ -242,19 +308,16 @@ class ThreadSeekViewSet(ThreadListViewSet):
 class ThreadTrashViewSet(ThreadListViewSet):
     serializer_class = serializers.ThreadTrashSerializer
     model = models.Thread
+    count_strategy = Const.COUNT_CAPPED
 
     def get_permissions(self):
-        self.forum = get_object_or_404(
-            models.Forum,
-            name=self.kwargs[Const.QUERY_PARAM_FORUM]
-        )
+        self.forum = tools.get_forum(self.kwargs[Const.QUERY_PARAM_FORUM])
         permission_classes = [IsAdminUser]
         return [permission() for permission in permission_classes]
 
     def get_queryset(self):
         return self.model.objects.trash(
-            self.kwargs[Const.QUERY_PARAM_FORUM],
-            self.q
+            self.forum, self.q
         ).order_by(self.get_order())
 
 
@@ -267,9 +330,14 @@ class ReplyViewSet(ModelViewSet):
             models.Thread,
             pk=self.kwargs[Const.QUERY_PARAM_PK]
         )
-        permission_classes = ForumPermission.reply(self.thread.forum)
+        permission_classes = ForumPermission.reply(
+            tools.get_forum_by_id(self.thread.forum_id)
+        )
         return [permission() for permission in permission_classes]
 
+    def get_cache_scope(self):
+        return tools.forum_scope(self.thread.forum_id)
+
 
 class ReplyUpdateViewSet(ReplyViewSet):
     serializer_class = serializers.ReplyUpdateSerializer
@@ -281,8 +349,15 @@ class ReplyUpdateViewSet(ReplyViewSet):
     def get_queryset(self):
         return self.model.objects.my(self.request.user)
 
+    def get_cache_scope(self):
+        return tools.forum_scope(
+            models.Reply.objects.filter(
+                pk=self.kwargs[Const.QUERY_PARAM_PK]
+            ).values_list('thread__forum_id', flat=True).first()
+        )
+
     def sync_update(self, instance, partial):
-        instance.modified_at = timezone.now()
+        tools.update_reply(instance)
 
     def has_ownership(self, instance):
         if self.request.user == instance.user:
@@ -303,12 +378,23 @@ class ReplyListViewSet(ReplyViewSet):
             models.Thread,
             pk=self.kwargs[Const.QUERY_PARAM_PK]
         )
-        permission_classes = ForumPermission.read(self.thread.forum)
+        permission_classes = ForumPermission.read(
+            tools.get_forum_by_id(self.thread.forum_id)
+        )
         return [permission() for permission in permission_classes]
 
     def get_queryset(self):
         return self.model.objects.thread(self.thread, self.request.user)
 
+    def get_validators(self):
+        return self.get_list_validators(tools.replies_scope(self.thread.id))
+
+    def paginate_queryset(self, queryset):
+        return tools.annotate_votes(
+            super().paginate_queryset(queryset),
+            self.request.user
+        )
+
 
 class ReplyVoteViewSet(ReplyViewSet):
     serializer_class = serializers.ReplyVoteSerializer
@@ -318,9 +404,14 @@ class ReplyVoteViewSet(ReplyViewSet):
             models.Reply,
             pk=self.kwargs[Const.QUERY_PARAM_PK]
         )
-        permission_classes = ForumPermission.vote(self.reply.thread.forum)
+        permission_classes = ForumPermission.vote(
+            tools.get_forum_by_id(self.reply.thread.forum_id)
+        )
         return [permission() for permission in permission_classes]
 
+    def get_cache_scope(self):
+        return tools.forum_scope(self.reply.thread.forum_id)
+
     def get_queryset(self):
         return self.model.objects.active()
 
@@ -345,14 +436,15 @@ class ReplyVoteViewSet(ReplyViewSet):
 
 class _CommunityAdminViewSet(ModelViewSet):
     permission_classes = [IsAdminUser]
+    count_strategy = Const.COUNT_ESTIMATE
 
     def get_order(self):
         sort = self.request.query_params.get(Const.QUERY_PARAM_SORT)
 
         if sort == Const.QUERY_PARAM_SORT_UP:
-            ordering = '-up'
+            ordering = '-up_count'
         elif sort == Const.QUERY_PARAM_SORT_DOWN:
-            ordering = '-down'
+            ordering = '-down_count'
         elif sort == Const.QUERY_PARAM_SORT_EARLIEST:
             ordering = 'id'
         else:
@@ -366,18 +458,32 @@ class _CommunityAdminViewSet(ModelViewSet):
     def get_queryset(self):
         return self.model.objects.admin_search(
             self.q, self.get_filters()
-        ).annotate(
-            up=Count('up_users')
-        ).annotate(
-            down=Count('down_users')
         ).order_by(self.get_order())
 
 
 class ThreadAdminViewSet(_CommunityAdminViewSet):
     serializer_class = serializers.ThreadAdminSerializer
     model = models.Thread
+    select_related_fields = ['forum']
 
 
 class ReplyAdminViewSet(_CommunityAdminViewSet):
     serializer_class = serializers.ReplyAdminSerializer
     model = models.Reply
+    select_related_fields = ['thread__forum']
+
+
+class ThreadModerationViewSet(_CommunityAdminViewSet):
+    serializer_class = serializers.ThreadModerationSerializer
+    model = models.Thread
+
+    def perform_moderation(self, action, queryset):
+        return tools.moderate_threads(action, queryset)
+
+
+class ReplyModerationViewSet(_CommunityAdminViewSet):
+    serializer_class = ModerationSerializer
+    model = models.Reply
+
+    def perform_moderation(self, action, queryset):
+        return tools.moderate_replies(action, queryset)
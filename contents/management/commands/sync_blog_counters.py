@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from contents import tools
+from utils.constants import Const
+
+
+class Command(BaseCommand):
+    help = 'Recompute drifted blog comment counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=Const.CHUNK_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        blogs = tools.sync_blog_counters(chunk_size=options['chunk_size'])
+
+        self.stdout.write('%d blogs fixed.' % blogs)
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:43
+
+from django.db import migrations, models
+
+from core.queries import count_subquery
+
+
+def fill_counters(apps, schema_editor):
+    Blog = apps.get_model('contents', 'Blog')
+    Comment = apps.get_model('contents', 'Comment')
+
+    Blog.objects.update(
+        active_comment_count=count_subquery(
+            Comment.objects.filter(is_deleted=False), 'blog'
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='active_comment_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:53
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+from core.search import to_vector
+from utils.constants import Const
+
+
+def fill(queryset, document):
+    instances = []
+
+    for instance in queryset.iterator(chunk_size=Const.CHUNK_SIZE):
+        instance.search_vector = to_vector(document(instance))
+        instances.append(instance)
+
+        if len(instances) >= Const.CHUNK_SIZE:
+            queryset.model.objects.bulk_update(instances, ['search_vector'])
+            instances = []
+
+    queryset.model.objects.bulk_update(instances, ['search_vector'])
+
+
+def call_name(instance):
+    return instance.user.call_name if instance.user else None
+
+
+def fill_search_vector(apps, schema_editor):
+    Blog = apps.get_model('contents', 'Blog')
+    Comment = apps.get_model('contents', 'Comment')
+
+    fill(Blog.objects.all(), lambda blog: [
+        (blog.title, 'A'),
+        (blog.tags, 'A'),
+        (blog.content, 'B'),
+    ])
+    fill(Comment.objects.select_related('user'), lambda comment: [
+        (comment.content, 'B'),
+        (comment.name, 'C'),
+        (call_name(comment), 'C'),
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0002_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, null=True),
+        ),
+        migrations.RunPython(fill_search_vector, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='blog',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='contents_bl_search__33cc9b_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='contents_co_search__2597aa_gin'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:55
+
+from django.db import migrations, models
+from django.db.models import Case, F, When
+
+from core.queries import chunked_ids
+
+
+def fill_root_id(apps, schema_editor):
+    Comment = apps.get_model('contents', 'Comment')
+
+    for ids in chunked_ids(Comment.objects.all()):
+        Comment.objects.filter(pk__in=ids).update(
+            root_id=Case(
+                When(comment_id=0, then=F('id')),
+                default=F('comment_id'),
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0003_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='root_id',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_root_id, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['blog', '-root_id', 'id'], name='contents_co_blog_id_bed9d4_idx'),
+        ),
+    ]
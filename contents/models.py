@@ -1,29 +1,48 @@
 from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
-from django.db.models import (
-    Case,
-    F,
-    IntegerField,
-    Q,
-    When,
-)
+from django.db.models import Q
 from django.utils import timezone
 
+from core.cache import LocalCache
+from core.search import (
+    SearchVectorMixin,
+    text_search,
+)
 from utils.constants import Const
 from utils.datautils import true_or_false
 from utils.dateutils import date_or_time
 from utils.debug import Debug  # noqa
 
 
+blog_option_cache = LocalCache(
+    'blog_option', settings.CACHE_REGISTRY_TIMEOUT
+)
+
+
 class BlogOptionManager(models.Manager):
-    def get(self):
+    def load(self):
         instance, created = self.get_or_create(name=settings.SITE_NAME)
         if created:
             instance.option = Const.BLOG_OPTION_DEFAULT.copy()
             instance.save()
         return instance
 
+    def get(self):
+        """
+        Site BlogOption
+
+        Kept in process until BlogOptionViewSet updates it,
+        CACHE_REGISTRY_TIMEOUT seconds at most.
+        Read only, use load() to change it.
+        """
+        return blog_option_cache.get(settings.SITE_NAME, self.load)
+
+    def forget(self):
+        blog_option_cache.invalidate()
+
 
 class BlogOption(models.Model):
     name = models.CharField(
@@ -73,20 +92,8 @@ class BlogManager(models.Manager):
 
         return query
 
-    def search_query(self, q):
-        if q:
-            return (
-                Q(title__icontains=q) |
-                Q(content__icontains=q) |
-                Q(tags__icontains=q)
-            )
-        else:
-            return Q()
-
     def search(self, q, filters):
-        return self.published().filter(filters).filter(
-            self.search_query(q)
-        ).distinct()
+        return text_search(self.published().filter(filters), q)
 
     def admin_query(self, q):
         query = self.query_category(q)
@@ -98,10 +105,10 @@ class BlogManager(models.Manager):
         return query
 
     def admin_search(self, q, filters):
-        return self.filter(filters).filter(self.search_query(q)).distinct()
+        return text_search(self.filter(filters), q)
 
 
-class Blog(models.Model):
+class Blog(SearchVectorMixin, models.Model):
     user = models.ForeignKey(
         'accounts.User',
         related_name='blog_user',
@@ -142,14 +149,27 @@ class Blog(models.Model):
         blank=True,
         null=True,
     )
+    active_comment_count = models.IntegerField(default=Const.BASE_COUNT)
     is_published = models.BooleanField(default=False)
     created_at = models.DateTimeField(default=timezone.now)
     modified_at = models.DateTimeField(blank=True, null=True)
+    search_vector = SearchVectorField(blank=True, null=True)
 
     objects = BlogManager()
+    search_fields = ['title', 'content', 'tags']
 
     class Meta:
         ordering = ['-id']
+        indexes = [
+            GinIndex(fields=['search_vector']),
+        ]
+
+    def search_document(self):
+        return [
+            (self.title, 'A'),
+            (self.tags, 'A'),
+            (self.content, 'B'),
+        ]
 
     def like(self):
         if self.like_users:
@@ -158,7 +178,7 @@ class Blog(models.Model):
             return 0
 
     def comment_count(self):
-        return Comment.objects.active_count(self)
+        return self.active_comment_count
 
 
 class CommentManager(models.Manager):
@@ -186,14 +206,7 @@ class CommentManager(models.Manager):
         if not user.is_staff:
             blog_comments &= Q(is_deleted=False)
 
-        comments = self.filter(blog_comments).annotate(
-            custom_order=Case(
-                When(comment_id=0, then=F('id')),
-                default=F('comment_id'),
-                output_field=IntegerField(),
-            )
-        ).order_by('-custom_order', 'id')
-        return comments
+        return self.filter(blog_comments).order_by('-root_id', 'id')
 
     def admin_query(self, q):
         query = Q()
@@ -202,21 +215,11 @@ class CommentManager(models.Manager):
             query = Q(is_deleted=deleted)
         return query
 
-    def search_query(self, q):
-        if q:
-            return (
-                Q(content__icontains=q) |
-                (Q(user__isnull=True) & Q(name__icontains=q)) |
-                Q(user__call_name__icontains=q)
-            )
-        else:
-            return Q()
-
     def admin_search(self, q, filters):
-        return self.filter(filters).filter(self.search_query(q)).distinct()
+        return text_search(self.filter(filters), q)
 
 
-class Comment(models.Model):
+class Comment(SearchVectorMixin, models.Model):
     blog = models.ForeignKey(
         'Blog',
         related_name='comment_blog',
@@ -225,6 +228,7 @@ class Comment(models.Model):
         null=True,
     )
     comment_id = models.BigIntegerField(default=0)
+    root_id = models.BigIntegerField(default=0)
     user = models.ForeignKey(
         'accounts.User',
         related_name='comment_user',
@@ -241,11 +245,34 @@ class Comment(models.Model):
     is_deleted = models.BooleanField(default=False)
     created_at = models.DateTimeField(default=timezone.now)
     modified_at = models.DateTimeField(blank=True, null=True)
+    search_vector = SearchVectorField(blank=True, null=True)
 
     objects = CommentManager()
+    search_fields = ['content', 'name', 'user']
 
     class Meta:
         ordering = ['-id']
+        indexes = [
+            GinIndex(fields=['search_vector']),
+            models.Index(fields=['blog', '-root_id', 'id']),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self.root_id and self.comment_id:
+            self.root_id = self.comment_id
+
+        super().save(*args, **kwargs)
+
+        if not self.root_id:
+            self.root_id = self.pk
+            Comment.objects.filter(pk=self.pk).update(root_id=self.root_id)
+
+    def search_document(self):
+        return [
+            (self.content, 'B'),
+            (self.name, 'C'),
+            (self.user.call_name if self.user else None, 'C'),
+        ]
 
     def date_or_time(self):
         return date_or_time(self.created_at)
@@ -13,7 +13,7 @@ from utils.debug import Debug  # noqa
 from utils.netutils import get_ip_address
 from things import serializers as things_serializers
 
-from . import models
+from . import models, tools
 
 
 class BlogOptionSerializer(ModelSerializer):
@@ -227,22 +227,12 @@ class CommentSerializer(ModelSerializer):
                 Error.required_field('name')
 
         if attrs.get('comment_id'):
-            comment_id = attrs.get('comment_id')
-            blog = self.context.get('view').blog
-            nesting = 0
-
-            while nesting < Const.MAX_REPLY_NESTING:
-                comment = get_object_or_404(
-                    models.Comment,
-                    pk=comment_id,
-                    blog=blog
-                )
-                if comment.comment_id == 0:
-                    attrs['comment_id'] = comment.id
-                    break
-                else:
-                    comment_id = comment.comment_id
-                    nesting += 1
+            comment = get_object_or_404(
+                models.Comment.objects.only('root_id'),
+                pk=attrs.get('comment_id'),
+                blog=self.context.get('view').blog
+            )
+            attrs['comment_id'] = comment.root_id
         return attrs
 
     def create(self, validated_data):
@@ -253,6 +243,7 @@ class CommentSerializer(ModelSerializer):
             name=validated_data.get('name'),
             content=validated_data.get('content'),
         )
+        tools.update_comment_count(instance.blog_id, 1)
         return instance
 
     def get_editable(self, obj):
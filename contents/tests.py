@@ -1,6 +1,6 @@
 from core.testcase import TestCase as CoreTestCase
 
-from . import models
+from . import models, tools
 
 
 class TestCase(CoreTestCase):
@@ -52,4 +52,7 @@ class TestCase(CoreTestCase):
             is_deleted=is_deleted
         )
 
+        if not is_deleted:
+            tools.update_comment_count(blog.pk, 1)
+
         return self.comment
@@ -1,5 +1,18 @@
+from django.conf import settings
+from django.db.models import Exists, F, OuterRef, Q
 from django.utils import timezone
 
+from core.cache import bump_generation
+from core.queries import (
+    count_subquery,
+    sync_counts,
+    update_grouped,
+)
+from core.retention import RetentionPolicy
+from utils.constants import Const
+
+from . import models
+
 
 def like_blog(instance, ip_address):
     if not instance.like_users:
@@ -17,17 +30,101 @@ def update_blog(instance):
     instance.modified_at = timezone.now()
 
 
+def comments_scope(blog_id):
+    return 'comments:%s' % blog_id
+
+
+def touch_comments(blog_id):
+    bump_generation(comments_scope(blog_id))
+
+
 def update_comment(instance):
     instance.modified_at = timezone.now()
+    touch_comments(instance.blog_id)
+
+
+def update_comment_count(blog_id, amount):
+    models.Blog.objects.filter(pk=blog_id).update(
+        active_comment_count=F('active_comment_count') + amount
+    )
+    touch_comments(blog_id)
 
 
 def delete_comment(instance):
     instance.is_deleted = True
     instance.modified_at = timezone.now()
-    instance.save(update_fields=['is_deleted', 'modified_at'])
 
+    if models.Comment.objects.filter(
+        pk=instance.pk,
+        is_deleted=False
+    ).update(is_deleted=True, modified_at=instance.modified_at):
+        update_comment_count(instance.blog_id, -1)
 
-def restore_thread(instance):
+
+def restore_comment(instance):
     instance.is_deleted = False
     instance.modified_at = timezone.now()
-    instance.save(update_fields=['is_deleted', 'modified_at'])
+
+    if models.Comment.objects.filter(
+        pk=instance.pk,
+        is_deleted=True
+    ).update(is_deleted=False, modified_at=instance.modified_at):
+        update_comment_count(instance.blog_id, 1)
+
+
+def moderate_comments(action, queryset):
+    """
+    Bulk Comment Moderation
+
+    Matched comments change in one UPDATE,
+    comment counts follow per blog.
+    Returns the number of changed comments.
+    """
+    deleted = action == Const.MODERATION_DELETE
+    blogs = update_grouped(
+        queryset.filter(is_deleted=not deleted),
+        ['blog_id'],
+        is_deleted=deleted,
+        modified_at=timezone.now()
+    )
+    if blogs:
+        sync_blog_counters(
+            models.Blog.objects.filter(
+                pk__in=[blog_id for blog_id, in blogs]
+            )
+        )
+        for blog_id, in blogs:
+            touch_comments(blog_id)
+
+    return sum(blogs.values())
+
+
+def sync_blog_counters(queryset=None, chunk_size=Const.CHUNK_SIZE):
+    if queryset is None:
+        queryset = models.Blog.objects.all()
+
+    return sync_counts(
+        queryset,
+        {
+            'active_comment_count': count_subquery(
+                models.Comment.objects.active(), 'blog'
+            ),
+        },
+        chunk_size
+    )
+
+
+def retention_policies():
+    return [
+        RetentionPolicy(
+            models.Comment,
+            settings.RETENTION_TRASH_DAYS,
+            [
+                Q(is_deleted=True),
+                ~Exists(
+                    models.Comment.objects.filter(comment_id=OuterRef('pk'))
+                ),
+            ],
+            ['modified_at', 'created_at']
+        ),
+    ]
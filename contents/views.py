@@ -11,6 +11,7 @@ from core.permissions import (
     IsApproved,
 )
 from core.response import Response
+from core.serializers import ModerationSerializer
 from core.shortcuts import get_object_or_404
 from utils.constants import Const
 from utils.debug import Debug  # noqa
@@ -26,15 +27,21 @@ from . import (
 class BlogOptionViewSet(ModelViewSet):
     serializer_class = serializers.BlogOptionSerializer
     model = models.BlogOption
+    cache_scope = Const.CACHE_SCOPE_BLOG
     permission_classes = [IsAdminOrReadOnly]
 
     def get_object(self):
-        return self.model.objects.get()
+        return self.model.objects.load()
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        self.model.objects.forget()
 
 
 class BlogViewSet(ModelViewSet):
     serializer_class = serializers.BlogListSerializer
     model = models.Blog
+    cache_scope = Const.CACHE_SCOPE_BLOG
     content_permission = 'list'
 
     def get_permissions(self):
@@ -58,6 +65,28 @@ class BlogReadViewSet(BlogViewSet):
     model = models.Blog
     content_permission = 'read'
 
+    def get_validators(self):
+        values = self.get_instance_validators(
+            self.get_queryset().annotate(like=Func(
+                F('like_users'),
+                function='CARDINALITY',
+                output_field=IntegerField()
+            )),
+            'modified_at',
+            'like',
+            'active_comment_count',
+            'is_published',
+            'user__username',
+            'user__call_name',
+        )
+        if values is None:
+            return None
+
+        return [values, get_ip_address(self.request)]
+
+    def get_cache_variant(self):
+        return get_ip_address(self.request)
+
 
 class BlogWriteViewSet(BlogViewSet):
     serializer_class = serializers.BlogSerializer
@@ -95,6 +124,7 @@ class BlogLikeViewSet(BlogViewSet):
 class CommentViewSet(ModelViewSet):
     serializer_class = serializers.CommentSerializer
     model = models.Comment
+    cache_scope = Const.CACHE_SCOPE_BLOG
     content_permission = 'reply'
 
     def get_permissions(self):
@@ -112,6 +142,7 @@ class CommentViewSet(ModelViewSet):
 class CommentUpdateViewSet(ModelViewSet):
     serializer_class = serializers.CommentUpdateSerializer
     model = models.Comment
+    cache_scope = Const.CACHE_SCOPE_BLOG
     permission_classes = [IsApproved]
 
     def get_queryset(self):
@@ -132,10 +163,14 @@ class CommentListViewSet(CommentViewSet):
     def get_queryset(self):
         return self.model.objects.blog(self.blog, self.request.user)
 
+    def get_validators(self):
+        return self.get_list_validators(tools.comments_scope(self.blog.id))
+
 
 class _BlogAdminViewSet(ModelViewSet):
     serializer_class = serializers.BlogSerializer
     model = models.Blog
+    cache_scope = Const.CACHE_SCOPE_BLOG
     permission_classes = [IsAdminUser]
 
     def get_order(self):
@@ -182,6 +217,7 @@ class BlogAdminViewSet(_BlogAdminViewSet):
 class CommentAdminViewSet(ModelViewSet):
     serializer_class = serializers.CommentAdminSerializer
     model = models.Comment
+    cache_scope = Const.CACHE_SCOPE_BLOG
     permission_classes = [IsAdminUser]
 
     def get_filters(self):
@@ -208,5 +244,12 @@ class CommentAdminRestoreViewSet(CommentAdminViewSet):
 
     def restore(self, request, *args, **kwargs):
         instance = self.get_object()
-        tools.restore_thread(instance)
+        tools.restore_comment(instance)
         return Response()
+
+
+class CommentModerationViewSet(CommentAdminViewSet):
+    serializer_class = ModerationSerializer
+
+    def perform_moderation(self, action, queryset):
+        return tools.moderate_comments(action, queryset)
@@ -0,0 +1,127 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, transaction
+from rest_framework.authentication import TokenAuthentication
+
+from core.cache import cache
+from utils.debug import Debug  # noqa
+
+
+def principal_key(key):
+    return 'auth:%s' % hashlib.sha256(key.encode()).hexdigest()
+
+
+def forget_token(key):
+    cache.delete(principal_key(key))
+
+
+def get_token_keys(user):
+    model = CachedTokenAuthentication().get_model()
+    return list(
+        model.objects.filter(user=user).values_list('key', flat=True)
+    )
+
+
+def forget_tokens(keys):
+    """
+    Drop cached principals of keys now and once more after commit
+
+    Read keys before deleting tokens or saving the user.
+    A request racing the change may cache the old principal again
+    until the commit, the second drop retires it.
+    """
+    def forget():
+        for key in keys:
+            forget_token(key)
+
+    forget()
+    transaction.on_commit(forget)
+
+
+def forget_user(user):
+    forget_tokens(get_token_keys(user))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Cached Token Authentication
+
+    Token keys map to a slim principal of the user
+    for REST_AUTH_CACHE_TIMEOUT seconds at most.
+    Fields out of the principal load from database on first access.
+    """
+
+    token_fields = [
+        'key',
+        'user_id',
+        'created',
+    ]
+    user_fields = [
+        'id',
+        'username',
+        'email',
+        'first_name',
+        'last_name',
+        'call_name',
+        'tel_index',
+        'is_active',
+        'is_staff',
+        'is_superuser',
+        'is_approved',
+        'last_login',
+        'date_joined',
+    ]
+
+    def get_fields(self, model, fields):
+        """
+        Return fields of model in the order of its concrete fields
+        """
+        return [
+            field.attname for field in model._meta.concrete_fields
+            if field.attname in fields
+        ]
+
+    def get_values(self, instance, fields):
+        return [
+            getattr(instance, field)
+            for field in self.get_fields(type(instance), fields)
+        ]
+
+    def make_principal(self, user, token):
+        return (
+            self.get_values(token, self.token_fields),
+            self.get_values(user, self.user_fields),
+        )
+
+    def from_principal(self, principal):
+        token_values, user_values = principal
+        user_model = get_user_model()
+        token_model = self.get_model()
+
+        user = user_model.from_db(
+            DEFAULT_DB_ALIAS,
+            self.get_fields(user_model, self.user_fields),
+            user_values
+        )
+        token = token_model.from_db(
+            DEFAULT_DB_ALIAS,
+            self.get_fields(token_model, self.token_fields),
+            token_values
+        )
+        token.user = user
+        return user, token
+
+    def authenticate_credentials(self, key):
+        principal = cache.get(principal_key(key))
+        if principal is not None:
+            return self.from_principal(principal)
+
+        user, token = super().authenticate_credentials(key)
+        cache.set(
+            principal_key(key),
+            self.make_principal(user, token),
+            settings.REST_AUTH_CACHE_TIMEOUT
+        )
+        return user, token
@@ -0,0 +1,90 @@
+import atexit
+import threading
+
+from django.apps import apps
+from django.db import connection
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest
+
+from utils.constants import Const
+from utils.debug import Debug  # noqa
+
+
+class TimestampBuffer():
+    """
+    Timestamp Buffer
+
+    Keeps the latest timestamp of each row in process
+    and writes them in batched UPDATEs every interval seconds.
+    Timestamps never move backwards, neither in the buffer
+    nor in the database.
+    An interval of 0 writes through on every touch.
+    """
+
+    def __init__(self, model, field, interval):
+        self.model = model
+        self.field = field
+        self.interval = interval
+        self.pending = {}
+        self.timer = None
+        self.lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def get_model(self):
+        return apps.get_model(self.model)
+
+    def touch(self, pk, timestamp):
+        with self.lock:
+            if pk in self.pending and self.pending[pk] >= timestamp:
+                return
+            self.pending[pk] = timestamp
+
+            if self.interval > 0:
+                if not self.timer:
+                    self.timer = threading.Timer(
+                        self.interval, self.flush_in_thread
+                    )
+                    self.timer.daemon = True
+                    self.timer.start()
+                return
+
+        self.flush()
+
+    def flush_in_thread(self):
+        try:
+            self.flush()
+        finally:
+            connection.close()
+
+    def flush(self, chunk_size=Const.CHUNK_SIZE):
+        """
+        Write pending timestamps and return the number of rows updated
+        """
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            if self.timer:
+                self.timer.cancel()
+                self.timer = None
+
+        if not pending:
+            return 0
+
+        model = self.get_model()
+        items = list(pending.items())
+        count = 0
+
+        for index in range(0, len(items), chunk_size):
+            chunk = items[index:index + chunk_size]
+            count += model.objects.filter(
+                pk__in=[pk for pk, timestamp in chunk]
+            ).update(**{
+                self.field: Greatest(
+                    F(self.field),
+                    Case(*[
+                        When(pk=pk, then=Value(timestamp))
+                        for pk, timestamp in chunk
+                    ])
+                )
+            })
+
+        return count
@@ -0,0 +1,367 @@
+import hashlib
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+from django.utils.http import urlencode
+
+from rest_framework import status
+
+from utils.debug import Debug  # noqa
+from utils.text import Text
+
+
+class LRUCache():
+    """
+    Bounded LRU Cache
+
+    Entries expire after their timeout
+    and the least recently used one goes first when full.
+    """
+
+    def __init__(self, size, timeout):
+        self.size = size
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.metrics = Counter()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return (found, value)
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.metrics['misses'] += 1
+                return False, None
+
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self.entries[key]
+                self.metrics['misses'] += 1
+                return False, None
+
+            self.entries.move_to_end(key)
+            self.metrics['hits'] += 1
+            return True, value
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.metrics)
+            stats['size'] = len(self.entries)
+            return stats
+
+    def reset_stats(self):
+        with self.lock:
+            self.metrics.clear()
+
+    def set(self, key, value, timeout=None):
+        if timeout is None or timeout > self.timeout:
+            timeout = self.timeout
+        if self.size <= 0 or timeout <= 0:
+            return
+
+        with self.lock:
+            self.entries[key] = (time.monotonic() + timeout, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class Flight():
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+
+
+class SingleFlight():
+    """
+    Single-flight Calls
+
+    Concurrent calls of a key in a process wait for one of them.
+    """
+
+    def __init__(self):
+        self.flights = {}
+        self.lock = threading.Lock()
+
+    def run(self, key, function, share=None):
+        """
+        Return function() run once for every waiting caller
+
+        Waiting callers run function() themselves
+        when the result is None or share(result) is false.
+        """
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = Flight()
+
+        if not leader:
+            flight.event.wait()
+            if flight.result is not None and (
+                share is None or share(flight.result)
+            ):
+                return flight.result
+            return function()
+
+        try:
+            flight.result = function()
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.event.set()
+
+        return flight.result
+
+
+class TieredCache():
+    """
+    Two-tier Cache
+
+    Reads go through a bounded LRU in process before django cache,
+    the shared tier configured by CACHE_BACKEND.
+    Local entries live CACHE_LOCAL_TIMEOUT seconds at most,
+    which bounds how long other processes keep a replaced value.
+    """
+
+    def __init__(self, alias=DEFAULT_CACHE_ALIAS):
+        self.alias = alias
+        self.local = LRUCache(
+            settings.CACHE_LOCAL_SIZE,
+            settings.CACHE_LOCAL_TIMEOUT
+        )
+        self.flights = SingleFlight()
+        self.metrics = Counter()
+        self.lock = threading.Lock()
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def count(self, metric):
+        with self.lock:
+            self.metrics[metric] += 1
+
+    def stats(self):
+        with self.lock:
+            return dict(self.metrics)
+
+    def reset_stats(self):
+        with self.lock:
+            self.metrics.clear()
+
+    def local_timeout(self, timeout):
+        if timeout is DEFAULT_TIMEOUT:
+            return self.shared.default_timeout
+        return timeout
+
+    def get(self, key, default=None):
+        found, value = self.local.get(key)
+        if found:
+            self.count('local_hits')
+            return value
+
+        value = self.shared.get(key)
+        if value is None:
+            self.count('misses')
+            return default
+
+        self.count('shared_hits')
+        self.local.set(key, value)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        self.count('sets')
+        self.shared.set(key, value, timeout)
+        self.local.set(key, value, self.local_timeout(timeout))
+
+    def delete(self, key):
+        self.local.delete(key)
+        self.shared.delete(key)
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT):
+        """
+        Return the cached value of key or cache default()
+
+        Concurrent misses of a key in a process wait for one default(),
+        None is never cached.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        def compute():
+            value = self.get(key)
+            if value is None:
+                value = default() if callable(default) else default
+                if value is not None:
+                    self.set(key, value, timeout)
+            return value
+
+        return self.flights.run(key, compute)
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+
+
+cache = TieredCache()
+
+
+def new_version():
+    return uuid.uuid4().hex
+
+
+def generation_key(name):
+    return 'generation:%s' % name
+
+
+def get_generation(name):
+    return cache.get_or_set(generation_key(name), new_version, None)
+
+
+def bump_generation(name):
+    """
+    Replace the generation now and once more after commit,
+    so nothing read before the commit outlives it.
+    """
+    cache.set(generation_key(name), new_version(), None)
+    transaction.on_commit(
+        lambda: cache.set(generation_key(name), new_version(), None)
+    )
+
+
+class LocalCache():
+    """
+    Versioned In-process Cache
+
+    Entries stay in this process for timeout seconds, forever if None.
+    A generation shared through django cache is replaced on writes,
+    then every process drops its entries on the next read.
+    The timeout bounds staleness where the generation is not shared,
+    as with a per-process cache backend.
+    """
+
+    def __init__(self, name, timeout=None):
+        self.name = 'local:%s' % name
+        self.timeout = timeout
+        self.version = None
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, key, default):
+        """
+        Return the cached value of key or cache default()
+
+        None is never cached so misses cannot pile up.
+        """
+        version = get_generation(self.name)
+
+        with self.lock:
+            if version != self.version:
+                self.version = version
+                self.entries = {}
+            elif key in self.entries:
+                expires, value = self.entries[key]
+                if expires is None or expires > time.monotonic():
+                    return value
+                del self.entries[key]
+
+        value = default()
+
+        if value is not None:
+            expires = None
+            if self.timeout is not None:
+                expires = time.monotonic() + self.timeout
+
+            with self.lock:
+                if version == self.version:
+                    self.entries[key] = (expires, value)
+
+        return value
+
+    def invalidate(self):
+        bump_generation(self.name)
+
+
+class ResponseCache():
+    """
+    Response Cache
+
+    Keys carry the generation of their scope,
+    so bumping the generation retires every response of the scope.
+    A variant retires responses that change without writes.
+    Concurrent misses of a key in a process wait for one computation.
+    """
+
+    headers = ['ETag']
+
+    def __init__(self):
+        self.flights = SingleFlight()
+
+    def key(self, scope, request, variant=None):
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        raw = '%s|%s|%s|%s|%s?%s' % (
+            get_generation(scope),
+            variant,
+            Text.language(),
+            request.get_host(),
+            request.path,
+            query,
+        )
+        return 'response:%s:%s' % (
+            scope, hashlib.md5(raw.encode()).hexdigest()
+        )
+
+    def compute(self, key, handler):
+        response = handler()
+        result = (
+            response.data,
+            response.status_code,
+            {
+                header: response[header]
+                for header in self.headers if header in response
+            }
+        )
+
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, result, settings.REST_RESPONSE_CACHE_TIMEOUT)
+
+        return result
+
+    def get(self, key, handler):
+        """
+        Return (data, status, headers) of the cached response
+        or of handler()
+
+        Only 200 responses are cached and shared with waiting requests,
+        others wait for nothing but run handler() themselves.
+        """
+        result = cache.get(key)
+        if result is not None:
+            return result
+
+        return self.flights.run(
+            key,
+            lambda: self.compute(key, handler),
+            lambda result: result[1] == status.HTTP_200_OK
+        )
+
+
+response_cache = ResponseCache()
@@ -23,6 +23,10 @@ class Error(object):
     def invalid_page():
         ValidationError('INVALID_VALUE', 'page')
 
+    @staticmethod
+    def invalid_cursor():
+        ValidationError('INVALID_VALUE', 'cursor')
+
     @staticmethod
     def required_field(field):
         ValidationError('REQUIRED_FIELD', field)
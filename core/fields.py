@@ -1,11 +1,94 @@
 from django.db import models
+from django.db.models.expressions import Col
+from django.db.models.query_utils import DeferredAttribute
+from django.utils.functional import SimpleLazyObject, empty
 
+from core.queries import chunked_ids
+from utils.constants import Const
 from utils.crypto import Crypto
 
 
+class EncryptedValue(SimpleLazyObject):
+    """
+    Lazy Plaintext
+
+    Decrypted on first use, then it behaves as the plain string.
+    """
+
+    def __init__(self, ciphertext):
+        self.__dict__['ciphertext'] = ciphertext
+        super().__init__(lambda: Crypto.cbc_decrypt(ciphertext))
+
+    def is_decrypted(self):
+        return self._wrapped is not empty
+
+
+class EncryptedCol(Col):
+    """
+    Column of encrypted fields
+
+    Columns loaded into model instances keep the lazy value,
+    values() and values_list() rows get the plaintext.
+    """
+    lazy = False
+
+    def select_format(self, compiler, sql, params):
+        self.lazy = compiler.query.default_cols
+        return super().select_format(compiler, sql, params)
+
+
+class DecryptedAttribute(DeferredAttribute):
+    """
+    Model attribute of encrypted fields
+
+    Replaces the lazy value with its plaintext on first access.
+    """
+
+    def __get__(self, instance, cls=None):
+        value = super().__get__(instance, cls)
+        if isinstance(value, EncryptedValue):
+            value = instance.__dict__[self.field.attname] = str(value)
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+
+def decrypt_instances(instances, fields):
+    """
+    Batch Decryption
+
+    Decrypt fields of instances that nobody has read yet at once.
+    """
+    pending = []
+
+    for instance in instances:
+        for field in fields:
+            value = instance.__dict__.get(field)
+            if isinstance(value, EncryptedValue) and not value.is_decrypted():
+                pending.append((instance, field, value.ciphertext))
+
+    texts = Crypto.cbc_decrypt_batch(
+        [ciphertext for instance, field, ciphertext in pending]
+    )
+    for (instance, field, ciphertext), text in zip(pending, texts):
+        instance.__dict__[field] = text
+
+    return instances
+
+
 class EncryptedFieldMixin(object):
+    descriptor_class = DecryptedAttribute
+
+    def get_col(self, alias, output_field=None):
+        return EncryptedCol(alias, self, output_field)
+
     def from_db_value(self, value, expression, connection):
-        return self.to_python(Crypto.cbc_decrypt(value))
+        if not value:
+            return None
+        if getattr(expression, 'lazy', False):
+            return EncryptedValue(value)
+        return Crypto.cbc_decrypt(value)
 
     def get_prep_value(self, value):
         value = super(EncryptedFieldMixin, self).get_prep_value(value)
@@ -18,3 +101,90 @@ class EncryptedCharField(EncryptedFieldMixin, models.CharField):
     the intended length for encryption varying.
     """
     pass
+
+
+class BlindIndexField(models.CharField):
+    """
+    Blind Index
+
+    Keyed HMAC of the source field kept on save,
+    so encrypted values can be looked up by equality.
+    """
+
+    def __init__(self, source, *args, **kwargs):
+        self.source = source
+        kwargs.setdefault('max_length', Const.LENGTH_64)
+        kwargs.setdefault('db_index', True)
+        kwargs.setdefault('blank', True)
+        kwargs.setdefault('null', True)
+        kwargs.setdefault('editable', False)
+        super(BlindIndexField, self).__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super(BlindIndexField, self).deconstruct()
+        kwargs['source'] = self.source
+        return name, path, args, kwargs
+
+    def index_value(self, value):
+        return Crypto.blind_index(value, self.source)
+
+    def pre_save(self, model_instance, add):
+        value = self.index_value(getattr(model_instance, self.source))
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+def blind_index_fields(model):
+    return [
+        field for field in model._meta.concrete_fields
+        if isinstance(field, BlindIndexField)
+    ]
+
+
+def blind_index_query(model, source, value):
+    """
+    Q of the rows whose source field equals value
+    """
+    for field in blind_index_fields(model):
+        if field.source == source:
+            return models.Q(**{field.attname: field.index_value(value)})
+    raise ValueError('%s has no blind index of %s' % (model.__name__, source))
+
+
+def sync_blind_indexes(model, chunk_size=Const.CHUNK_SIZE):
+    """
+    Backfill blind indexes of model chunk by chunk
+
+    Return the number of rows fixed.
+    """
+    fields = blind_index_fields(model)
+    if not fields:
+        return 0
+
+    sources = [field.source for field in fields]
+    names = [field.attname for field in fields]
+    queryset = model._base_manager.all()
+    count = 0
+
+    for ids in chunked_ids(queryset, chunk_size):
+        instances = decrypt_instances(
+            queryset.filter(pk__in=ids).only('pk', *sources, *names),
+            sources
+        )
+        changes = []
+
+        for instance in instances:
+            changed = False
+            for field in fields:
+                value = field.index_value(getattr(instance, field.source))
+                if value != getattr(instance, field.attname):
+                    setattr(instance, field.attname, value)
+                    changed = True
+            if changed:
+                changes.append(instance)
+
+        if changes:
+            queryset.bulk_update(changes, names)
+            count += len(changes)
+
+    return count
@@ -1,7 +1,21 @@
+import functools
+import hashlib
 import sys
 
 from django.conf import settings
-
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework import status
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response as RestResponse
+
+from core.cache import (
+    bump_generation,
+    get_generation,
+    response_cache,
+)
+from core.queries import query_plan
 from core.response import Response
 from core.shortcuts import get_object_or_404
 from utils.constants import Const
@@ -28,6 +42,13 @@ class ResponseMixin():
     sensitive_parameters = [
         'password',
     ]
+    count_strategy = None
+    query_planner = True
+    select_related_fields = []
+    prefetch_related_fields = []
+    undeferred_fields = []
+    attached_fields = []
+    cache_scope = None
 
     def request_log(self, request):
         lang = Text.language()
@@ -65,6 +86,136 @@ class ResponseMixin():
 
         return obj
 
+    def get_cache_scope(self):
+        return self.cache_scope
+
+    def get_cache_variant(self):
+        return None
+
+    def get_response_cache_key(self, request):
+        if request.method != 'GET' or request.user.is_authenticated:
+            return None
+
+        scope = self.get_cache_scope()
+        if not scope:
+            return None
+
+        return response_cache.key(scope, request, self.get_cache_variant())
+
+    def initial(self, request, *args, **kwargs):
+        """
+        Anonymous GET responses are cached per cache scope
+        once permissions have passed.
+        """
+        super().initial(request, *args, **kwargs)
+
+        key = self.get_response_cache_key(request)
+        if key:
+            method = request.method.lower()
+            setattr(self, method, functools.partial(
+                self.cached_response, key, getattr(self, method)
+            ))
+
+    def cached_response(self, key, handler, request, *args, **kwargs):
+        data, status_code, headers = response_cache.get(
+            key,
+            lambda: handler(request, *args, **kwargs)
+        )
+
+        if status_code == Response.HTTP_200:
+            not_modified = self.not_modified(request, headers)
+            if not_modified:
+                return not_modified
+
+        return RestResponse(data, status=status_code, headers=headers)
+
+    def get_validators(self):
+        """
+        Conditional GET Validators
+
+        Values read without serializing which change with the response,
+        None turns conditional GET off.
+        """
+        return None
+
+    def get_instance_validators(self, queryset, *fields):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return queryset.filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        ).values_list(*fields).first()
+
+    def get_list_validators(self, scope):
+        """
+        List Validators
+
+        The generation of scope, replaced on every write to the list,
+        so polling reads no rows.
+        """
+        return [timezone.localdate(), get_generation(scope)]
+
+    def get_validator_headers(self, request):
+        validators = self.get_validators()
+        if validators is None:
+            return {}
+
+        raw = repr([request.user.pk, Text.language(), validators])
+        return {
+            'ETag': quote_etag(hashlib.md5(raw.encode()).hexdigest()),
+        }
+
+    def not_modified(self, request, headers):
+        """
+        Return 304 when If-None-Match matches the ETag
+
+        Votes and replies do not touch modified_at,
+        so Last-Modified is not offered as a validator.
+        """
+        if not headers.get('ETag'):
+            return None
+
+        response = get_conditional_response(request, etag=headers['ETag'])
+        if response is None or response.status_code != Response.HTTP_304:
+            return None
+
+        return RestResponse(status=Response.HTTP_304, headers=headers)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if (
+            request.method not in SAFE_METHODS and
+            status.is_success(response.status_code)
+        ):
+            scope = self.get_cache_scope()
+            if scope:
+                bump_generation(scope)
+
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+
+        if self.query_planner and self.request.method in SAFE_METHODS:
+            queryset = self.plan_queryset(queryset)
+
+        return queryset
+
+    def plan_queryset(self, queryset):
+        serializer_class = self.get_serializer_class()
+        meta = getattr(serializer_class, 'Meta', None)
+
+        if getattr(meta, 'model', None) != queryset.model:
+            return queryset
+
+        return query_plan(serializer_class).apply(
+            queryset,
+            self.select_related_fields,
+            self.prefetch_related_fields,
+            self.undeferred_fields,
+            self.attached_fields
+        )
+
+    def get_cached_count(self, queryset):
+        return None
+
     def get_list_queryset(self, instance):
         return None
 
@@ -103,6 +254,9 @@ class ResponseMixin():
     def perform_delete(self, instance):
         pass
 
+    def perform_moderation(self, action, queryset):
+        return 0
+
     def sync_update(self, instance, partial):
         pass
 
@@ -122,15 +276,24 @@ class ResponseMixin():
 
     def list(self, request, *args, **kwargs):
         self.q = request.query_params.get(Const.QUERY_PARAM_SEARCH)
+
+        headers = self.get_validator_headers(request)
+        not_modified = self.not_modified(request, headers)
+        if not_modified:
+            return not_modified
+
         queryset = self.filter_queryset(self.get_queryset())
 
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+            response = self.get_paginated_response(serializer.data)
+            for header, value in headers.items():
+                response[header] = value
+            return response
 
         serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return Response(serializer.data, headers=headers)
 
     def instance_list(self, request, *args, **kwargs):
         self.q = request.query_params.get(Const.QUERY_PARAM_SEARCH)
@@ -153,9 +316,14 @@ class ResponseMixin():
         return Response(serializer.data)
 
     def retrieve(self, request, *args, **kwargs):
+        headers = self.get_validator_headers(request)
+        not_modified = self.not_modified(request, headers)
+        if not_modified:
+            return not_modified
+
         instance = self.get_object()
         serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        return Response(serializer.data, headers=headers)
 
     def retrieve_list(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -239,6 +407,22 @@ class ResponseMixin():
         else:
             return Response(status=Response.HTTP_403)
 
+    def moderate(self, request, *args, **kwargs):
+        Debug.trace(request.data)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        action = serializer.validated_data.get('action')
+        count = self.perform_moderation(
+            action,
+            self.model.objects.filter(serializer.get_query())
+        )
+        return Response({
+            'action': action,
+            'count': count,
+        })
+
     def get_paginated_response(self, data, one_field=None, one_data=None):
         assert self.paginator is not None
         return self.paginator.get_paginated_response(
@@ -1,6 +1,18 @@
+import base64
+import binascii
+import json
+
 from collections import OrderedDict
 
-from django.core.paginator import InvalidPage
+from django.conf import settings
+from django.core.paginator import (
+    EmptyPage,
+    InvalidPage,
+    Paginator,
+)
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
 
 from rest_framework.exceptions import NotFound
 from rest_framework.pagination import (
@@ -8,22 +20,88 @@ from rest_framework.pagination import (
     PageNumberPagination as _BasePagination
 )
 from rest_framework.response import Response
-from rest_framework.utils.urls import remove_query_param
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 from core.error import Error
+from core.queries import (
+    capped_count,
+    estimate_count,
+)
+from utils.constants import Const
 from utils.debug import Debug  # noqa
 from utils.regexp import RegExpHelper
 
 
+class CountPaginator(Paginator):
+    """
+    Paginator with a given total
+
+    When the total is given, pages are read with one extra row
+    so that a stale or approximate total never hides rows.
+    Reaching the last page makes the total exact.
+    """
+
+    def __init__(self, object_list, per_page, count=None, exact=True):
+        super().__init__(object_list, per_page)
+        self.exact = exact
+        self.given = bool(count is not None)
+
+        if self.given:
+            self.__dict__['count'] = count
+
+    def set_count(self, count, exact):
+        self.__dict__['count'] = count
+        self.__dict__.pop('num_pages', None)
+        self.exact = exact
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if not self.given or int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number):
+        if not self.given:
+            return super().page(number)
+
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+
+        if not rows and number > 1:
+            raise EmptyPage(_('That page contains no results'))
+
+        seen = bottom + len(rows)
+        if len(rows) <= self.per_page:
+            self.set_count(seen, True)
+        elif self.count < seen:
+            self.set_count(seen, False)
+
+        return self._get_page(rows[:self.per_page], number, self)
+
+
 class PrevNextPagination(_BasePagination):
     """
     Pagination Style
 
     Check https://www.django-rest-framework.org/api-guide/pagination/
+
+    Sending cursor (even empty) switches to keyset pagination.
+    Rows are sought by the ordering values of the last row seen,
+    so deep pages cost the same as the first one.
+    Orderings by annotations such as search rank cannot be sought
+    exactly and fall back to page numbers.
+
+    Views choose how item_total is counted with count_strategy.
     """
 
     page_size_query_param = 'page_size'
     page_size_query_param_all = 'all'
+    cursor_query_param = Const.QUERY_PARAM_CURSOR
+    cursor_mode = False
+    django_paginator_class = CountPaginator
 
     def get_page_size_with_queryset(self, request, queryset):
         if self.page_size_query_param:
@@ -43,18 +121,157 @@ class PrevNextPagination(_BasePagination):
         return self.page_size
 
     def get_first_link(self):
+        if self.cursor_mode:
+            if not self.has_previous:
+                return None
+
+            url = self.request.build_absolute_uri()
+            return replace_query_param(url, self.cursor_query_param, '')
+
         if not self.page.has_previous():
             return None
 
         url = self.request.build_absolute_uri()
         return remove_query_param(url, self.page_query_param)
 
+    def get_count(self, queryset, view):
+        strategy = (
+            getattr(view, 'count_strategy', None) or
+            settings.REST_PAGINATION_COUNT_DEFAULT
+        )
+        cap = settings.REST_PAGINATION_COUNT_CAP
+
+        if strategy == Const.COUNT_CACHED:
+            count = view.get_cached_count(queryset)
+            if count is not None:
+                return count, True
+        elif strategy == Const.COUNT_ESTIMATE:
+            count = estimate_count(queryset, cap)
+            if count is not None:
+                return count, False
+            strategy = Const.COUNT_CAPPED
+
+        if strategy == Const.COUNT_CAPPED:
+            return capped_count(queryset, cap)
+
+        return None, True
+
+    def get_ordering(self, queryset):
+        query = queryset.query
+
+        if query.order_by:
+            ordering = list(query.order_by)
+        elif query.default_ordering:
+            ordering = list(queryset.model._meta.ordering)
+        else:
+            ordering = []
+
+        for field in ordering:
+            if not isinstance(field, str) or field == '?':
+                return None
+            if field.lstrip('-').split('__')[0] in query.annotations:
+                return None
+
+        names = [field.lstrip('-') for field in ordering]
+        pk = queryset.model._meta.pk
+        if not set(names) & {'pk', pk.name, pk.attname}:
+            ordering.append('-pk')
+
+        return ordering
+
+    def encode_cursor(self, instance, reverse):
+        values = []
+        for field in self.ordering:
+            value = instance
+            for attr in field.lstrip('-').split('__'):
+                value = getattr(value, attr)
+            values.append(value)
+
+        data = json.dumps([values, reverse], cls=DjangoJSONEncoder)
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            data = base64.urlsafe_b64decode(cursor.encode())
+            values, reverse = json.loads(data.decode())
+        except (binascii.Error, UnicodeError, ValueError, TypeError):
+            raise Error.invalid_cursor()
+
+        if (
+            not isinstance(values, list) or
+            len(values) != len(self.ordering) or
+            not all(isinstance(v, (str, int, float)) for v in values)
+        ):
+            raise Error.invalid_cursor()
+
+        return values, bool(reverse)
+
+    def seek_query(self, values, reverse):
+        query = Q()
+        equal = Q()
+
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            lookup = '%s__%s' % (name, 'lt' if descending else 'gt')
+
+            query |= equal & Q(**{lookup: value})
+            equal &= Q(**{name: value})
+
+        return query
+
+    def reverse_ordering(self):
+        return [
+            field[1:] if field.startswith('-') else '-' + field
+            for field in self.ordering
+        ]
+
+    def paginate_cursor(self, queryset, request, page_size):
+        cursor = request.query_params.get(self.cursor_query_param)
+        reverse = False
+
+        if cursor:
+            values, reverse = self.decode_cursor(cursor)
+            queryset = queryset.filter(self.seek_query(values, reverse))
+
+        if reverse:
+            queryset = queryset.order_by(*self.reverse_ordering())
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_previous = has_more
+            self.has_next = True
+        else:
+            self.has_previous = bool(cursor)
+            self.has_next = has_more
+
+        self.rows = rows
+        return rows
+
     def paginate_queryset(self, queryset, request, view=None):
         page_size = self.get_page_size_with_queryset(request, queryset)
         if not page_size:
             return None
 
-        paginator = self.django_paginator_class(queryset, page_size)
+        self.request = request
+        self.cursor_mode = False
+
+        if self.cursor_query_param in request.query_params:
+            self.ordering = self.get_ordering(queryset)
+            if self.ordering:
+                self.cursor_mode = True
+                return self.paginate_cursor(queryset, request, page_size)
+
+        count, exact = self.get_count(queryset, view)
+        paginator = self.django_paginator_class(
+            queryset, page_size, count, exact
+        )
         page_number = request.query_params.get(self.page_query_param, 1)
         if page_number in self.last_page_strings:
             page_number = paginator.num_pages
@@ -81,36 +298,62 @@ class PrevNextPagination(_BasePagination):
         if paginator.num_pages > 1 and self.template is not None:
             self.display_page_controls = True
 
-        self.request = request
         return list(self.page)
 
-    def get_paginated_response(self, data, one_field=None, one_data=None):
-        item_total = self.page.paginator.count
-        page_total = self.page.paginator.num_pages
-        current_page = self.current_page
+    def get_next_cursor(self):
+        if not self.has_next or not self.rows:
+            return None
+        return self.encode_cursor(self.rows[-1], False)
+
+    def get_previous_cursor(self):
+        if not self.has_previous or not self.rows:
+            return None
+        return self.encode_cursor(self.rows[0], True)
+
+    def get_cursor_link(self, cursor):
+        if not cursor:
+            return None
 
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_pagination(self):
+        if self.cursor_mode:
+            next_cursor = self.get_next_cursor()
+            prev_cursor = self.get_previous_cursor()
+
+            return OrderedDict([
+                ('item_total', None),
+                ('item_total_exact', False),
+                ('page_total', None),
+                ('current_page', None),
+                ('next_link', self.get_cursor_link(next_cursor)),
+                ('prev_link', self.get_cursor_link(prev_cursor)),
+                ('first_link', self.get_first_link()),
+                ('next_cursor', next_cursor),
+                ('prev_cursor', prev_cursor),
+            ])
+
+        return OrderedDict([
+            ('item_total', self.page.paginator.count),
+            ('item_total_exact', self.page.paginator.exact),
+            ('page_total', self.page.paginator.num_pages),
+            ('current_page', self.current_page),
+            ('next_link', self.get_next_link()),
+            ('prev_link', self.get_previous_link()),
+            ('first_link', self.get_first_link()),
+        ])
+
+    def get_paginated_response(self, data, one_field=None, one_data=None):
         if one_field:
             return Response(OrderedDict([
-                ('pagination', OrderedDict([
-                    ('item_total', item_total),
-                    ('page_total', page_total),
-                    ('current_page', current_page),
-                    ('next_link', self.get_next_link()),
-                    ('prev_link', self.get_previous_link()),
-                    ('first_link', self.get_first_link()),
-                ])),
+                ('pagination', self.get_pagination()),
                 ('data', data),
                 (one_field, one_data)
             ]))
 
         return Response(OrderedDict([
-            ('pagination', OrderedDict([
-                ('item_total', item_total),
-                ('page_total', page_total),
-                ('current_page', current_page),
-                ('next_link', self.get_next_link()),
-                ('prev_link', self.get_previous_link()),
-                ('first_link', self.get_first_link()),
-            ])),
+            ('pagination', self.get_pagination()),
             ('data', data)
         ]))
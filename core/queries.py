@@ -0,0 +1,266 @@
+import functools
+from collections import Counter
+
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections, transaction
+from django.db.models import (
+    Count,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    TextField,
+)
+from django.db.models.functions import Coalesce
+from rest_framework.relations import ManyRelatedField
+from rest_framework.serializers import (
+    BaseSerializer,
+    ListSerializer,
+)
+
+from utils.constants import Const
+from utils.debug import Debug  # noqa
+
+
+def chunked_ids(queryset, chunk_size=Const.CHUNK_SIZE):
+    """
+    Keyset Iterator
+
+    Yield primary keys of queryset in ascending chunks
+    without OFFSET so that each chunk costs the same.
+    """
+    last_id = 0
+
+    while True:
+        ids = list(
+            queryset.filter(pk__gt=last_id).order_by('pk').values_list(
+                'pk', flat=True
+            )[:chunk_size]
+        )
+        if not ids:
+            break
+
+        yield ids
+        last_id = ids[-1]
+
+
+def count_subquery(queryset, field):
+    """
+    Correlated COUNT(*)
+
+    Count rows of queryset pointing to the outer row via field.
+    """
+    return Coalesce(
+        Subquery(
+            queryset.filter(
+                **{field: OuterRef('pk')}
+            ).order_by().values(field).annotate(
+                count=Count('pk')
+            ).values('count'),
+            output_field=IntegerField()
+        ),
+        Const.BASE_COUNT
+    )
+
+
+def capped_count(queryset, cap):
+    """
+    Capped COUNT(*)
+
+    Count at most cap + 1 rows.
+    Returns the count and whether it is exact.
+    """
+    count = queryset.order_by()[:cap + 1].count()
+
+    if count > cap:
+        return cap, False
+    return count, True
+
+
+def estimate_count(queryset, threshold=0):
+    """
+    Planner Estimate
+
+    Read pg_class.reltuples for an unfiltered queryset.
+    Returns None when it cannot be estimated
+    or the table is smaller than threshold.
+    """
+    connection = connections[queryset.db]
+
+    if queryset.query.where or connection.vendor != 'postgresql':
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+            [queryset.model._meta.db_table]
+        )
+        row = cursor.fetchone()
+
+    if not row or row[0] < threshold:
+        return None
+    return int(row[0])
+
+
+def sync_counts(queryset, counts, chunk_size=Const.CHUNK_SIZE):
+    """
+    Counter Reconciliation
+
+    counts maps a stored counter field to its count_subquery.
+    Only drifted rows are rewritten, chunk by chunk.
+    Returns the number of fixed rows.
+    """
+    fixed = 0
+
+    for ids in chunked_ids(queryset, chunk_size):
+        annotations = {}
+        drifted = Q()
+
+        for field, expression in counts.items():
+            real = 'real_%s' % field
+            annotations[real] = expression
+            drifted |= ~Q(**{field: F(real)})
+
+        fixed += queryset.model.objects.filter(pk__in=ids).annotate(
+            **annotations
+        ).filter(drifted).update(**counts)
+
+    return fixed
+
+
+def update_grouped(queryset, fields, **values):
+    """
+    Grouped Update
+
+    Lock the rows of queryset and update them in one statement.
+    Returns a Counter of updated rows by their values of fields.
+    """
+    with transaction.atomic():
+        rows = list(
+            queryset.select_for_update(of=('self',)).order_by().values_list(
+                'pk', *fields
+            )
+        )
+        if rows:
+            queryset.model.objects.filter(
+                pk__in=[row[0] for row in rows]
+            ).update(**values)
+
+    return Counter(row[1:] for row in rows)
+
+
+class QueryPlan():
+    """
+    Serializer-aware Query Plan
+
+    Walk the declared serializer fields once and remember
+    which relations to join, which to prefetch
+    and which text and search vector columns are never rendered.
+    """
+
+    def __init__(self, serializer_class):
+        self.select_related = []
+        self.prefetch_related = []
+        self.defer = []
+
+        self.plan(serializer_class(), serializer_class.Meta.model)
+
+    def model_field(self, model, name):
+        try:
+            return model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+
+    def plan(self, serializer, model, prefix='', prefetched=False):
+        used = set()
+
+        for field in serializer.fields.values():
+            if field.write_only:
+                continue
+
+            used.add(field.field_name)
+            if field.source == '*':
+                continue
+
+            name = field.source_attrs[0]
+            used.add(name)
+            model_field = self.model_field(model, name)
+
+            if not model_field or not model_field.is_relation:
+                continue
+
+            path = prefix + name
+
+            if isinstance(field, ListSerializer):
+                self.prefetch_related.append(path)
+                self.plan(
+                    field.child, model_field.related_model, path + '__', True
+                )
+            elif isinstance(field, ManyRelatedField):
+                self.prefetch_related.append(path)
+            elif (
+                isinstance(field, BaseSerializer) and
+                not model_field.many_to_many and
+                not model_field.one_to_many
+            ):
+                if prefetched:
+                    self.prefetch_related.append(path)
+                else:
+                    self.select_related.append(path)
+                self.plan(
+                    field, model_field.related_model, path + '__', prefetched
+                )
+
+        if prefetched:
+            return
+
+        for model_field in model._meta.concrete_fields:
+            if (
+                isinstance(model_field, (TextField, SearchVectorField)) and
+                model_field.name not in used
+            ):
+                self.defer.append(prefix + model_field.name)
+
+    def is_attached(self, path, attached):
+        for field in attached:
+            if path == field or path.startswith(field + '__'):
+                return True
+        return False
+
+    def apply(
+        self,
+        queryset,
+        select_related=[],
+        prefetch_related=[],
+        undeferred=[],
+        attached=[],
+    ):
+        select = [
+            path for path in self.select_related
+            if not self.is_attached(path, attached)
+        ] + list(select_related)
+        prefetch = [
+            path for path in self.prefetch_related
+            if not self.is_attached(path, attached)
+        ] + list(prefetch_related)
+        defer = [
+            field for field in self.defer
+            if field not in undeferred and
+            not self.is_attached(field, attached)
+        ]
+
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        if defer:
+            queryset = queryset.defer(*defer)
+
+        return queryset
+
+
+@functools.lru_cache(maxsize=None)
+def query_plan(serializer_class):
+    return QueryPlan(serializer_class)
@@ -3,6 +3,7 @@ from rest_framework.status import (
     HTTP_200_OK,
     HTTP_201_CREATED,
     HTTP_204_NO_CONTENT,
+    HTTP_304_NOT_MODIFIED,
     HTTP_400_BAD_REQUEST,
     HTTP_401_UNAUTHORIZED,
     HTTP_403_FORBIDDEN,
@@ -15,6 +16,7 @@ class Response(_Response):
     HTTP_200 = HTTP_200_OK
     HTTP_201 = HTTP_201_CREATED
     HTTP_204 = HTTP_204_NO_CONTENT
+    HTTP_304 = HTTP_304_NOT_MODIFIED
     HTTP_400 = HTTP_400_BAD_REQUEST
     HTTP_401 = HTTP_401_UNAUTHORIZED
     HTTP_403 = HTTP_403_FORBIDDEN
@@ -29,7 +31,14 @@ class Response(_Response):
             'data': data
         }
 
-        super().__init__(response_data, status=status)
+        super().__init__(
+            response_data,
+            status=status,
+            template_name=template_name,
+            headers=headers,
+            exception=exception,
+            content_type=content_type
+        )
 
 
 class PaginatedResponse(_Response):
@@ -42,4 +51,11 @@ class PaginatedResponse(_Response):
             'data': data
         }
 
-        super().__init__(response_data, status=status)
+        super().__init__(
+            response_data,
+            status=status,
+            template_name=template_name,
+            headers=headers,
+            exception=exception,
+            content_type=content_type
+        )
@@ -0,0 +1,131 @@
+import time
+from collections import Counter
+
+from django.apps import apps
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from django.db.models import Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from utils.debug import Debug  # noqa
+
+
+class RetentionPolicy():
+    """
+    Retention Policy
+
+    Rows of model matching filters whose age field is older than days
+    are purged, the first non-null of fields gives the age.
+    Days of 0 or less keep rows forever.
+    cleanup(ids) runs in the transaction of each batch
+    before its rows are deleted.
+    """
+
+    def __init__(self, model, days, filters=None, fields=None, cleanup=None):
+        self.model = model
+        self.days = days
+        self.filters = filters or []
+        self.fields = fields or ['created_at']
+        self.cleanup = cleanup
+
+    def __str__(self):
+        return '%s after %d days' % (self.get_model()._meta.label, self.days)
+
+    def get_model(self):
+        if isinstance(self.model, str):
+            return apps.get_model(self.model)
+        return self.model
+
+    def cutoff(self):
+        return timezone.now() - timezone.timedelta(days=self.days)
+
+    def get_queryset(self):
+        queryset = self.get_model()._base_manager.filter(*self.filters)
+
+        if len(self.fields) == 1:
+            return queryset.filter(
+                Q(**{'%s__lt' % self.fields[0]: self.cutoff()})
+            )
+
+        return queryset.annotate(
+            retained_at=Coalesce(*self.fields)
+        ).filter(retained_at__lt=self.cutoff())
+
+
+def delete_batch(model, ids, cleanup=None):
+    """
+    Delete rows of ids in a short transaction
+
+    Waiting for locks longer than RETENTION_LOCK_TIMEOUT fails the batch
+    instead of queueing behind live traffic.
+    """
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SET LOCAL lock_timeout = '%dms'" %
+                    settings.RETENTION_LOCK_TIMEOUT
+                )
+        if cleanup:
+            cleanup(ids)
+        return model._base_manager.filter(pk__in=ids).delete()
+
+
+def purge(policy, batch_size=None, pause=None, retries=None):
+    """
+    Purge rows of policy in bounded batches
+
+    Sleeps pause seconds between batches and backs off exponentially
+    on lock failures. Returns a Counter of deleted rows by model,
+    cascades included.
+    """
+    if batch_size is None:
+        batch_size = settings.RETENTION_BATCH_SIZE
+    if pause is None:
+        pause = settings.RETENTION_PAUSE
+    if retries is None:
+        retries = settings.RETENTION_RETRIES
+
+    deleted = Counter()
+    if policy.days <= 0:
+        return deleted
+
+    model = policy.get_model()
+    queryset = policy.get_queryset().order_by('pk')
+    failures = 0
+
+    while True:
+        ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            break
+
+        try:
+            _, counts = delete_batch(model, ids, policy.cleanup)
+        except OperationalError as e:
+            failures += 1
+            if failures > retries:
+                Debug.error('Retention of %s stopped: %s' % (policy, e))
+                break
+            time.sleep(pause * 2 ** failures)
+            continue
+
+        failures = 0
+        deleted.update(counts)
+        if len(ids) < batch_size:
+            break
+        time.sleep(pause)
+
+    return deleted
+
+
+def purge_all(policies, **kwargs):
+    deleted = Counter()
+
+    for policy in policies:
+        result = purge(policy, **kwargs)
+        if result:
+            Debug.print('Retention of %s: %s' % (policy, dict(result)))
+        deleted.update(result)
+
+    return deleted
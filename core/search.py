@@ -0,0 +1,207 @@
+import re
+
+from django.apps import apps
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+)
+from django.db.models import F
+
+from core.queries import chunked_ids
+from utils.constants import Const
+from utils.debug import Debug  # noqa
+
+
+WORD = re.compile(r'\w+')
+HANGUL = re.compile(r'[\u1100-\u11ff\u3130-\u318f\uac00-\ud7a3]')
+
+
+def is_hangul(word):
+    return bool(HANGUL.search(word))
+
+
+def bigrams(word):
+    return [word[i:i + 2] for i in range(len(word) - 1)]
+
+
+def suffixes(word):
+    return [
+        word[i:]
+        for i in range(1, len(word) - Const.SEARCH_SUFFIX_MIN_LENGTH + 1)
+    ]
+
+
+def tokenize(text):
+    """
+    Word, Bigram and Suffix Tokenizer
+
+    Korean attaches particles to words (고양이가, 고양이를),
+    so Hangul words are indexed by their bigrams as well.
+    Other words are indexed by their suffixes too,
+    so that a prefix query matches inside words (tiger in blacktiger).
+    """
+    tokens = []
+
+    for word in WORD.findall((text or '').lower()):
+        word = word[:Const.SEARCH_TOKEN_MAX_LENGTH]
+        tokens.append(word)
+
+        if is_hangul(word):
+            if len(word) > 2:
+                tokens.extend(bigrams(word))
+        else:
+            tokens.extend(suffixes(word))
+
+    return tokens
+
+
+def quote(token):
+    return "'%s'" % token.replace('\\', '\\\\').replace("'", "''")
+
+
+def to_vector(document):
+    """
+    tsvector Literal
+
+    document is a list of (text, weight).
+    Each lexeme keeps its heaviest weight (A > B > C > D).
+    """
+    lexemes = {}
+
+    for text, weight in document:
+        for token in tokenize(text):
+            if token not in lexemes or weight < lexemes[token]:
+                lexemes[token] = weight
+
+    return ' '.join(
+        '%s:1%s' % (quote(token), weight)
+        for token, weight in lexemes.items()
+    )
+
+
+def to_query(q):
+    """
+    tsquery Literal
+
+    Every word must match. Hangul words match by bigrams,
+    the others and single syllables by prefix.
+    """
+    terms = []
+
+    for word in WORD.findall((q or '').lower()):
+        word = word[:Const.SEARCH_TOKEN_MAX_LENGTH]
+
+        if is_hangul(word) and len(word) > 1:
+            terms.extend(
+                quote(token) for token in (
+                    bigrams(word) if len(word) > 2 else [word]
+                )
+            )
+        else:
+            terms.append('%s:*' % quote(word))
+
+    return ' & '.join(terms)
+
+
+class TsQuery(SearchQuery):
+    """
+    Prebuilt tsquery
+
+    Cast the literal from to_query() as is,
+    bypassing the text search parser.
+    """
+
+    template = '%(expressions)s::tsquery'
+
+
+def text_search(queryset, q, ordering=None):
+    """
+    Full Text Search
+
+    Rank by relevance, then by recency,
+    unless ordering is given for lists with an order of their own.
+    """
+    if not q:
+        return queryset
+
+    query = to_query(q)
+    if not query:
+        return queryset.none()
+
+    tsquery = TsQuery(query)
+    queryset = queryset.filter(search_vector=tsquery)
+    if ordering:
+        return queryset.order_by(*ordering)
+
+    return queryset.annotate(
+        rank=SearchRank(F('search_vector'), tsquery)
+    ).order_by('-rank', '-id')
+
+
+class SearchVectorMixin(object):
+    """
+    Keep search_vector in sync on save
+
+    search_fields lists the fields search_document() reads.
+    """
+
+    search_fields = []
+
+    def search_document(self):
+        return []
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+
+        if (
+            update_fields is None or
+            set(update_fields) & set(self.search_fields)
+        ):
+            self.search_vector = to_vector(self.search_document())
+
+            if update_fields is not None:
+                kwargs['update_fields'] = list(update_fields) + [
+                    'search_vector'
+                ]
+
+        super().save(*args, **kwargs)
+
+
+def reindex(queryset, chunk_size=Const.CHUNK_SIZE):
+    """
+    Rebuild search_vector of queryset chunk by chunk
+
+    Returns the number of rebuilt rows.
+    """
+    model = queryset.model
+    count = 0
+
+    for ids in chunked_ids(queryset, chunk_size):
+        instances = list(
+            model._base_manager.filter(pk__in=ids).select_related('user')
+        )
+        for instance in instances:
+            instance.search_vector = to_vector(instance.search_document())
+        model._base_manager.bulk_update(instances, ['search_vector'])
+        count += len(instances)
+
+    return count
+
+
+def reindex_author(user):
+    """
+    Author Reindex
+
+    Vectors of models searched by user hold the call name of the author,
+    rebuild them when it changes.
+    """
+    count = 0
+
+    for model in apps.get_models():
+        if (
+            issubclass(model, SearchVectorMixin) and
+            'user' in model.search_fields
+        ):
+            count += reindex(model._base_manager.filter(user=user))
+
+    return count
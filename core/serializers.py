@@ -1,5 +1,9 @@
+from django.db.models import Q
 from rest_framework import serializers
 
+from core.error import Error
+from utils.constants import Const
+
 
 class SerialzierMixin():
     def action(self):
@@ -26,3 +30,55 @@ class ListSerializer(SerialzierMixin, serializers.ListSerializer):
 
 class ModelSerializer(SerialzierMixin, serializers.ModelSerializer):
     pass
+
+
+class ModerationSerializer(Serializer):
+    """
+    Bulk Moderation
+
+    Targets are picked by ids or by a filter,
+    at least one of them is required.
+    """
+
+    action = serializers.ChoiceField(choices=[
+        Const.MODERATION_DELETE,
+        Const.MODERATION_RESTORE,
+    ])
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        max_length=Const.MODERATION_MAX_IDS,
+        required=False,
+    )
+    user = serializers.IntegerField(required=False)
+    anonymous = serializers.BooleanField(required=False)
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        if not (
+            attrs.get('ids') or
+            attrs.get('user') or
+            attrs.get('anonymous') or
+            attrs.get('since') or
+            attrs.get('until')
+        ):
+            Error.required_field('ids')
+
+        return attrs
+
+    def get_query(self):
+        data = self.validated_data
+        query = Q()
+
+        if data.get('ids'):
+            query &= Q(pk__in=data.get('ids'))
+        if data.get('user'):
+            query &= Q(user_id=data.get('user'))
+        if data.get('anonymous'):
+            query &= Q(user__isnull=True)
+        if data.get('since'):
+            query &= Q(created_at__gte=data.get('since'))
+        if data.get('until'):
+            query &= Q(created_at__lt=data.get('until'))
+
+        return query
@@ -5,10 +5,15 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework.response import Response as RestResponse
 from rest_framework.test import APIClient, APITestCase
 
+from core.cache import cache
 from core.response import Response
 
 
 class TestCase(APITestCase):
+    def _pre_setup(self):
+        super()._pre_setup()
+        cache.clear()
+
     def log(self, *args, **kwargs):
         print("#", *args, **kwargs)
 
@@ -102,7 +107,7 @@ class TestCase(APITestCase):
             response = self.client.get(path, data, format=format, **extra)
 
         self.response = response
-        if hasattr(response, 'data'):
+        if getattr(response, 'data', None) is not None:
             self.data = response.data.get('data')
         return response
 
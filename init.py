@@ -53,6 +53,7 @@ DEFAULT_SECRETS = {
     "AWS_ACCESS_KEY_ID": "",
     "AWS_SECRET_ACCESS_KEY": "",
     "AES_PASSPHRASE": "",
+    "BLIND_INDEX_KEY": "",
     "SECRET_KEY": get_random_secret_key()
 }
 CONFIG_PATH = 'config.json'
@@ -0,0 +1,75 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from accounts import tools
+from accounts.tests import TestCase
+from core.authentication import CachedTokenAuthentication, principal_key
+from core.cache import cache
+
+
+class AuthCacheTest(TestCase):
+    def setUp(self):
+        self.staff = self.create_user(username='c@a.com', is_staff=True)
+        self.staff_header = self.auth_header
+        self.create_user(username='a@a.com')
+
+    def token_queries(self, path):
+        with CaptureQueriesContext(connection) as context:
+            self.get(path, auth=True)
+
+        return [
+            query for query in context.captured_queries
+            if 'authtoken_token' in query.get('sql')
+        ]
+
+    def test_cached_principal(self):
+        path = '/api/accounts/setting/'
+        self.check_not(self.token_queries(path), [])
+        self.check(self.token_queries(path), [])
+        self.status(200)
+        self.check(self.data.get('tel'), '010-1234-5678')
+        self.check(self.data.get('call_name'), self.user.call_name)
+
+        self.patch(path, {'call_name': 'Cat'}, auth=True)
+        self.status(200)
+        self.get(path, auth=True)
+        self.check(self.data.get('call_name'), 'Cat')
+
+        self.auth_header = self.staff_header
+        self.patch(
+            '/api/admin/users/%d/' % self.user.id,
+            {
+                'is_active': False,
+            },
+            auth=True
+        )
+        self.status(200)
+
+        self.auth_header = 'Token ' + self.key
+        self.get(path, auth=True)
+        self.status(401)
+
+    def test_logout_invalidation(self):
+        self.get('/api/accounts/setting/', auth=True)
+        self.status(200)
+
+        self.post('/api/accounts/logout/', auth=True)
+        self.status(200)
+        self.get('/api/accounts/setting/', auth=True)
+        self.status(401)
+
+    def test_racing_request(self):
+        authentication = CachedTokenAuthentication()
+        user, token = authentication.authenticate_credentials(self.key)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            tools.delete_auth_token(self.user)
+
+            # a request which read the token before the delete commits
+            cache.set(
+                principal_key(self.key),
+                authentication.make_principal(user, token)
+            )
+
+        self.get('/api/accounts/setting/', auth=True)
+        self.status(401)
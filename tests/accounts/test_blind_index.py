@@ -0,0 +1,56 @@
+import io
+
+from django.core.management import call_command
+
+from accounts import models
+from accounts.tests import TestCase
+from core.fields import sync_blind_indexes
+
+
+class BlindIndexTest(TestCase):
+    def setUp(self):
+        self.user_a = self.create_user(username='a@a.com', tel='010-1111')
+        self.user_b = self.create_user(username='b@a.com', tel='010-2222')
+        self.staff = self.create_user(
+            username='c@a.com',
+            tel=None,
+            is_staff=True,
+        )
+
+    def test_tel_lookup(self):
+        self.check(
+            list(models.User.objects.tel('010-1111')),
+            [self.user_a]
+        )
+        self.check(models.User.objects.tel('010').exists(), False)
+        self.check_not(self.user_a.tel_index, self.user_b.tel_index)
+        self.check(self.staff.tel_index, None)
+
+        self.user_a.tel = '010-3333'
+        self.user_a.save(update_fields=['tel'])
+        self.check(
+            list(models.User.objects.tel('010-3333')),
+            [self.user_a]
+        )
+
+        self.get(
+            '/api/admin/users/?q=010-2222',
+            auth=True
+        )
+        self.status(200)
+        self.check(len(self.data), 1)
+        self.check(self.data[0].get('id'), self.user_b.id)
+
+    def test_sync_blind_indexes(self):
+        models.User.objects.update(tel_index=None)
+        self.check(models.User.objects.tel('010-1111').exists(), False)
+
+        self.check(sync_blind_indexes(models.User, chunk_size=1), 2)
+        self.check(
+            list(models.User.objects.tel('010-1111')),
+            [self.user_a]
+        )
+
+        out = io.StringIO()
+        call_command('sync_blind_indexes', stdout=out)
+        self.check_in('0 users fixed.', out.getvalue())
@@ -1,5 +1,6 @@
 from django.conf import settings
 
+from accounts import models
 from accounts.tests import TestCase
 from utils.datautils import search_dict
 
@@ -78,3 +79,30 @@ class DeviceTest(TestCase):
             auth=True
         )
         self.check_not(self.data)
+
+    def test_device_fingerprint(self):
+        for _ in range(2):
+            self.post(
+                '/api/accounts/login/',
+                {
+                    'username': self.username,
+                    'password': self.password
+                }
+            )
+            self.status(200)
+            self.check(
+                self.data.get('login_device').get('id'),
+                self.login_device.get('id')
+            )
+
+        login_device = models.LoginDevice.objects.get_or_insert(
+            self.user, 'PC', 'Mac OS X', 'Safari', '10.0.0.1'
+        )
+        self.check(
+            models.LoginDevice.objects.get_or_insert(
+                self.user, 'PC', 'Mac OS X', 'Safari', '10.0.0.1'
+            ),
+            login_device
+        )
+        self.check(models.LoginDevice.objects.count(), 2)
+        self.check(len(login_device.fingerprint), 64)
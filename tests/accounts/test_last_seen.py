@@ -0,0 +1,114 @@
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts import models, tools
+from accounts.tests import TestCase
+from core.buffers import TimestampBuffer
+from core.cache import cache
+
+
+class LastSeenTest(TestCase):
+    def setUp(self):
+        settings.USE_LOGIN_DEVICE = True
+
+        self.create_user()
+        self.post(
+            '/api/accounts/login/',
+            {
+                'username': self.username,
+                'password': self.password
+            }
+        )
+        self.login_device = models.LoginDevice.objects.get(
+            pk=self.data.get('login_device').get('id')
+        )
+
+    def last_login(self, model, pk, field='last_login'):
+        return model.objects.values_list(field, flat=True).get(pk=pk)
+
+    def last_seen(self):
+        return self.last_login(
+            models.LoginDevice, self.login_device.pk, 'last_seen'
+        )
+
+    def test_buffered_last_login(self):
+        buffer = TimestampBuffer('accounts.User', 'last_login', 60)
+        now = timezone.now()
+        other = models.User.objects.create_user(
+            username='a@a.com',
+            email='a@a.com',
+            password=self.password
+        )
+        models.User.objects.update(last_login=now)
+
+        later = now + timezone.timedelta(minutes=1)
+        buffer.touch(self.user.pk, later)
+        buffer.touch(self.user.pk, now)
+        buffer.touch(other.pk, later)
+        self.check(self.last_login(models.User, self.user.pk), now)
+
+        with CaptureQueriesContext(connection) as context:
+            self.check(buffer.flush(), 2)
+        self.check(len(context.captured_queries), 1)
+        self.check(self.last_login(models.User, self.user.pk), later)
+        self.check(self.last_login(models.User, other.pk), later)
+
+        buffer.touch(self.user.pk, now)
+        self.check(buffer.flush(), 1)
+        self.check(self.last_login(models.User, self.user.pk), later)
+        self.check(buffer.flush(), 0)
+
+    def test_device_seen(self):
+        past = timezone.now() - timezone.timedelta(days=1)
+        models.LoginDevice.objects.update(last_login=past, last_seen=past)
+
+        self.get('/api/accounts/setting/', auth=True)
+        self.status(200)
+        seen = self.last_seen()
+        self.check(seen > past)
+        self.check(
+            self.last_login(models.LoginDevice, self.login_device.pk), past
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            self.get('/api/accounts/setting/', auth=True)
+        self.check_not(any(
+            'accounts_logindevice' in query.get('sql') and
+            'SELECT' in query.get('sql')
+            for query in context.captured_queries
+        ))
+        self.check(self.last_seen() >= seen)
+
+    def test_device_id_forgotten(self):
+        key = tools.device_id_key(self.user, self.login_device.fingerprint)
+        self.get('/api/accounts/setting/', auth=True)
+        self.check(cache.get(key), self.login_device.pk)
+
+        self.post('/api/accounts/logout/', auth=True)
+        self.status(200)
+        self.check(cache.get(key), None)
+
+        self.get('/api/accounts/setting/', auth=True)
+        self.status(200)
+        self.check(cache.get(key), 0)
+
+        self.post(
+            '/api/accounts/login/',
+            {
+                'username': self.username,
+                'password': self.password
+            }
+        )
+        self.status(200)
+        self.check(cache.get(key), None)
+        self.login_device = models.LoginDevice.objects.get(
+            pk=self.data.get('login_device').get('id')
+        )
+
+        past = timezone.now() - timezone.timedelta(days=1)
+        models.LoginDevice.objects.update(last_seen=past)
+        self.get('/api/accounts/setting/', auth=True)
+        self.status(200)
+        self.check(self.last_seen() > past)
@@ -1,3 +1,10 @@
+import io
+import json
+import zipfile
+
+from unittest import mock
+
+from accounts import models, views
 from accounts.tests import TestCase
 from utils.constants import Const
 
@@ -132,6 +139,86 @@ class UserAdminTest(TestCase):
             self.response.headers.get('Content-Type'),
             Const.MIME_TYPE_XLSX
         )
+        self.check(b''.join(self.response.streaming_content))
+
+    def test_user_admin_export_stream(self):
+        for index in range(5):
+            models.User.objects.create_user(
+                username='user%d@a.com' % index,
+                email='user%d@a.com' % index,
+                password=self.password
+            )
+
+        with mock.patch.object(views.UserAdminExportViewSet, 'chunk_size', 2):
+            self.get(
+                '/api/admin/users/export/',
+                auth=True
+            )
+        self.status(200)
+        self.check(self.response.streaming)
+
+        content = b''.join(self.response.streaming_content)
+        with zipfile.ZipFile(io.BytesIO(content)) as xlsx:
+            sheet = xlsx.read('xl/worksheets/sheet1.xml').decode()
+
+        self.check(sheet.count('<row '), 8)
+        for index in range(5):
+            self.check_in('user%d@a.com' % index, sheet)
+
+    def test_user_admin_export_dump(self):
+        self.get(
+            '/api/admin/users/export/?format=csv',
+            auth=True
+        )
+        self.status(200)
+        self.check(self.response.streaming)
+        self.check(self.response['Content-Type'], Const.MIME_TYPE_CSV)
+
+        lines = b''.join(
+            self.response.streaming_content
+        ).decode().splitlines()
+        self.check(len(lines), 3)
+        self.check(lines[0].split(',')[0], 'id')
+        self.check(lines[1].split(',')[:2], [str(self.user_b.id), 'b@a.com'])
+
+        self.get(
+            '/api/admin/users/export/?format=ndjson&q=a@a.com',
+            auth=True
+        )
+        self.status(200)
+        lines = b''.join(
+            self.response.streaming_content
+        ).decode().splitlines()
+        self.check(len(lines), 1)
+        self.check(json.loads(lines[0]).get('id'), self.user_a.id)
+
+        self.get('/api/admin/users/export/?format=csv')
+        self.status(401)
+
+    def test_user_admin_export_dump_chunks(self):
+        calls = []
+
+        def make_data(view, key=None, index=0):
+            calls.append(len(key))
+            return [view.title] + [view.make_row(item) for item in key], []
+
+        with mock.patch.multiple(
+            views.UserAdminExportViewSet,
+            streaming=False,
+            chunk_size=1,
+            make_data=make_data
+        ):
+            self.get(
+                '/api/admin/users/export/?format=csv',
+                auth=True
+            )
+            self.status(200)
+            lines = b''.join(
+                self.response.streaming_content
+            ).decode().splitlines()
+
+        self.check(len(lines), 3)
+        self.check(calls, [1, 1])
 
     def test_users_admin_staff(self):
         self.get(
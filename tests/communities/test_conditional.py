@@ -0,0 +1,137 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from communities import tools
+from communities.tests import TestCase
+from utils.constants import Const
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        self.create_user(is_staff=True)
+        self.create_option(
+            permission_read=Const.PERMISSION_ALL,
+            permission_reply=Const.PERMISSION_ALL,
+        )
+        self.create_forum()
+        self.create_thread()
+        self.create_reply()
+        self.read = '/api/communities/f/%s/read/%d/' % (
+            self.forum.name, self.thread.id
+        )
+        self.replies = '/api/communities/f/%d/replies/' % self.thread.id
+
+    def etag(self, path, auth=True):
+        self.get(path, auth=auth)
+        self.status(200)
+        return self.response['ETag']
+
+    def poll(self, path, etag, auth=True):
+        with CaptureQueriesContext(connection) as context:
+            self.get(path, auth=auth, HTTP_IF_NONE_MATCH=etag)
+        return len(context.captured_queries)
+
+    def test_thread_not_modified(self):
+        etag = self.etag(self.read)
+        self.poll(self.read, etag)
+        self.status(304)
+        self.check(self.response.content, b'')
+        self.check(self.response['ETag'], etag)
+
+        tools.up_thread(self.thread, self.user)
+        self.poll(self.read, etag)
+        self.status(200)
+        self.check(self.data.get('up'), 1)
+        self.check_not(self.response['ETag'], etag)
+
+    def test_thread_files_and_author(self):
+        etag = self.etag(self.read)
+        self.post(
+            '/api/things/file/',
+            {
+                'file': self.file(name='word.doc')
+            },
+            format='multipart',
+            auth=True
+        )
+        self.post(
+            '/api/communities/f/%s/%d/file/' % (
+                self.forum.name, self.thread.id
+            ),
+            {
+                'files': [
+                    {
+                        'id': self.data.get('id')
+                    }
+                ]
+            },
+            auth=True
+        )
+        self.status(200)
+
+        self.poll(self.read, etag)
+        self.status(200)
+        self.check(len(self.data.get('files')), 1)
+        etag = self.response['ETag']
+
+        self.user.call_name = 'meow'
+        self.user.save()
+        self.poll(self.read, etag)
+        self.status(200)
+        self.check(self.data.get('user').get('call_name'), 'meow')
+
+    def test_replies_not_modified(self):
+        etag = self.etag(self.replies)
+        queries = self.poll(self.replies, etag)
+        self.status(304)
+        self.check(queries, 1)  # thread permission
+
+        self.post(
+            '/api/communities/f/%d/reply/' % self.thread.id,
+            {
+                'content': 'meow',
+            },
+            auth=True
+        )
+        self.status(201)
+        self.poll(self.replies, etag)
+        self.status(200)
+        self.check(len(self.data), 2)
+        etag = self.response['ETag']
+
+        self.delete('/api/communities/r/%d/' % self.reply.id, auth=True)
+        self.status(200)
+        self.poll(self.replies, etag)
+        self.status(200)
+        self.check(self.data[1].get('is_deleted'))
+
+    def test_replies_vote_flips(self):
+        author = self.user
+        up = self.create_user(username='up@a.com')
+        down = self.create_user(username='down@a.com')
+        tools.up_reply(self.reply, up)
+        tools.down_reply(self.reply, down)
+
+        self.user = author
+        etag = self.etag(self.replies)
+        self.poll(self.replies, etag)
+        self.status(304)
+
+        tools.down_reply(self.reply, up)
+        tools.up_reply(self.reply, down)
+        self.poll(self.replies, etag)
+        self.status(200)
+        self.check(self.data[0].get('up'), 1)
+        self.check(self.data[0].get('down'), 1)
+
+    def test_etag_per_user(self):
+        etag = self.etag(self.read)
+        self.poll(self.read, etag, auth=False)
+        self.status(200)
+        self.check(self.data.get('editable'), False)
+
+        anonymous = self.response['ETag']
+        self.poll(self.read, anonymous, auth=False)
+        self.status(304)
+        self.poll(self.read, anonymous)
+        self.status(200)
@@ -0,0 +1,77 @@
+from django.db import connection
+from django.test import override_settings
+
+from communities import models
+from communities.tests import TestCase
+
+
+class CountStrategyTest(TestCase):
+    def setUp(self):
+        self.create_user(is_staff=True)
+        self.create_option()
+        self.create_forum()
+
+        for index in range(5):
+            self.create_thread(title='thread %d' % index)
+
+    def pagination(self):
+        return self.response.data.get('pagination')
+
+    def test_cached_count(self):
+        path = '/api/communities/f/%s/' % self.forum.name
+
+        self.get(path, auth=True)
+        self.status(200)
+        self.check(self.pagination().get('item_total'), 5)
+        self.check(self.pagination().get('item_total_exact'), True)
+
+        self.delete(
+            '/api/communities/f/%s/%d/' % (self.forum.name, self.thread.id),
+            auth=True
+        )
+        self.status(200)
+
+        self.get(path, auth=True)
+        self.check(self.pagination().get('item_total'), 4)
+
+        models.Thread.objects.create(forum=self.forum, title='stale')
+        self.get(path, {'page_size': 2}, auth=True)
+        self.check(self.pagination().get('item_total'), 4)
+
+        self.get(path, {'page_size': 2, 'page': 3}, auth=True)
+        self.status(200)
+        self.check(len(self.data.get('threads')), 1)
+        self.check(self.pagination().get('item_total'), 5)
+
+    @override_settings(REST_PAGINATION_COUNT_CAP=3)
+    def test_capped_count(self):
+        self.get('/api/admin/threads/', {'page_size': 2}, auth=True)
+        self.status(200)
+        self.check(self.pagination().get('item_total'), 3)
+        self.check(self.pagination().get('item_total_exact'), False)
+        self.check(bool(self.pagination().get('next_link')), True)
+
+        self.get('/api/admin/threads/', {'page_size': 2, 'page': 3}, auth=True)
+        self.status(200)
+        self.check(len(self.data), 1)
+        self.check(self.pagination().get('item_total'), 5)
+        self.check(self.pagination().get('item_total_exact'), True)
+        self.check_not(self.pagination().get('next_link'))
+
+        self.get('/api/admin/threads/', {'page_size': 2, 'page': 4}, auth=True)
+        self.status(404)
+
+        self.get('/api/admin/threads/', {'q': 'thread 1'}, auth=True)
+        self.status(200)
+        self.check(self.pagination().get('item_total'), 1)
+        self.check(self.pagination().get('item_total_exact'), True)
+
+    @override_settings(REST_PAGINATION_COUNT_CAP=3)
+    def test_estimate_count(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE %s' % models.Thread._meta.db_table)
+
+        self.get('/api/admin/threads/', {'page_size': 2}, auth=True)
+        self.status(200)
+        self.check(self.pagination().get('item_total'), 5)
+        self.check(self.pagination().get('item_total_exact'), False)
@@ -0,0 +1,97 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from communities import models, tools
+from communities.tests import TestCase
+
+
+class ThreadCounterTest(TestCase):
+    def setUp(self):
+        self.create_user(is_staff=True)
+        self.create_option()
+        self.create_forum()
+        self.create_thread(name='tester')
+
+    def test_vote_counter(self):
+        self.post(
+            '/api/communities/f/%s/up/%d/' % (self.forum.name, self.thread.id),
+            auth=True
+        )
+        self.status(200)
+        self.thread.refresh_from_db()
+        self.check(self.thread.up_count, 1)
+        self.check(self.thread.down_count, 0)
+
+        self.post(
+            '/api/communities/f/%s/down/%d/' % (
+                self.forum.name, self.thread.id
+            ),
+            auth=True
+        )
+        self.status(200)
+        self.thread.refresh_from_db()
+        self.check(self.thread.up_count, 0)
+        self.check(self.thread.down_count, 1)
+
+        self.post(
+            '/api/communities/f/%s/down/%d/' % (
+                self.forum.name, self.thread.id
+            ),
+            auth=True
+        )
+        self.status(200)
+        self.thread.refresh_from_db()
+        self.check(self.thread.up_count, 0)
+        self.check(self.thread.down_count, 0)
+
+    def test_reply_counter(self):
+        self.post(
+            '/api/communities/f/%d/reply/' % self.thread.id,
+            {
+                'content': 'test'
+            },
+            auth=True
+        )
+        self.status(201)
+        reply_id = self.data.get('id')
+        self.thread.refresh_from_db()
+        self.check(self.thread.reply_count(), 1)
+
+        self.delete(
+            '/api/communities/r/%d/' % reply_id,
+            auth=True
+        )
+        self.status(200)
+        self.thread.refresh_from_db()
+        self.check(self.thread.reply_count(), 0)
+
+        self.delete(
+            '/api/communities/r/%d/' % reply_id,
+            auth=True
+        )
+        self.thread.refresh_from_db()
+        self.check(self.thread.reply_count(), 0)
+
+    def test_sync_counters(self):
+        self.create_reply(up_users=[self.user])
+        self.create_reply(is_deleted=True)
+
+        models.Thread.objects.filter(pk=self.thread.id).update(
+            up_count=7,
+            active_reply_count=0
+        )
+        models.Reply.objects.filter(pk=self.reply.id).update(down_count=3)
+
+        self.check(tools.sync_thread_counters(chunk_size=1), 1)
+        self.check(tools.sync_reply_counters(chunk_size=1), 1)
+        self.check(tools.sync_thread_counters(), 0)
+
+        self.thread.refresh_from_db()
+        self.check(self.thread.up_count, 0)
+        self.check(self.thread.reply_count(), 1)
+
+        models.Thread.objects.filter(pk=self.thread.id).update(down_count=2)
+        call_command('sync_forum_counters', stdout=StringIO())
+        self.thread.refresh_from_db()
+        self.check(self.thread.down_count, 0)
@@ -0,0 +1,98 @@
+from communities.tests import TestCase
+
+
+class CursorPaginationTest(TestCase):
+    def setUp(self):
+        self.create_user(is_staff=True)
+        self.create_option()
+        self.create_forum()
+
+        self.threads = []
+        for index in range(7):
+            self.threads.append(
+                self.create_thread(
+                    title='thread %d' % index,
+                    is_pinned=bool(index in [1, 4])
+                )
+            )
+
+    def ids(self):
+        return [thread.get('id') for thread in self.data.get('threads')]
+
+    def pagination(self):
+        return self.response.data.get('pagination')
+
+    def test_thread_cursor(self):
+        path = '/api/communities/f/%s/' % self.forum.name
+
+        self.get(path, {'page_size': 7}, auth=True)
+        self.status(200)
+        expected = self.ids()
+        self.check(expected[:2], [self.threads[4].id, self.threads[1].id])
+
+        self.get(path, {'cursor': '', 'page_size': 3}, auth=True)
+        self.status(200)
+        self.check(self.ids(), expected[:3])
+        self.check_not(self.pagination().get('item_total'))
+        self.check_not(self.pagination().get('prev_link'))
+        next_cursor = self.pagination().get('next_cursor')
+
+        self.get(path, {'cursor': next_cursor, 'page_size': 3}, auth=True)
+        self.status(200)
+        self.check(self.ids(), expected[3:6])
+        self.check(bool(self.pagination().get('first_link')), True)
+        prev_cursor = self.pagination().get('prev_cursor')
+        next_cursor = self.pagination().get('next_cursor')
+
+        self.get(path, {'cursor': next_cursor, 'page_size': 3}, auth=True)
+        self.status(200)
+        self.check(self.ids(), expected[6:])
+        self.check_not(self.pagination().get('next_cursor'))
+
+        self.get(path, {'cursor': prev_cursor, 'page_size': 3}, auth=True)
+        self.status(200)
+        self.check(self.ids(), expected[:3])
+        self.check_not(self.pagination().get('prev_cursor'))
+        self.check(bool(self.pagination().get('next_cursor')), True)
+
+        self.get(path, {'cursor': 'moo', 'page_size': 3}, auth=True)
+        self.status(400)
+
+    def test_search_cursor(self):
+        self.get(
+            '/api/communities/f/%s/' % self.forum.name,
+            {'q': 'thread', 'cursor': '', 'page_size': 3},
+            auth=True
+        )
+        ids = []
+        for _ in range(len(self.threads)):
+            self.status(200)
+            ids += self.ids()
+            next_link = self.pagination().get('next_link')
+            if not next_link:
+                break
+            self.get(next_link, auth=True)
+
+        self.check(len(ids), len(self.threads))
+        self.check(set(ids), {thread.id for thread in self.threads})
+
+    def test_reply_cursor(self):
+        self.create_reply(thread=self.threads[0])
+        first = self.reply
+        self.create_reply(thread=self.threads[0])
+        self.create_reply(thread=self.threads[0], reply_id=first.id)
+        path = '/api/communities/f/%d/replies/' % self.threads[0].id
+
+        self.get(path, auth=True)
+        self.status(200)
+        expected = [reply.get('id') for reply in self.data]
+
+        self.get(path, {'cursor': '', 'page_size': 2}, auth=True)
+        self.status(200)
+        ids = [reply.get('id') for reply in self.data]
+        next_cursor = self.pagination().get('next_cursor')
+
+        self.get(path, {'cursor': next_cursor, 'page_size': 2}, auth=True)
+        self.status(200)
+        ids += [reply.get('id') for reply in self.data]
+        self.check(ids, expected)
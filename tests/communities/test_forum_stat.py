@@ -0,0 +1,102 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from communities import models, tools
+from communities.tests import TestCase
+from utils import bot
+
+
+class ForumStatTest(TestCase):
+    def setUp(self):
+        self.create_user(is_staff=True)
+        self.create_option()
+        self.create_forum()
+
+    def forum_data(self):
+        self.get('/api/communities/forums/', auth=True)
+        self.status(200)
+        return self.data[0]
+
+    def test_forum_stat_writes(self):
+        self.post(
+            '/api/communities/f/%s/write/' % self.forum.name,
+            {
+                'title': 'hello',
+                'content': 'kitty',
+            },
+            auth=True
+        )
+        self.status(201)
+        thread_id = self.data.get('id')
+
+        stat = models.ForumStat.objects.get(forum=self.forum)
+        self.check(stat.thread_count, 1)
+
+        self.post(
+            '/api/communities/f/%d/reply/' % thread_id,
+            {
+                'content': 'meow'
+            },
+            auth=True
+        )
+        self.status(201)
+        reply_id = self.data.get('id')
+
+        self.delete('/api/communities/r/%d/' % reply_id, auth=True)
+        self.delete('/api/communities/r/%d/' % reply_id, auth=True)
+        self.delete(
+            '/api/communities/f/%s/%d/' % (self.forum.name, thread_id),
+            auth=True
+        )
+        self.status(200)
+
+        data = self.forum_data()
+        self.check(data.get('thread_count'), 0)
+        self.check(data.get('reply_count'), 1)
+        self.check(data.get('deleted_thread_count'), 1)
+
+        stat.refresh_from_db()
+        self.check(stat.deleted_reply_count, 1)
+        self.check(
+            stat.last_activity_at,
+            models.Reply.objects.get(pk=reply_id).created_at
+        )
+        self.check(tools.sync_forum_stats(), 0)
+
+    def test_forum_stat_sync(self):
+        self.create_thread()
+        self.create_reply()
+        deleted = self.create_thread(is_deleted=True)
+
+        self.check(models.ForumStat.objects.count(), 0)
+        self.check(tools.sync_forum_stats(), 1)
+
+        stat = models.ForumStat.objects.get(forum=self.forum)
+        self.check(stat.thread_count, 1)
+        self.check(stat.reply_count, 1)
+        self.check(stat.deleted_thread_count, 1)
+        self.check(stat.last_activity_at, deleted.created_at)
+
+        models.ForumStat.objects.update(thread_count=9)
+        bot.daily_task()
+        stat.refresh_from_db()
+        self.check(stat.thread_count, 1)
+
+    def test_forum_list_queries(self):
+        tools.sync_forum_stats()
+        self.forum_data()
+
+        with CaptureQueriesContext(connection) as context:
+            self.forum_data()
+        queries = len(context.captured_queries)
+
+        for name in ['black', 'white', 'red']:
+            self.create_forum(name=name)
+            self.create_thread()
+            self.create_reply()
+        tools.sync_forum_stats()
+
+        with CaptureQueriesContext(connection) as context:
+            self.forum_data()
+        self.check(len(context.captured_queries), queries)
+        self.check(self.data[0].get('reply_count'), 1)
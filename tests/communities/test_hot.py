@@ -0,0 +1,81 @@
+from django.utils import timezone
+
+from accounts.models import User
+from communities import models, tools
+from communities.tests import TestCase
+from utils import bot
+from utils.constants import Const
+
+
+class HotScoreTest(TestCase):
+    def setUp(self):
+        self.create_user(is_staff=True)
+        self.create_option()
+        self.create_forum()
+
+    def hot_ids(self):
+        self.get(
+            '/api/communities/f/%s/?sort=%s' % (
+                self.forum.name, Const.QUERY_PARAM_SORT_HOT
+            ),
+            auth=True
+        )
+        self.status(200)
+        return [thread.get('id') for thread in self.data.get('threads')]
+
+    def test_hot_events(self):
+        quiet = self.create_thread(name='tester')
+        voted = self.create_thread(name='tester')
+        replied = self.create_thread(name='tester')
+        self.check(self.hot_ids(), [replied.id, voted.id, quiet.id])
+
+        tools.up_thread(voted, self.user)
+        self.check(self.hot_ids(), [voted.id, replied.id, quiet.id])
+
+        self.post(
+            '/api/communities/f/%d/reply/' % replied.id,
+            {
+                'content': 'meow'
+            },
+            auth=True
+        )
+        self.status(201)
+        self.check(self.hot_ids(), [replied.id, voted.id, quiet.id])
+
+        tools.down_thread(voted, self.user)
+        self.check(self.hot_ids(), [replied.id, quiet.id, voted.id])
+
+    def test_hot_decay(self):
+        now = timezone.now()
+        voters = [
+            User.objects.create_user(
+                username='voter%d@a.com' % index,
+                email='voter%d@a.com' % index,
+                password=self.password
+            )
+            for index in range(3)
+        ]
+
+        old = self.create_thread(up_users=voters)
+        models.Thread.objects.filter(pk=old.pk).update(
+            created_at=now - timezone.timedelta(hours=30)
+        )
+        fresh = self.create_thread(up_users=voters[:1])
+        stale = self.create_thread(up_users=voters)
+        models.Thread.objects.filter(pk=stale.pk).update(
+            created_at=now - timezone.timedelta(
+                days=Const.HOT_WINDOW_DAYS + 1
+            ),
+            hot_score=100
+        )
+
+        self.check(tools.sync_hot_scores(chunk_size=1), 2)
+        self.check(self.hot_ids(), [fresh.id, old.id, stale.id])
+
+        stale.refresh_from_db()
+        self.check(stale.hot_score, 0)
+
+        models.Thread.objects.update(hot_score=0)
+        bot.minute_task()
+        old.refresh_from_db()
+        self.check(old.hot_score > 0)
@@ -0,0 +1,108 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from communities import models, tools
+from communities.tests import TestCase
+from utils.constants import Const
+
+
+class ModerationTest(TestCase):
+    def setUp(self):
+        self.create_user(is_staff=True)
+        self.create_option()
+        self.create_forum()
+        self.spams = [self.create_thread(name='spam') for _ in range(3)]
+        self.create_thread()
+        self.create_reply()
+        tools.sync_forum_stats()
+
+    def moderate(self, path, data):
+        self.post('/api/admin/%s/moderate/' % path, data, auth=True)
+        self.status(200)
+        return self.data.get('count')
+
+    def stat(self):
+        return models.ForumStat.objects.get(forum=self.forum)
+
+    def test_moderation_permission(self):
+        self.post('/api/admin/threads/moderate/', {
+            'action': Const.MODERATION_DELETE,
+            'anonymous': True,
+        })
+        self.status(401)
+
+        self.post('/api/admin/threads/moderate/', {
+            'action': Const.MODERATION_DELETE,
+        }, auth=True)
+        self.status(400)
+
+    def test_moderate_threads(self):
+        spam = {
+            'action': Const.MODERATION_DELETE,
+            'anonymous': True,
+        }
+        self.get('/api/admin/threads/', auth=True)
+        with CaptureQueriesContext(connection) as context:
+            self.check(self.moderate('threads', spam), 3)
+        queries = len(context.captured_queries)
+
+        self.check(self.stat().thread_count, 1)
+        self.check(self.stat().deleted_thread_count, 3)
+        self.check(self.moderate('threads', spam), 0)
+
+        self.create_thread(name='spam')
+        tools.sync_forum_stats()
+        with CaptureQueriesContext(connection) as context:
+            self.check(self.moderate('threads', {
+                'action': Const.MODERATION_DELETE,
+                'ids': [self.thread.id],
+            }), 1)
+        self.check(len(context.captured_queries), queries)
+
+        self.check(self.moderate('threads', {
+            'action': Const.MODERATION_RESTORE,
+            'ids': [self.spams[0].id],
+            'since': timezone.now() - timezone.timedelta(hours=1),
+        }), 1)
+        self.check(self.stat().thread_count, 2)
+        self.check(tools.sync_forum_stats(), 0)
+
+        self.check(self.moderate('threads', {
+            'action': Const.MODERATION_PIN,
+            'user': self.user.id,
+        }), 1)
+        self.check(
+            list(models.Thread.objects.filter(
+                is_pinned=True
+            ).values_list('id', flat=True)),
+            [self.reply.thread_id]
+        )
+        self.check(self.moderate('threads', {
+            'action': Const.MODERATION_UNPIN,
+            'user': self.user.id,
+        }), 1)
+
+    def test_moderate_replies(self):
+        thread = self.thread
+        self.create_reply(name='spam')
+        self.create_reply(name='spam', thread=self.spams[0])
+        tools.sync_forum_stats()
+
+        self.check(self.moderate('replies', {
+            'action': Const.MODERATION_DELETE,
+            'anonymous': True,
+        }), 2)
+        self.check(
+            models.Thread.objects.get(pk=thread.pk).reply_count(),
+            1
+        )
+        self.check(self.stat().deleted_reply_count, 2)
+        self.check(tools.sync_thread_counters(), 0)
+
+        self.check(self.moderate('replies', {
+            'action': Const.MODERATION_RESTORE,
+            'ids': [self.reply.id],
+        }), 1)
+        self.check(self.stat().deleted_reply_count, 1)
+        self.check(tools.sync_forum_stats(), 0)
@@ -0,0 +1,63 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import User
+from communities.tests import TestCase
+
+
+class QueryPlanTest(TestCase):
+    def setUp(self):
+        self.create_user(is_staff=True)
+        self.create_option()
+        self.create_forum()
+
+    def count_queries(self, path):
+        with CaptureQueriesContext(connection) as context:
+            self.get(path, auth=True)
+            self.status(200)
+        return len(context.captured_queries)
+
+    def create_threads(self, count):
+        for index in range(count):
+            username = 'writer%d@a.com' % User.objects.count()
+            user = User.objects.create_user(
+                username=username,
+                email=username,
+                password=self.password
+            )
+            self.create_thread(user=user)
+            self.create_reply(user=user)
+
+    def test_thread_list(self):
+        path = '/api/communities/f/%s/' % self.forum.name
+
+        self.count_queries(path)
+        self.create_threads(2)
+        queries = self.count_queries(path)
+
+        self.create_threads(8)
+        self.check(self.count_queries(path), queries)
+        self.check(len(self.data.get('threads')), 10)
+
+    def test_admin_lists(self):
+        self.count_queries('/api/admin/threads/')
+        self.create_threads(2)
+        threads = self.count_queries('/api/admin/threads/')
+        replies = self.count_queries('/api/admin/replies/')
+
+        self.create_threads(8)
+        self.check(self.count_queries('/api/admin/threads/'), threads)
+        self.check(self.data[0].get('forum_name'), self.forum.name)
+        self.check(self.count_queries('/api/admin/replies/'), replies)
+        self.check(self.data[0].get('forum_name'), self.forum.name)
+
+    def test_defer_content(self):
+        self.create_threads(1)
+
+        with CaptureQueriesContext(connection) as context:
+            self.get('/api/communities/f/%s/' % self.forum.name, auth=True)
+        self.check(
+            any('"content"' in query.get('sql')
+                for query in context.captured_queries),
+            False
+        )
@@ -0,0 +1,69 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from communities.tests import TestCase
+
+
+class ForumRegistryTest(TestCase):
+    def setUp(self):
+        self.create_user(is_staff=True)
+        self.create_option()
+        self.create_forum()
+        self.create_thread()
+
+    def forum_queries(self, path):
+        with CaptureQueriesContext(connection) as context:
+            self.get(path, auth=True)
+            self.status(200)
+
+        return [
+            query for query in context.captured_queries
+            if 'communities_forum' in query.get('sql')
+        ]
+
+    def test_no_forum_query(self):
+        paths = [
+            '/api/communities/f/%s/' % self.forum.name,
+            '/api/communities/f/%s/read/%d/' % (
+                self.forum.name, self.thread.id
+            ),
+            '/api/communities/f/%d/replies/' % self.thread.id,
+        ]
+
+        for path in paths:
+            self.get(path, auth=True)
+
+        for path in paths:
+            self.check(self.forum_queries(path), [])
+
+        self.check(self.data, [])
+        self.get(paths[1], auth=True)
+        self.check(self.data.get('forum').get('name'), self.forum.name)
+        self.check(
+            self.data.get('forum').get('managers')[0].get('id'),
+            self.user.id
+        )
+
+    def test_forum_update(self):
+        path = '/api/communities/f/%s/' % self.forum.name
+        self.get(path, auth=True)
+        self.check(self.data.get('forum').get('title'), self.forum.title)
+
+        self.patch(
+            '/api/communities/forum/%d/' % self.forum.id,
+            {
+                'title': 'Smol',
+            },
+            auth=True
+        )
+        self.status(200)
+
+        self.check(len(self.forum_queries(path)), 2)
+        self.check(self.data.get('forum').get('title'), 'Smol')
+
+        self.delete(
+            '/api/communities/forum/%d/' % self.forum.id,
+            auth=True
+        )
+        self.get(path, auth=True)
+        self.status(404)
@@ -348,6 +348,25 @@ class ReplyModelTest(TestCase):
         )
         self.check(self.data.get('threads')[0].get('reply_count'), 4)
 
+    def test_reply_root(self):
+        first = self.reply
+        second = self.create_reply()
+        nested = self.create_reply(reply_id=first.id)
+
+        self.check(first.root_id, first.id)
+        self.check(second.root_id, second.id)
+        self.check(nested.root_id, first.id)
+
+        self.get(
+            '/api/communities/f/%d/replies/' % self.thread.id,
+            auth=True
+        )
+        self.status(200)
+        self.check(
+            [reply.get('id') for reply in self.data],
+            [second.id, first.id, nested.id]
+        )
+
     def test_reply_edit_delete(self):
         self.patch(
             '/api/communities/r/%d/' % self.reply.id,
@@ -0,0 +1,205 @@
+import threading
+
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.response import Response
+
+from communities import models, tools
+from communities.tests import TestCase
+from core import cache as cache_module
+from core.cache import ResponseCache
+from utils.constants import Const
+
+
+class ResponseCacheTest(TestCase):
+    def setUp(self):
+        self.create_user(is_staff=True)
+        self.create_option(
+            permission_list=Const.PERMISSION_ALL,
+            permission_read=Const.PERMISSION_ALL,
+            permission_write=Const.PERMISSION_ALL,
+            permission_reply=Const.PERMISSION_ALL,
+        )
+        self.create_forum()
+        self.create_thread()
+        self.path = '/api/communities/f/%s/' % self.forum.name
+
+    def count_queries(self, path, auth=False):
+        with CaptureQueriesContext(connection) as context:
+            self.get(path, auth=auth)
+            self.status(200)
+        return len(context.captured_queries)
+
+    def test_anonymous_cache(self):
+        paths = [
+            self.path,
+            '/api/communities/f/%s/read/%d/' % (
+                self.forum.name, self.thread.id
+            ),
+        ]
+
+        for path in paths:
+            self.check_not(self.count_queries(path), 0)
+            self.check(self.count_queries(path), 0)
+
+        replies = '/api/communities/f/%d/replies/' % self.thread.id
+        self.count_queries(replies)
+        self.check(self.count_queries(replies), 1)  # thread permission
+
+        self.check_not(self.count_queries(self.path + '?page=1'), 0)
+        self.check_not(self.count_queries(self.path, auth=True), 0)
+
+    def test_write_bumps_generation(self):
+        self.get(self.path)
+        self.check(len(self.data.get('threads')), 1)
+
+        self.post(
+            '/api/communities/f/%s/write/' % self.forum.name,
+            {
+                'name': 'tester',
+                'title': 'hello',
+                'content': 'kitty',
+            }
+        )
+        self.status(201)
+        self.get(self.path)
+        self.check(len(self.data.get('threads')), 2)
+
+        self.post(
+            '/api/communities/f/%d/reply/' % self.thread.id,
+            {
+                'name': 'tester',
+                'content': 'meow',
+            }
+        )
+        self.status(201)
+        self.get('/api/communities/f/%d/replies/' % self.thread.id)
+        self.check(len(self.data), 1)
+
+        models.Thread.objects.filter(pk=self.thread.pk).update(hot_score=1)
+        self.get(self.path)
+        self.check(self.data.get('threads')[1].get('id'), self.thread.id)
+        tools.touch_forum(self.forum.id)
+        self.get(self.path + '?sort=%s' % Const.QUERY_PARAM_SORT_HOT)
+        self.check(self.data.get('threads')[0].get('id'), self.thread.id)
+
+    def test_tools_bump_generation(self):
+        read = '/api/communities/f/%s/read/%d/' % (
+            self.forum.name, self.thread.id
+        )
+        replies = '/api/communities/f/%d/replies/' % self.thread.id
+
+        def thread():
+            self.get(self.path)
+            self.status(200)
+            return self.data.get('threads')[0]
+
+        self.check_not(thread().get('is_pinned'))
+        tools.pin_thread(self.thread)
+        self.check(thread().get('is_pinned'))
+        tools.unpin_thread(self.thread)
+        self.check_not(thread().get('is_pinned'))
+
+        tools.up_thread(self.thread, self.user)
+        self.check(thread().get('up'), 1)
+        tools.update_vote_count(self.thread, down=1)
+        self.check(thread().get('down'), 1)
+        self.get(read)
+        self.check(self.data.get('up'), 1)
+        self.check(self.data.get('down'), 1)
+
+        tools.delete_thread(self.thread)
+        self.get(self.path)
+        self.check(len(self.data.get('threads')), 0)
+        tools.restore_thread(self.thread)
+        self.check(thread().get('id'), self.thread.id)
+
+        self.create_reply()
+        self.get(replies)
+        self.check(self.data[0].get('up'), 0)
+        tools.up_reply(self.reply, self.user)
+        self.get(replies)
+        self.check(self.data[0].get('up'), 1)
+        tools.update_vote_count(self.reply, down=1)
+        self.get(replies)
+        self.check(self.data[0].get('down'), 1)
+
+        tools.delete_reply(self.reply)
+        self.get(replies)
+        self.check(len(self.data), 0)
+
+    def test_hot_bucket(self):
+        hot = self.path + '?sort=%s' % Const.QUERY_PARAM_SORT_HOT
+        first = self.thread
+        self.create_thread()
+        self.thread = first
+        self.get(hot)
+        self.check_not(self.data.get('threads')[0].get('id'), self.thread.id)
+
+        tools.sync_hot_scores()
+        models.Thread.objects.filter(pk=self.thread.pk).update(hot_score=1)
+        self.get(hot)
+        self.check_not(self.data.get('threads')[0].get('id'), self.thread.id)
+
+        with mock.patch.object(
+            tools, 'hot_bucket', return_value=tools.hot_bucket() + 1
+        ):
+            self.get(hot)
+        self.check(self.data.get('threads')[0].get('id'), self.thread.id)
+
+    def test_authenticated_fields(self):
+        read = '/api/communities/f/%s/read/%d/' % (
+            self.forum.name, self.thread.id
+        )
+        self.get(read)
+        self.check(self.data.get('editable'), False)
+
+        self.get(read, auth=True)
+        self.check(self.data.get('editable'), True)
+
+    def test_coalesced_misses(self):
+        response_cache = ResponseCache()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def handler():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return Response({'cat': 'meow'})
+
+        def worker():
+            results.append(response_cache.get('meow', handler))
+
+        waiting = threading.Semaphore(0)
+        flight_event = threading.Event
+
+        def counted_event():
+            event = flight_event()
+            wait = event.wait
+
+            def counted_wait(*args, **kwargs):
+                waiting.release()
+                return wait(*args, **kwargs)
+
+            event.wait = counted_wait
+            return event
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        with mock.patch.object(cache_module.threading, 'Event', counted_event):
+            threads[0].start()
+            started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads[1:]:
+            waiting.acquire()
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.check(len(calls), 1)
+        self.check(results, [({'cat': 'meow'}, 200, {})] * 4)
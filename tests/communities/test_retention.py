@@ -0,0 +1,120 @@
+from unittest import mock
+
+from django.conf import settings
+from django.db import OperationalError
+from django.utils import timezone
+
+from accounts.models import AuthCode, LoginDevice
+from communities import models
+from communities.tests import TestCase
+from contents.models import Blog, Comment
+from core import retention
+from things.models import Attachment
+from utils import bot
+
+
+class RetentionTest(TestCase):
+    def setUp(self):
+        self.create_user(is_staff=True)
+        self.create_option()
+        self.create_forum()
+        self.past = timezone.now() - timezone.timedelta(
+            days=settings.RETENTION_TRASH_DAYS + 1
+        )
+
+    def test_retention_task(self):
+        live = self.create_thread()
+        live_reply = self.create_reply()
+        parent = self.create_reply(is_deleted=True)
+        child = self.create_reply(reply_id=parent.id, is_deleted=True)
+        recent = self.create_reply(is_deleted=True)
+        trashed = self.create_thread(is_deleted=True)
+        self.create_reply(thread=trashed)
+        models.Reply.objects.filter(
+            pk__in=[parent.pk, child.pk]
+        ).update(modified_at=self.past)
+        models.Thread.objects.filter(pk=trashed.pk).update(
+            created_at=self.past
+        )
+
+        blog = Blog.objects.create(user=self.user, title='meow')
+        comment = Comment.objects.create(
+            blog=blog, user=self.user, is_deleted=True, modified_at=self.past
+        )
+
+        AuthCode.objects.create(email=self.user.username, code='000000')
+        AuthCode.objects.update(created_at=self.past)
+        LoginDevice.objects.create(user=self.user, device='PC')
+        LoginDevice.objects.create(
+            user=self.user,
+            device='Phone',
+            last_seen=timezone.now() - timezone.timedelta(
+                days=settings.RETENTION_LOGIN_DEVICE_DAYS + 1
+            )
+        )
+
+        with mock.patch.object(settings, 'RETENTION_BATCH_SIZE', 1):
+            deleted = bot.retention_task()
+
+        self.check(deleted.get('communities.Thread'), 1)
+        self.check(deleted.get('communities.Reply'), 3)
+        self.check(deleted.get('contents.Comment'), 1)
+        self.check(deleted.get('accounts.AuthCode'), 1)
+        self.check(deleted.get('accounts.LoginDevice'), 1)
+
+        self.check(
+            set(models.Reply.objects.values_list('pk', flat=True)),
+            {live_reply.pk, recent.pk}
+        )
+        self.check(models.Thread.objects.filter(pk=live.pk).exists())
+        self.check_not(Comment.objects.filter(pk=comment.pk).exists())
+        self.check(LoginDevice.objects.get().device, 'PC')
+
+        self.check(bot.retention_task(), {})
+
+    def test_retention_attachments(self):
+        owned, shared, image = [
+            Attachment.objects.create(file=self.file(name='%s.txt' % name))
+            for name in ['owned', 'shared', 'image']
+        ]
+        live = self.create_thread()
+        live.files.add(shared)
+        trashed = self.create_thread(is_deleted=True)
+        trashed.files.add(owned, shared, image)
+        Blog.objects.create(user=self.user, title='meow', image=image)
+        models.Thread.objects.filter(pk=trashed.pk).update(
+            modified_at=self.past
+        )
+        storage, name = owned.file.storage, owned.file.name
+        self.check(storage.exists(name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            deleted = bot.retention_task()
+
+        self.check(deleted.get('communities.Thread'), 1)
+        self.check(
+            set(Attachment.objects.values_list('pk', flat=True)),
+            {shared.pk, image.pk}
+        )
+        self.check_not(storage.exists(name))
+
+    def test_retention_backoff(self):
+        self.create_thread(is_deleted=True)
+        models.Thread.objects.update(modified_at=self.past)
+        policy = retention.RetentionPolicy(
+            models.Thread,
+            settings.RETENTION_TRASH_DAYS,
+            fields=['modified_at']
+        )
+
+        with mock.patch.object(
+            retention,
+            'delete_batch',
+            side_effect=OperationalError('lock timeout')
+        ) as delete_batch:
+            self.check(retention.purge(policy, retries=2), {})
+        self.check(delete_batch.call_count, 3)
+
+        policy.days = 0
+        self.check(retention.purge(policy), {})
+        self.check(models.Thread.objects.count(), 1)
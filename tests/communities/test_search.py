@@ -0,0 +1,137 @@
+from communities.models import Thread
+from communities.tests import TestCase
+from core.search import (
+    text_search,
+    to_query,
+    to_vector,
+)
+
+
+class SearchTokenTest(TestCase):
+    def test_korean_tokens(self):
+        vector = to_vector([('고양이가 귀엽다', 'A'), ('고양이', 'B')])
+        self.check_in("'고양이가':1A", vector)
+        self.check_in("'고양':1A", vector)
+        self.check_in("'고양이':1B", vector)
+
+        self.check(to_query('고양이'), "'고양' & '양이'")
+        self.check(to_query('고양'), "'고양'")
+        self.check(to_query('고'), "'고':*")
+        self.check(to_query("Cat's"), "'cat':* & 's':*")
+        self.check(to_query('!!'), '')
+
+    def test_suffix_tokens(self):
+        vector = to_vector([('Blacktiger', 'A')])
+        self.check_in("'blacktiger':1A", vector)
+        self.check_in("'tiger':1A", vector)
+        self.check_in("'ger':1A", vector)
+        self.check_not("'er':1A" in vector)
+
+
+class ThreadSearchTest(TestCase):
+    def setUp(self):
+        self.create_user(is_staff=True)
+        self.create_option()
+        self.create_forum()
+
+    def search(self, q):
+        self.get(
+            '/api/communities/f/%s/' % self.forum.name,
+            {'q': q},
+            auth=True
+        )
+        self.status(200)
+        return [thread.get('title') for thread in self.data.get('threads')]
+
+    def test_search_korean(self):
+        self.create_thread(title='강아지', content='고양이를 좋아한다')
+        self.create_thread(title='고양이가 귀엽다', content='냥')
+        self.create_thread(title='물고기', content='fish')
+
+        self.check(self.search('고양이'), ['고양이가 귀엽다', '강아지'])
+        self.check(self.search('귀엽'), ['고양이가 귀엽다'])
+        self.check(self.search('고양이 냥'), ['고양이가 귀엽다'])
+        self.check(self.search('!!'), [])
+
+    def test_search_rank(self):
+        self.create_thread(title='black', content='cat')
+        self.create_thread(title='white', content='black cat')
+        self.create_thread(title='black', content='dog')
+
+        threads = text_search(Thread.objects.all(), 'black')
+        self.check(
+            [thread.title for thread in threads],
+            ['black', 'black', 'white']
+        )
+        self.check(threads[0].id, self.thread.id)
+
+    def test_search_pinned(self):
+        self.create_thread(title='black', content='cat')
+        pinned = self.thread
+        self.create_thread(title='white', content='black cat')
+        Thread.objects.filter(id=pinned.id).update(is_pinned=True)
+
+        self.check(self.search('black'), ['black', 'white'])
+
+    def test_search_substring(self):
+        self.create_thread(title='blacktiger', content='cat')
+        self.create_thread(title='tiger', content='dog')
+        self.create_thread(title='white', content='catfish')
+
+        self.check(self.search('tiger'), ['tiger', 'blacktiger'])
+        self.check(self.search('fish'), ['white'])
+        self.check(self.search('acktig'), ['blacktiger'])
+
+    def test_search_bigram(self):
+        self.create_thread(title='줄무늬고양이', content='냥')
+        self.create_thread(title='물고기', content='고양이를 좋아한다')
+
+        self.check(self.search('양이'), ['물고기', '줄무늬고양이'])
+        self.check(self.search('무늬'), ['줄무늬고양이'])
+        self.check(self.search('좋아'), ['물고기'])
+
+    def test_search_update(self):
+        self.create_thread(title='hello', content='kitty')
+
+        self.patch(
+            '/api/communities/f/%s/%d/' % (self.forum.name, self.thread.id),
+            {'title': '안녕하세요'},
+            auth=True
+        )
+        self.status(200)
+
+        self.check(self.search('hello'), [])
+        self.check(self.search('안녕'), ['안녕하세요'])
+
+    def test_search_reply(self):
+        self.create_thread()
+        self.create_reply(content='나비야 이리 온')
+        self.create_reply(name='tester', user=None, content='meow')
+
+        self.get('/api/admin/replies/', {'q': '나비'}, auth=True)
+        self.status(200)
+        self.check(len(self.data), 1)
+
+        self.get('/api/admin/replies/', {'q': 'tester'}, auth=True)
+        self.check(len(self.data), 1)
+        self.check(self.data[0].get('content'), 'meow')
+
+    def test_search_author_rename(self):
+        self.create_thread(title='hello', content='kitty')
+        self.create_reply(content='meow')
+        self.check(self.search('b'), ['hello'])
+
+        self.get('/api/accounts/setting/', auth=True)
+        self.patch(
+            '/api/accounts/setting/',
+            {'call_name': 'Nabi'},
+            auth=True
+        )
+        self.status(200)
+
+        self.check(self.search('b'), [])
+        self.check(self.search('nabi'), ['hello'])
+
+        self.get('/api/admin/replies/', {'q': 'nabi'}, auth=True)
+        self.status(200)
+        self.check(len(self.data), 1)
@@ -0,0 +1,114 @@
+from accounts.models import User
+from communities import models, tools
+from communities.tests import TestCase
+from utils.constants import Const
+
+
+class VoteTest(TestCase):
+    def setUp(self):
+        self.create_user(is_staff=True)
+        self.create_option()
+        self.create_forum()
+        self.create_thread(name='tester')
+        self.create_reply(name='tester')
+
+    def test_vote_toggle(self):
+        tools.up_thread(self.thread, self.user)
+        self.check(self.thread.my_vote, Const.VOTE_UP)
+        self.check(self.thread.up_count, 1)
+
+        tools.down_thread(self.thread, self.user)
+        self.check(self.thread.my_vote, Const.VOTE_DOWN)
+        self.check(self.thread.up_count, 0)
+        self.check(self.thread.down_count, 1)
+        self.check(models.Vote.objects.filter(user=self.user).count(), 1)
+
+        tools.down_thread(self.thread, self.user)
+        self.check(self.thread.my_vote, Const.VOTE_NONE)
+        self.check(self.thread.down_count, 0)
+        self.check(models.Vote.objects.filter(user=self.user).count(), 0)
+
+    def test_vote_stale_instance(self):
+        stale = models.Thread.objects.get(pk=self.thread.pk)
+
+        tools.up_thread(self.thread, self.user)
+        tools.up_thread(stale, self.user)
+        self.check(stale.up_count, 0)
+        self.check(models.Vote.objects.filter(user=self.user).count(), 0)
+
+        tools.up_thread(self.thread, self.user)
+        models.Vote.objects.filter(user=self.user).delete()
+        tools.down_reply(self.reply, self.user)
+        tools.up_thread(stale, self.user)
+        self.check(
+            models.Vote.objects.filter(
+                user=self.user, thread=self.thread
+            ).count(),
+            1
+        )
+        self.check(stale.up_count, 2)
+
+        self.check(tools.sync_thread_counters(), 1)
+        self.check(tools.sync_reply_counters(), 0)
+
+    def test_my_votes(self):
+        other = models.Thread.objects.create(forum=self.forum, name='tester')
+        tools.up_thread(self.thread, self.user)
+        tools.down_reply(self.reply, self.user)
+
+        response = self.get(
+            '/api/communities/f/%s/' % self.forum.name,
+            auth=True
+        )
+        self.status(200)
+        threads = response.json()['data']['threads']
+        self.check(threads[0].get('id'), other.id)
+        self.check(threads[0].get('vote'), Const.VOTE_NONE)
+        self.check(threads[1].get('vote'), Const.VOTE_UP)
+
+        self.get(
+            '/api/communities/f/%d/replies/' % self.thread.id,
+            auth=True
+        )
+        self.status(200)
+        self.check(self.data[0].get('vote'), Const.VOTE_DOWN)
+
+        self.get(
+            '/api/communities/f/%s/read/%d/' % (
+                self.forum.name, self.thread.id
+            ),
+            auth=True
+        )
+        self.status(200)
+        self.check(self.data.get('vote'), Const.VOTE_UP)
+
+        User.objects.create_user(
+            username='voter@a.com',
+            email='voter@a.com',
+            password=self.password
+        )
+        self.check(
+            tools.annotate_votes(
+                list(models.Thread.objects.all()),
+                User.objects.get(username='voter@a.com')
+            )[0].my_vote,
+            Const.VOTE_NONE
+        )
+
+    def test_vote_api(self):
+        self.post(
+            '/api/communities/r/%d/up/' % self.reply.id,
+            auth=True
+        )
+        self.status(200)
+        self.check(self.data.get('up'), 1)
+        self.check(self.data.get('vote'), Const.VOTE_UP)
+
+        self.post(
+            '/api/communities/r/%d/down/' % self.reply.id,
+            auth=True
+        )
+        self.status(200)
+        self.check(self.data.get('up'), 0)
+        self.check(self.data.get('down'), 1)
+        self.check(self.data.get('vote'), Const.VOTE_DOWN)
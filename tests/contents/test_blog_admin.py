@@ -1,4 +1,5 @@
 from contents.tests import TestCase
+from utils.constants import Const
 
 
 class BlogAdminPermissionTest(TestCase):
@@ -408,3 +409,36 @@ class CommentAdminTest(TestCase):
         self.status(200)
         self.check(len(self.data), 1)
         self.check(self.data[0].get('id'), comment3.id)
+
+    def test_comment_moderation(self):
+        self.create_blog()
+        self.deleted_comment = self.create_comment(is_deleted=True)
+        self.create_comment()
+        self.create_comment(name='spam')
+        self.create_comment(name='spam')
+
+        self.post(
+            '/api/admin/comments/moderate/',
+            {
+                'action': Const.MODERATION_DELETE,
+                'anonymous': True,
+            },
+            auth=True
+        )
+        self.status(200)
+        self.check(self.data.get('count'), 2)
+
+        self.blog.refresh_from_db()
+        self.check(self.blog.comment_count(), 1)
+
+        self.post(
+            '/api/admin/comments/moderate/',
+            {
+                'action': Const.MODERATION_RESTORE,
+                'ids': [self.comment.id, self.deleted_comment.id],
+            },
+            auth=True
+        )
+        self.check(self.data.get('count'), 2)
+        self.blog.refresh_from_db()
+        self.check(self.blog.comment_count(), 3)
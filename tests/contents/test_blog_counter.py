@@ -0,0 +1,68 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from contents import models, tools
+from contents.tests import TestCase
+
+
+class BlogCounterTest(TestCase):
+    def setUp(self):
+        self.create_user(is_staff=True)
+        self.create_blog()
+
+    def test_comment_counter(self):
+        self.post(
+            '/api/contents/blogs/%d/comment/' % self.blog.id,
+            {
+                'content': 'test',
+            },
+            auth=True
+        )
+        self.status(201)
+        comment_id = self.data.get('id')
+        self.blog.refresh_from_db()
+        self.check(self.blog.comment_count(), 1)
+
+        self.delete(
+            '/api/admin/comments/%d/' % comment_id,
+            auth=True
+        )
+        self.status(200)
+        self.blog.refresh_from_db()
+        self.check(self.blog.comment_count(), 0)
+
+        self.post(
+            '/api/admin/comments/restore/%d/' % comment_id,
+            auth=True
+        )
+        self.status(200)
+        self.blog.refresh_from_db()
+        self.check(self.blog.comment_count(), 1)
+
+        self.post(
+            '/api/admin/comments/restore/%d/' % comment_id,
+            auth=True
+        )
+        self.blog.refresh_from_db()
+        self.check(self.blog.comment_count(), 1)
+
+    def test_sync_counters(self):
+        self.create_comment()
+        self.create_comment(is_deleted=True)
+
+        models.Blog.objects.filter(pk=self.blog.id).update(
+            active_comment_count=5
+        )
+        self.check(tools.sync_blog_counters(), 1)
+        self.check(tools.sync_blog_counters(), 0)
+
+        self.blog.refresh_from_db()
+        self.check(self.blog.comment_count(), 1)
+
+        models.Blog.objects.filter(pk=self.blog.id).update(
+            active_comment_count=0
+        )
+        call_command('sync_blog_counters', stdout=StringIO())
+        self.blog.refresh_from_db()
+        self.check(self.blog.comment_count(), 1)
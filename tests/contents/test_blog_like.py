@@ -167,3 +167,31 @@ class BlogLikeTest(TestCase):
         )
         self.check(self.data.get('like'), 1)
         self.check(self.data.get('liked'))
+
+    def test_blog_like_per_ip(self):
+        self.post(
+            '/api/contents/blogs/%d/like/' % self.blog.id,
+            REMOTE_ADDR='1.1.1.1'
+        )
+        self.status(200)
+
+        self.get(
+            '/api/contents/blogs/%d/' % self.blog.id,
+            REMOTE_ADDR='1.1.1.1'
+        )
+        self.status(200)
+        self.check(self.data.get('liked'))
+
+        self.get(
+            '/api/contents/blogs/%d/' % self.blog.id,
+            REMOTE_ADDR='2.2.2.2'
+        )
+        self.status(200)
+        self.check(self.data.get('like'), 1)
+        self.check_not(self.data.get('liked'))
+
+        self.get(
+            '/api/contents/blogs/%d/' % self.blog.id,
+            REMOTE_ADDR='1.1.1.1'
+        )
+        self.check(self.data.get('liked'))
@@ -1,3 +1,7 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from contents import models
 from contents.tests import TestCase
 from utils.constants import Const
 
@@ -94,3 +98,44 @@ class BlogOptionTest(TestCase):
         self.check(option.get('permission_write'), Const.PERMISSION_STAFF)
         self.check(option.get('permission_reply'), Const.PERMISSION_MEMBER)
         self.check(option.get('permission_vote'), Const.PERMISSION_ALL)
+
+    def test_blog_option_cache(self):
+        self.get('/api/contents/blogs/', auth=True)
+        self.status(200)
+
+        with CaptureQueriesContext(connection) as context:
+            self.get('/api/contents/blogs/', auth=True)
+            self.status(200)
+        self.check(
+            any('contents_blogoption' in query.get('sql')
+                for query in context.captured_queries),
+            False
+        )
+
+        self.patch(
+            '/api/contents/blog_option/',
+            {
+                'option': {
+                    'permission_list': Const.PERMISSION_STAFF
+                }
+            },
+            auth=True
+        )
+        self.status(200)
+
+        self.create_user(username='blogger@a.com')
+        self.get('/api/contents/blogs/', auth=True)
+        self.status(403)
+
+    def test_blog_option_cache_timeout(self):
+        timeout = models.blog_option_cache.timeout
+        models.blog_option_cache.timeout = 0
+        try:
+            self.check(
+                models.BlogOption.objects.get().title,
+                models.BlogOption.objects.load().title
+            )
+            models.BlogOption.objects.update(title='meow')
+            self.check(models.BlogOption.objects.get().title, 'meow')
+        finally:
+            models.blog_option_cache.timeout = timeout
@@ -416,3 +416,18 @@ class BlogReadTest(TestCase):
         )
         self.status(200)
         self.check_not(self.data.get('editable'))
+
+    def test_blog_read_not_modified(self):
+        path = '/api/contents/blogs/%d/' % self.blog.id
+        self.get(path)
+        self.status(200)
+        etag = self.response['ETag']
+
+        self.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.status(304)
+
+        self.post('/api/contents/blogs/%d/like/' % self.blog.id)
+        self.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.status(200)
+        self.check(self.data.get('like'), 1)
+        self.check(self.data.get('liked'))
@@ -0,0 +1,94 @@
+import io
+import zipfile
+
+from django.conf import settings
+from django.utils import timezone
+
+from things import models, tools
+from things.tests import TestCase
+from utils import bot
+from utils.constants import Const
+
+
+class ExportJobTest(TestCase):
+    def setUp(self):
+        for index in range(3):
+            self.create_user(username='user%d@a.com' % index)
+        self.create_user(username='staff@a.com', is_staff=True)
+
+    def test_export_job(self):
+        self.post(
+            '/api/admin/users/export/jobs/?q=user1',
+            auth=True
+        )
+        self.status(201)
+        self.check(self.data.get('status'), Const.EXPORT_PENDING)
+        job_id = self.data.get('id')
+
+        tools.build_export(job_id)
+
+        self.get('/api/admin/exports/%d/' % job_id, auth=True)
+        self.status(200)
+        self.check(self.data.get('status'), Const.EXPORT_DONE)
+        self.check(self.data.get('total'), 1)
+        self.check(self.data.get('progress'), 1)
+
+        self.get('/api/admin/exports/%d/download/' % job_id, auth=True)
+        self.status(200)
+        content = b''.join(self.response.streaming_content)
+        with zipfile.ZipFile(io.BytesIO(content)) as xlsx:
+            sheet = xlsx.read('xl/worksheets/sheet1.xml').decode()
+        self.check_in('user1@a.com', sheet)
+        self.check(sheet.count('<row '), 2)
+
+        job = models.ExportJob.objects.get(pk=job_id)
+        storage, name = job.file.storage, job.file.name
+        self.check(storage.exists(name))
+        self.check_not(
+            storage.path(name).startswith(str(settings.MEDIA_ROOT))
+        )
+
+        models.ExportJob.objects.update(
+            expires_at=timezone.now() - timezone.timedelta(hours=1)
+        )
+        bot.daily_task()
+        self.check_not(models.ExportJob.objects.exists())
+        self.check_not(storage.exists(name))
+
+    def test_export_job_owner(self):
+        self.post('/api/admin/users/export/jobs/', auth=True)
+        job_id = self.data.get('id')
+
+        self.get('/api/admin/exports/%d/download/' % job_id, auth=True)
+        self.status(404)
+
+        self.create_user(username='other@a.com', is_staff=True)
+        self.get('/api/admin/exports/%d/' % job_id, auth=True)
+        self.status(404)
+
+        self.create_user(username='member@a.com')
+        self.post('/api/admin/users/export/jobs/', auth=True)
+        self.status(403)
+
+    def test_stale_export_job(self):
+        self.post('/api/admin/users/export/jobs/', auth=True)
+        job_id = self.data.get('id')
+        self.post('/api/admin/users/export/jobs/', auth=True)
+        fresh_id = self.data.get('id')
+
+        models.ExportJob.objects.filter(pk=job_id).update(
+            status=Const.EXPORT_RUNNING,
+            created_at=timezone.now() - timezone.timedelta(
+                hours=Const.EXPORT_STALE_HOURS + 1
+            )
+        )
+        bot.daily_task()
+
+        self.get('/api/admin/exports/%d/' % job_id, auth=True)
+        self.status(200)
+        self.check(self.data.get('status'), Const.EXPORT_FAILED)
+        self.check(self.data.get('finished_at'))
+
+        self.get('/api/admin/exports/%d/' % fresh_id, auth=True)
+        self.status(200)
+        self.check(self.data.get('status'), Const.EXPORT_PENDING)
@@ -0,0 +1,72 @@
+import time
+
+from core.cache import LocalCache, LRUCache, TieredCache
+from core.testcase import TestCase
+
+
+class CacheTest(TestCase):
+    def test_lru_cache(self):
+        lru = LRUCache(2, 60)
+        lru.set('cat', 'meow')
+        lru.set('dog', 'bark')
+        lru.get('cat')
+        lru.set('cow', 'moo')
+
+        self.check(lru.get('cat'), (True, 'meow'))
+        self.check(lru.get('dog'), (False, None))
+        self.check(lru.get('cow'), (True, 'moo'))
+
+        lru.set('cat', 'purr', 0.01)
+        time.sleep(0.02)
+        self.check(lru.get('cat'), (False, None))
+
+    def test_tiered_cache(self):
+        cache = TieredCache()
+        cache.set('cat', 'meow')
+        self.check(cache.get('cat'), 'meow')
+
+        cache.local.clear()
+        self.check(cache.get('cat'), 'meow')
+        self.check(cache.get('cat'), 'meow')
+        self.check(cache.get('dog'), None)
+        self.check(cache.stats(), {
+            'sets': 1,
+            'local_hits': 2,
+            'shared_hits': 1,
+            'misses': 1,
+        })
+
+        calls = []
+
+        def default():
+            calls.append(1)
+            return 'bark'
+
+        self.check(cache.get_or_set('dog', default), 'bark')
+        self.check(cache.get_or_set('dog', default), 'bark')
+        self.check(len(calls), 1)
+
+        cache.delete('dog')
+        self.check(cache.get('dog'), None)
+        self.check(cache.get_or_set('cow', lambda: None), None)
+        self.check(cache.get('cow'), None)
+
+    def test_local_cache(self):
+        local = LocalCache('pet', 0.01)
+        calls = []
+
+        def default():
+            calls.append(1)
+            return 'meow'
+
+        self.check(local.get('cat', default), 'meow')
+        self.check(local.get('cat', default), 'meow')
+        self.check(len(calls), 1)
+
+        local.invalidate()
+        self.check(local.get('cat', default), 'meow')
+        self.check(len(calls), 2)
+
+        time.sleep(0.02)
+        self.check(local.get('cat', default), 'meow')
+        self.check(len(calls), 3)
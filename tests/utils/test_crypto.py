@@ -1,5 +1,9 @@
+from unittest import mock
+
 from django.utils.crypto import get_random_string
 
+from accounts.models import LoginDevice, User
+from core.fields import decrypt_instances
 from core.testcase import TestCase
 from utils.crypto import Crypto
 from utils.text import Text
@@ -44,3 +48,57 @@ class CryptoTest(TestCase):
             if isinstance(sample, bytes):
                 sample = sample.decode('utf-8')
             self.check(message, sample)
+
+    def test_cbc_decrypt_batch(self):
+        samples = ['meow', '', None, 'meow', 'purr']
+        coded_messages = [Crypto.cbc_encrypt(sample) for sample in samples]
+
+        self.check(
+            Crypto.cbc_decrypt_batch(coded_messages),
+            ['meow', None, None, 'meow', 'purr']
+        )
+
+    def test_lazy_decryption(self):
+        self.create_user()
+        User.objects.filter(pk=self.user.pk).update(tel='01012345678')
+
+        with mock.patch.object(
+            Crypto, 'cbc_decrypt', wraps=Crypto.cbc_decrypt
+        ) as cbc_decrypt:
+            user = User.objects.get(pk=self.user.pk)
+            self.check(cbc_decrypt.call_count, 0)
+
+            self.check(user.tel, '01012345678')
+            self.check(type(user.tel), str)
+            self.check(cbc_decrypt.call_count, 1)
+
+        user.save()
+        user = User.objects.get(pk=self.user.pk)
+        self.check(user.tel, '01012345678')
+
+        users = decrypt_instances(User.objects.all(), ['tel', 'address'])
+        self.check(users[0].__dict__.get('tel'), '01012345678')
+
+    def test_values_decryption(self):
+        self.create_user()
+        User.objects.filter(pk=self.user.pk).update(tel='01012345678')
+
+        tel = User.objects.values_list('tel', flat=True).get()
+        self.check(tel, '01012345678')
+        self.check(type(tel), str)
+
+        values = User.objects.values('tel', 'address').get()
+        self.check(type(values.get('tel')), str)
+        self.check(type(values.get('address')), str)
+
+        LoginDevice.objects.create(user=self.user)
+        tel = LoginDevice.objects.values_list('user__tel', flat=True).get()
+        self.check(type(tel), str)
+
+        with mock.patch.object(
+            Crypto, 'cbc_decrypt', wraps=Crypto.cbc_decrypt
+        ) as cbc_decrypt:
+            device = LoginDevice.objects.select_related('user').get()
+            self.check(cbc_decrypt.call_count, 0)
+            self.check(device.user.tel, '01012345678')
+            self.check(cbc_decrypt.call_count, 1)
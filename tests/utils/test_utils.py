@@ -1,8 +1,11 @@
+from unittest import mock
+
 from django.conf import settings
+from django.test import RequestFactory
 
 from core.testcase import TestCase
 from utils.constants import Const
-from utils import datautils
+from utils import datautils, netutils
 from utils.debug import Debug
 from utils.text import Text
 from utils.regexp import RegExpHelper
@@ -146,3 +149,28 @@ class DataUtilsTest(TestCase):
 
         result = datautils.divide_or_zero(4, 0)
         self.check(result, 0)
+
+    def test_user_agent_cache(self):
+        request = RequestFactory().get(
+            '/',
+            HTTP_USER_AGENT='Mozilla/5.0 (iPhone; CPU iPhone OS 16_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.0 Mobile/15E148 Safari/604.1'  # noqa
+        )
+        netutils.user_agents.clear()
+        netutils.user_agents.reset_stats()
+
+        with mock.patch.object(
+            netutils, 'parse', wraps=netutils.parse
+        ) as parse:
+            user_agent = netutils.get_user_agent(request)
+            self.check(netutils.get_user_agent(request), user_agent)
+            self.check(parse.call_count, 1)
+
+        self.check(user_agent, ('iPhone', 'iOS', 'Mobile Safari'))
+        self.check(
+            netutils.user_agents.stats(),
+            {'hits': 1, 'misses': 1, 'size': 1}
+        )
+        self.check(
+            netutils.get_user_agent(RequestFactory().get('/')),
+            ('Other', 'Other', 'Other')
+        )
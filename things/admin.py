@@ -41,3 +41,24 @@ class OrderThingAdmin(admin.ModelAdmin):
     list_display_links = (
         'name',
     )
+
+
+@admin.register(models.ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'user',
+        'view',
+        'status',
+        'progress',
+        'total',
+        'created_at',
+        'expires_at',
+    )
+    ordering = (
+        '-id',
+    )
+    list_display_links = (
+        'id',
+        'view',
+    )
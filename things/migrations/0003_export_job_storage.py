@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:51
+
+from django.db import migrations, models
+import things.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('things', '0002_export_job'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exportjob',
+            name='file',
+            field=models.FileField(blank=True, max_length=128, null=True, storage=things.models.export_storage, upload_to=things.models.export_directory_path),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.core.files.storage import storages
 from django.db import models
 from django.db.models import Q
 from django.utils import timezone
@@ -14,6 +15,14 @@ def app_directory_path(instance, filename):
     return 'files/%s' % generate_filename(filename)
 
 
+def export_directory_path(instance, filename):
+    return 'exports/%s' % generate_filename(filename)
+
+
+def export_storage():
+    return storages['exports']
+
+
 class AttachmentManager(models.Manager):
     def search(self, q):
         filename = Q()
@@ -75,3 +84,65 @@ class OrderThing(models.Model):
 
     class Meta:
         ordering = ['order', 'id']
+
+
+def export_expiration():
+    return timezone.now() + timezone.timedelta(
+        hours=Const.EXPORT_EXPIRATION_HOURS
+    )
+
+
+class ExportJobManager(models.Manager):
+    def my(self, user):
+        return self.filter(user=user)
+
+    def expired(self):
+        return self.filter(expires_at__lt=timezone.now())
+
+    def stale(self):
+        return self.filter(
+            status__in=[Const.EXPORT_PENDING, Const.EXPORT_RUNNING],
+            created_at__lt=timezone.now() - timezone.timedelta(
+                hours=Const.EXPORT_STALE_HOURS
+            )
+        )
+
+
+class ExportJob(models.Model):
+    user = models.ForeignKey(
+        'accounts.User',
+        related_name='export_job_user',
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+    )
+    view = models.CharField(max_length=Const.FILE_MAX_LENGTH)
+    query = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=Const.FIELD_MAX_LENGTH,
+        default=Const.EXPORT_PENDING,
+    )
+    progress = models.IntegerField(default=Const.BASE_COUNT)
+    total = models.IntegerField(default=Const.BASE_COUNT)
+    file = models.FileField(
+        upload_to=export_directory_path,
+        storage=export_storage,
+        max_length=Const.FILE_MAX_LENGTH,
+        blank=True,
+        null=True,
+    )
+    error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    expires_at = models.DateTimeField(default=export_expiration)
+
+    objects = ExportJobManager()
+
+    class Meta:
+        ordering = ['-id']
+
+    def __str__(self):
+        return '%s (%s)' % (self.view, self.status)
+
+    def filename(self):
+        return get_original_filename(self.file.name)
@@ -87,3 +87,18 @@ class OrderThingSerializer(ModelSerializer):
             'order',
             'name',
         ]
+
+
+class ExportJobSerializer(ModelSerializer):
+    class Meta:
+        model = models.ExportJob
+        fields = [
+            'id',
+            'status',
+            'progress',
+            'total',
+            'error',
+            'created_at',
+            'finished_at',
+            'expires_at',
+        ]
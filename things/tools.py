@@ -1,5 +1,14 @@
+from django.core.files import File
+from django.db import connections, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core.wrapper import async_func
+from utils.constants import Const
 from utils.debug import Debug  # noqa
 
+from . import models
+
 
 def destroy_attachment(instance):
     if instance.file:
@@ -7,6 +16,30 @@ def destroy_attachment(instance):
     instance.delete()
 
 
+def destroy_attachments(queryset):
+    """
+    Bulk Attachment Removal
+
+    Rows are deleted in one statement, their files once it commits.
+    Returns the number of deleted attachments.
+    """
+    instances = list(queryset)
+    if not instances:
+        return 0
+
+    files = [instance.file for instance in instances if instance.file]
+
+    def delete_files():
+        for file in files:
+            file.delete(save=False)
+
+    count, _ = models.Attachment.objects.filter(
+        pk__in=[instance.pk for instance in instances]
+    ).delete()
+    transaction.on_commit(delete_files)
+    return count
+
+
 def get_or_create_thing(model_thing, thing_type, name):
     instance, created = model_thing.objects.get_or_create(
         thing_type=thing_type,
@@ -16,3 +49,79 @@ def get_or_create_thing(model_thing, thing_type, name):
         Debug.trace('Creating a %s %s' % (thing_type, instance))
 
     return instance
+
+
+def build_export(job_id):
+    """
+    Export Job
+
+    Rebuild the export view with the stored query and user,
+    then keep its workbook in the private exports storage.
+    """
+    job = models.ExportJob.objects.select_related('user').get(pk=job_id)
+    jobs = models.ExportJob.objects.filter(pk=job_id)
+    jobs.update(status=Const.EXPORT_RUNNING)
+
+    try:
+        view = import_string(job.view).from_job(job)
+        output = view.build(
+            lambda total: jobs.update(total=total),
+            lambda progress: jobs.update(progress=progress)
+        )
+        job.refresh_from_db()
+        job.file.save(view.get_export_name(), File(output), save=False)
+        output.close()
+        job.status = Const.EXPORT_DONE
+        job.progress = job.total
+    except Exception as e:
+        Debug.error('Export job %d failed: %s' % (job_id, e))
+        job.refresh_from_db()
+        job.status = Const.EXPORT_FAILED
+        job.error = str(e)
+
+    job.finished_at = timezone.now()
+    job.expires_at = job.finished_at + timezone.timedelta(
+        hours=Const.EXPORT_EXPIRATION_HOURS
+    )
+    job.save()
+    return job
+
+
+@async_func
+def run_export(job_id):
+    try:
+        build_export(job_id)
+    finally:
+        connections.close_all()
+
+
+def fail_stale_exports():
+    """
+    Stale Export Jobs
+
+    Jobs run in a thread of the worker that took the request,
+    a worker restart leaves them pending or running forever.
+    Jobs not finished in EXPORT_STALE_HOURS are marked as failed.
+    """
+    now = timezone.now()
+    return models.ExportJob.objects.stale().update(
+        status=Const.EXPORT_FAILED,
+        error='Export job was interrupted.',
+        finished_at=now,
+        expires_at=now + timezone.timedelta(
+            hours=Const.EXPORT_EXPIRATION_HOURS
+        )
+    )
+
+
+def delete_expired_exports():
+    fail_stale_exports()
+    count = 0
+
+    for job in models.ExportJob.objects.expired():
+        if job.file:
+            job.file.delete(save=False)
+        job.delete()
+        count += 1
+
+    return count
@@ -1,3 +1,5 @@
+from django.http import FileResponse
+
 from core.viewsets import (
     ModelViewSet,
     ReadOnlyModelViewSet,
@@ -7,6 +9,7 @@ from core.permissions import (
     IsAdminUser,
     IsApproved,
 )
+from core.shortcuts import get_object_or_404
 from utils.constants import Const
 from utils.debug import Debug  # noqa
 
@@ -57,3 +60,25 @@ class ThingViewSet(ModelViewSet):
         instance = serializer.save()
         instance.thing_type = self.model._meta.verbose_name
         instance.save()
+
+
+class ExportJobViewSet(ReadOnlyModelViewSet):
+    serializer_class = serializers.ExportJobSerializer
+    model = models.ExportJob
+    permission_classes = [IsAdminUser]
+
+    def get_queryset(self):
+        return self.model.objects.my(self.request.user)
+
+    def download(self, request, *args, **kwargs):
+        instance = get_object_or_404(
+            self.get_queryset(),
+            pk=self.kwargs[Const.QUERY_PARAM_PK],
+            status=Const.EXPORT_DONE
+        )
+        return FileResponse(
+            instance.file.open('rb'),
+            as_attachment=True,
+            filename=instance.filename(),
+            content_type=Const.MIME_TYPE_XLSX
+        )
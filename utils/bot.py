@@ -2,9 +2,14 @@ import threading
 
 from django.utils import timezone
 
+from accounts import tools as accounts_tools
+from communities import tools as communities_tools
+from contents import tools as contents_tools
 from core.permissions import IsAdminUser
 from core.response import Response
+from core.retention import purge_all
 from core.viewsets import APIView
+from things import tools as things_tools
 from utils.debug import Debug  # noqa
 
 
@@ -13,6 +18,9 @@ def daily_task():
     today = now.date()
 
     Debug.print('Staring %s daily task...' % today)
+    retention_task()
+    communities_tools.sync_forum_stats()
+    things_tools.delete_expired_exports()
     Debug.print('%s daily task finished.' % today)
 
     if now.weekday() == 0:
@@ -22,6 +30,16 @@ def daily_task():
         monthly_task()
 
 
+def retention_task():
+    deleted = purge_all(
+        accounts_tools.retention_policies() +
+        communities_tools.retention_policies() +
+        contents_tools.retention_policies()
+    )
+    Debug.print('%d rows removed by retention.' % sum(deleted.values()))
+    return deleted
+
+
 def weekly_task():
     Debug.print('Staring weekly task...')
     Debug.print('weekly task finished.')
@@ -33,7 +51,7 @@ def monthly_task():
 
 
 def minute_task():
-    pass
+    communities_tools.sync_hot_scores()
 
 
 class DailyBotView(APIView):
@@ -22,6 +22,8 @@ class _Const(object):
     DECIMAL_PLACES_LENGTH = 6
     AUTH_CODE_LENGTH = 6
     AUTH_CODE_EXPIRATION_SECONDS = 900
+    EXPORT_EXPIRATION_HOURS = 24
+    EXPORT_STALE_HOURS = 6
 
     LENGTH_16 = 16
     LENGTH_32 = 32
@@ -34,12 +36,26 @@ class _Const(object):
     BASE_ORDER = 0
     BASE_COUNT = 0
 
+    VOTE_UP = 1
+    VOTE_DOWN = -1
+    VOTE_NONE = 0
+
+    HOT_GRAVITY = 1.8
+    HOT_REPLY_WEIGHT = 2
+    HOT_AGE_OFFSET_HOURS = 2
+    HOT_WINDOW_DAYS = 7
+    HOT_BUCKET_SECONDS = 60
+
     MAX_LOOP = 999
     MAX_WORKERS = 8
+    CHUNK_SIZE = 1000
+    SEARCH_TOKEN_MAX_LENGTH = 100
+    SEARCH_SUFFIX_MIN_LENGTH = 3
     DEFAULT_PRECISION = 6
     DEFAULT_LINK_COUNT = 10
 
     FILTER_LIST_NAME = 'filter'
+    CACHE_SCOPE_BLOG = 'blog'
 
     QUERY_PARAM_TRUE = 'true'
     QUERY_PARAM_FALSE = 'false'
@@ -51,6 +67,8 @@ class _Const(object):
     QUERY_PARAM_USED = 'used'
     QUERY_PARAM_SUCCESS = 'success'
     QUERY_PARAM_DELETED = 'delete'
+    QUERY_PARAM_CURSOR = 'cursor'
+    QUERY_PARAM_FORMAT = 'format'
 
     QUERY_PARAM_SORT = 'sort'
     QUERY_PARAM_SORT_LATEST = 'latest'
@@ -60,10 +78,19 @@ class _Const(object):
 
     TIME_FORMAT_DEFAULT = '%I:%M %p'
     MIME_TYPE_XLSX = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'  # noqa
+    MIME_TYPE_CSV = 'text/csv; charset=utf-8'
+    MIME_TYPE_NDJSON = 'application/x-ndjson; charset=utf-8'
     EXCEL_FILENAME_FORMAT = '%Y%m%d%H%M%S'
+    EXPORT_FORMAT_CSV = 'csv'
+    EXPORT_FORMAT_NDJSON = 'ndjson'
     CENSORED_DATA = '******'
     CENSORED_EMAIL_DOMAIN = '@censo.red'
 
+    COUNT_EXACT = 'exact'
+    COUNT_CACHED = 'cached'
+    COUNT_ESTIMATE = 'estimate'
+    COUNT_CAPPED = 'capped'
+
     REQUIRED = {'required': True, 'allow_null': False, 'allow_blank': False}
     JSON_REQUIRED = {'required': True, 'allow_null': False}
     NOT_NULL = {'allow_null': False, 'allow_blank': False}
@@ -83,9 +110,21 @@ class _ConstProject(_Const):
         'ko',
     ]
 
+    EXPORT_PENDING = 'pending'
+    EXPORT_RUNNING = 'running'
+    EXPORT_DONE = 'done'
+    EXPORT_FAILED = 'failed'
+
+    MODERATION_DELETE = 'delete'
+    MODERATION_RESTORE = 'restore'
+    MODERATION_PIN = 'pin'
+    MODERATION_UNPIN = 'unpin'
+    MODERATION_MAX_IDS = 1000
+
     QUERY_PARAM_PINNED = 'pin'
     QUERY_PARAM_SORT_UP = 'up'
     QUERY_PARAM_SORT_DOWN = 'down'
+    QUERY_PARAM_SORT_HOT = 'hot'
     QUERY_PARAM_CATEGORY = 'category'
     QUERY_PARAM_TAG = 'tag'
     QUERY_PARAM_DRAFT = 'draft'
@@ -122,8 +161,6 @@ class _ConstProject(_Const):
         'permission_vote': PERMISSION_ALL,
     }
 
-    MAX_REPLY_NESTING = 99
-
     SENSITIVE_URLS = [
         '/api/accounts/login/',
         '/api/accounts/signup/',
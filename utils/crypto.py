@@ -1,3 +1,6 @@
+import hashlib
+import hmac
+
 from base64 import b64encode, b64decode
 from binascii import (
     a2b_hex,
@@ -12,8 +15,14 @@ from utils.debug import Debug  # noqa
 
 
 class _Crypto(object):
+    passphrase = None
+    derived_key = None
+
     def key(self):
-        return settings.AES_PASSPHRASE.encode('utf-8')[:16]
+        if self.passphrase != settings.AES_PASSPHRASE:
+            self.derived_key = settings.AES_PASSPHRASE.encode('utf-8')[:16]
+            self.passphrase = settings.AES_PASSPHRASE
+        return self.derived_key
 
     def cbc_encrypt(self, text):
         if not text:
@@ -39,6 +48,38 @@ class _Crypto(object):
         text = unpad(cryptor.decrypt(a2b_hex(ciphertext)), AES.block_size)
         return bytes.decode(text)
 
+    def cbc_decrypt_batch(self, ciphertexts):
+        """
+        Decrypt ciphertexts with one key lookup,
+        the same ciphertext is decrypted once.
+        """
+        key = self.key()
+        texts = {}
+
+        for ciphertext in ciphertexts:
+            if ciphertext and ciphertext not in texts:
+                cryptor = AES.new(key, AES.MODE_CBC, key)
+                texts[ciphertext] = bytes.decode(unpad(
+                    cryptor.decrypt(a2b_hex(ciphertext)), AES.block_size
+                ))
+
+        return [texts.get(ciphertext) for ciphertext in ciphertexts]
+
+    def blind_index(self, text, context=''):
+        """
+        Keyed HMAC of text for equality lookups,
+        context separates indexes of different fields.
+        """
+        if text is None or text == '':
+            return None
+
+        message = '%s:%s' % (context, str(text).strip())
+        return hmac.new(
+            settings.BLIND_INDEX_KEY.encode('utf-8'),
+            message.encode('utf-8'),
+            hashlib.sha256
+        ).hexdigest()
+
     def cfb_encrypt(self, text):
         if not text:
             return None
@@ -1,18 +1,45 @@
+import csv
+import json
+import tempfile
 import xlsxwriter
 
 from io import BytesIO
 from string import ascii_uppercase
 
-from django.http import HttpResponse
+from django.db import transaction
+from django.http import (
+    FileResponse,
+    HttpRequest,
+    QueryDict,
+    StreamingHttpResponse,
+)
 from django.utils import timezone
+from rest_framework.request import Request
 
+from core.response import Response
 from core.viewsets import (
     ReadOnlyModelViewSet,
 )
+from things import (
+    models as things_models,
+    serializers as things_serializers,
+    tools as things_tools,
+)
 from utils.constants import Const
 from utils.debug import Debug
 
 
+class Echo():
+    """
+    Pseudo Buffer
+
+    csv.writer hands back each written line instead of keeping it.
+    """
+
+    def write(self, value):
+        return value
+
+
 class ExcelViewSet(ReadOnlyModelViewSet):
     filename_prefix = 'excel'
     column_width = []
@@ -41,6 +68,12 @@ class ExcelViewSet(ReadOnlyModelViewSet):
     merge_cells = []
     sheet_names = []
     sheet_keys = []
+    streaming = False
+    chunk_size = Const.CHUNK_SIZE
+    streams = {
+        Const.EXPORT_FORMAT_CSV: Const.MIME_TYPE_CSV,
+        Const.EXPORT_FORMAT_NDJSON: Const.MIME_TYPE_NDJSON,
+    }
 
     def get_queryset(self):
         return self.model.objects.all()
@@ -48,14 +81,29 @@ class ExcelViewSet(ReadOnlyModelViewSet):
     def get_sheet_name(self, instance=None):
         return 'sheet1'
 
-    def get_filename(self):
-        filename = '%s_%s.xlsx' % (
+    def get_export_name(self, extension='xlsx'):
+        return '%s_%s.%s' % (
             self.filename_prefix,
             timezone.localtime().strftime(
                 Const.EXCEL_FILENAME_FORMAT
             ),
+            extension,
         )
-        return 'filename=' + filename
+
+    def get_export_format(self):
+        return self.request.query_params.get(Const.QUERY_PARAM_FORMAT)
+
+    def perform_content_negotiation(self, request, force=False):
+        """
+        csv and ndjson are answered by list itself,
+        other responses fall back to the default renderer.
+        """
+        if self.get_export_format() in self.streams:
+            force = True
+        return super().perform_content_negotiation(request, force)
+
+    def get_filename(self):
+        return 'filename=' + self.get_export_name()
 
     def get_not_null(self, item):
         if item:
@@ -72,6 +120,20 @@ class ExcelViewSet(ReadOnlyModelViewSet):
         ]
         return data, format_data
 
+    def make_row(self, item):
+        """
+        Streaming Row
+
+        Return cells of a serialized item, used when streaming is set.
+        """
+        return []
+
+    def get_format(self, workbook, cell_format):
+        key = repr(sorted(cell_format.items()))
+        if key not in self.formats:
+            self.formats[key] = workbook.add_format(cell_format)
+        return self.formats[key]
+
     def set_sheets(self, request, data=None, one_data=None):
         self.sheet_names = [
             'sheet'
@@ -82,7 +144,8 @@ class ExcelViewSet(ReadOnlyModelViewSet):
 
     def merge(self, workbook, worksheet, data):
         for merge_cell in self.merge_cells:
-            merge_format = workbook.add_format(
+            merge_format = self.get_format(
+                workbook,
                 merge_cell.get('format', self.merge_format)
             )
             columns = merge_cell.get('columns')
@@ -103,6 +166,7 @@ class ExcelViewSet(ReadOnlyModelViewSet):
 
         output = BytesIO()
         workbook = xlsxwriter.Workbook(output)
+        self.formats = {}
 
         for index, sheet_name in enumerate(self.sheet_names):
             data, format_data = self.make_data(
@@ -116,11 +180,9 @@ class ExcelViewSet(ReadOnlyModelViewSet):
                 for row, (columns, row_format) in enumerate(
                     zip(data, format_data)
                 ):
-                    for column, cell_data in enumerate(columns):
-                        content_format = workbook.add_format(row_format)
-                        worksheet.write(
-                            row, column, cell_data, content_format
-                        )
+                    worksheet.write_row(
+                        row, 0, columns, self.get_format(workbook, row_format)
+                    )
                 if index == 0:
                     self.merge(workbook, worksheet, data)
 
@@ -128,6 +190,167 @@ class ExcelViewSet(ReadOnlyModelViewSet):
         output.seek(0)
         return output
 
+    def iterate(self, queryset):
+        """
+        Serialized Chunks
+
+        Read queryset through a server-side cursor
+        and serialize chunk_size rows at a time.
+        """
+        chunk = []
+
+        for instance in queryset.iterator(chunk_size=self.chunk_size):
+            chunk.append(instance)
+            if len(chunk) == self.chunk_size:
+                yield self.serialize_chunk(chunk)
+                chunk = []
+
+        if chunk:
+            yield self.serialize_chunk(chunk)
+
+    def prepare_chunk(self, chunk):
+        return chunk
+
+    def serialize_chunk(self, chunk):
+        return self.get_serializer(self.prepare_chunk(chunk), many=True).data
+
+    def iterate_rows(self, queryset):
+        """
+        Dump Rows
+
+        Rows of each chunk, from make_row when streaming is set
+        or else from make_data of the chunk.
+        """
+        for data in self.iterate(queryset):
+            if self.streaming:
+                for item in data:
+                    yield self.make_row(item)
+            else:
+                rows, format_data = self.make_data(data)
+                yield from rows[1:]
+
+    def stream_csv(self, queryset):
+        writer = csv.writer(Echo())
+        yield writer.writerow(self.title)
+
+        for row in self.iterate_rows(queryset):
+            yield writer.writerow(row)
+
+    def stream_ndjson(self, queryset):
+        for row in self.iterate_rows(queryset):
+            yield json.dumps(
+                dict(zip(self.title, row)),
+                ensure_ascii=False,
+                default=str
+            ) + '\n'
+
+    def get_stream_response(self, queryset, export_format):
+        """
+        Streaming Dump
+
+        Rows go out as soon as they are read, one chunk at a time,
+        with the same columns as the workbook.
+        """
+        response = StreamingHttpResponse(
+            getattr(self, 'stream_%s' % export_format)(queryset),
+            content_type=self.streams[export_format]
+        )
+        filename = self.get_export_name(export_format)
+        response['Content-Disposition'] = 'attachment; filename=' + filename
+        Debug.trace('Exporting %s' % filename)
+        return response
+
+    def stream_excel(self, queryset, progress=None):
+        """
+        Constant-memory Excel
+
+        Rows are written one by one into a temporary file
+        so that memory stays flat whatever the row count is.
+        Merged cells are not supported.
+        """
+        output = tempfile.TemporaryFile()
+        workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+        self.formats = {}
+
+        worksheet = workbook.add_worksheet(self.get_sheet_name())
+        self.set_column_width(worksheet)
+        worksheet.write_row(
+            0, 0, self.title, self.get_format(workbook, self.header_format)
+        )
+
+        content_format = self.get_format(workbook, self.content_format)
+        row = 1
+        for data in self.iterate(queryset):
+            for item in data:
+                worksheet.write_row(
+                    row, 0, self.make_row(item), content_format
+                )
+                row += 1
+            if progress:
+                progress(row - 1)
+
+        workbook.close()
+        output.seek(0)
+        return output
+
+    @classmethod
+    def from_job(cls, job):
+        """
+        Export Job View
+
+        The view as requested by job, for building off-request.
+        """
+        http_request = HttpRequest()
+        http_request.GET = QueryDict(mutable=True)
+        for key, values in job.query.items():
+            http_request.GET.setlist(key, values)
+
+        request = Request(http_request)
+        request.user = job.user
+
+        return cls(
+            request=request,
+            args=(),
+            kwargs={},
+            format_kwarg=None,
+            action='list',
+        )
+
+    def build(self, total=None, progress=None):
+        """
+        Export File
+
+        Same workbook as list, reporting the row count to total
+        and written rows to progress when streaming.
+        """
+        self.q = self.request.query_params.get(Const.QUERY_PARAM_SEARCH)
+        queryset = self.filter_queryset(self.get_queryset())
+
+        if not self.streaming:
+            serializer = self.get_serializer(queryset, many=True)
+            return self.make_excel(self.request, serializer)
+
+        if total:
+            total(queryset.count())
+        return self.stream_excel(queryset, progress)
+
+    def enqueue(self, request, *args, **kwargs):
+        job = things_models.ExportJob.objects.create(
+            user=request.user,
+            view='%s.%s' % (self.__module__, self.__class__.__name__),
+            query={
+                key: request.query_params.getlist(key)
+                for key in request.query_params
+            }
+        )
+        transaction.on_commit(lambda: things_tools.run_export(job.id))
+
+        serializer = self.set_serializer(
+            things_serializers.ExportJobSerializer,
+            job
+        )
+        return Response(serializer.data, status=Response.HTTP_201)
+
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
@@ -140,6 +363,14 @@ class ExcelViewSet(ReadOnlyModelViewSet):
     def list(self, request, *args, **kwargs):
         self.q = request.query_params.get(Const.QUERY_PARAM_SEARCH)
         queryset = self.filter_queryset(self.get_queryset())
+
+        export_format = self.get_export_format()
+        if export_format in self.streams:
+            return self.get_stream_response(queryset, export_format)
+
+        if self.streaming:
+            return self.get_response(self.stream_excel(queryset))
+
         serializer = self.get_serializer(queryset, many=True)
 
         return self.get_response(
@@ -163,7 +394,7 @@ class ExcelViewSet(ReadOnlyModelViewSet):
 
     def get_response(self, excel, data=None):
         filename = self.get_filename()
-        response = HttpResponse(excel, content_type=Const.MIME_TYPE_XLSX)
+        response = FileResponse(excel, content_type=Const.MIME_TYPE_XLSX)
         response['Content-Disposition'] = 'attachment; ' + filename
         Debug.trace('Exporting excel %s' % filename)
         return response
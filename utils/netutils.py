@@ -1,5 +1,14 @@
+from django.conf import settings
 from user_agents import parse
 
+from core.cache import LRUCache
+
+
+user_agents = LRUCache(
+    settings.USER_AGENT_CACHE_SIZE,
+    settings.USER_AGENT_CACHE_TIMEOUT
+)
+
 
 def get_ip_address(request):
     x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -11,14 +20,28 @@ def get_ip_address(request):
     return ip
 
 
+def parse_user_agent(ua_string):
+    user_agent = parse(ua_string)
+    browser = user_agent.browser
+    os = user_agent.os
+    device = user_agent.is_pc and 'PC' or user_agent.device.family
+
+    return device, os.family, browser.family
+
+
 def get_user_agent(request):
+    """
+    Return (device, os, browser) of request
+
+    Parsed results of recent user agents are kept in an LRU cache.
+    """
     ua_string = request.META.get('HTTP_USER_AGENT')
     if ua_string:
-        user_agent = parse(request.META.get('HTTP_USER_AGENT'))
-        browser = user_agent.browser
-        os = user_agent.os
-        device = user_agent.is_pc and 'PC' or user_agent.device.family
+        found, user_agent = user_agents.get(ua_string)
+        if not found:
+            user_agent = parse_user_agent(ua_string)
+            user_agents.set(ua_string, user_agent)
 
-        return device, os.family, browser.family
+        return user_agent
     else:
         return 'Other', 'Other', 'Other'